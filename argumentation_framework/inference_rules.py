@@ -1,4 +1,3 @@
-import sympy
 from collections import defaultdict
 
 
@@ -9,7 +8,7 @@ class InferenceRule:
     Rule to infer conclusions from a kb
     """
 
-    def __init__(self, premise: sympy.Basic, conclusion: dict):
+    def __init__(self, premise: 'sympy.Basic', conclusion: dict):
         """
 
         :param premise: logic formula for the premise of this rule
@@ -19,7 +18,7 @@ class InferenceRule:
         self._conclusion = conclusion
 
     @property
-    def premise(self) -> sympy.Basic:
+    def premise(self) -> 'sympy.Basic':
         """
         Gets the logic formula for the premise of this rule
         :return: a sympy logical formula
@@ -68,7 +67,7 @@ class ModusPonens(InferenceRule):
     Rule to infer conclusions from a kb
     """
 
-    def __init__(self, premise: sympy.Basic, conclusion: dict):
+    def __init__(self, premise: 'sympy.Basic', conclusion: dict):
         super().__init__(premise, conclusion)
 
 
@@ -82,6 +81,8 @@ class ModusPonens(InferenceRule):
 
 
 if __name__ == '__main__':
+    import sympy
+
     a, b, c = sympy.symbols('a,b,c')
 
     df = (a & b)
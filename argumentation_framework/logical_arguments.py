@@ -3,7 +3,6 @@ import itertools
 from argumentation_framework.frameworks import ArgumentationFramework
 from argumentation_framework.inference_rules import *
 from collections import defaultdict
-import sympy
 
 
 
@@ -98,6 +97,8 @@ def make_simple_logic_argument(support: dict, claim: dict) -> LogicArgument:
     :return:
     """
 
+    import sympy
+
     symbs_support = sympy.symbols(list(support.keys()))
     premise = sympy.And(*[s if support[s.name] else ~s for s in symbs_support])
     rule = ModusPonens(premise, claim)
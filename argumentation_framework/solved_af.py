@@ -1,6 +1,7 @@
 import solved_af.tasks as tasks
+import solved_af.utils as utils
+from solved_af.cache import ResultCache, cachedSolution, DEFAULT_MAX_BYTES
 from solved_af.framework import FrameworkRepresentation
-from argumentation_framework.util import execute_with_timeout
 # NB solved-af required glucose-syrup to be installed
 
 
@@ -50,6 +51,20 @@ valid_tasks = [EE_CO, SE_CO, SE_GR, EE_PR, SE_PR, EE_ST, SE_ST,
 
 _TIMEOUT = 300
 
+_CACHE = None
+
+
+def set_result_cache(directory, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Enables a persistent on-disk cache of the solutions found by find_extensions() and find_acceptance(). Solutions
+    are keyed by the content of the framework and the task, so they are reused across processes and runs.
+    :param directory: directory where to store the solutions, or None to disable the cache
+    :param max_bytes: cap on the size of the stored solutions. Least recently used solutions are evicted first
+    :return: None
+    """
+    global _CACHE
+    _CACHE = None if directory is None else ResultCache(directory, max_bytes)
+
 
 def find_extensions(solved_af_framework: FrameworkRepresentation, task_name: str = EE_CO):
     """
@@ -65,14 +80,24 @@ def find_extensions(solved_af_framework: FrameworkRepresentation, task_name: str
     parsed_solution = []
 
     taskMethod = tasks.getTaskMethod(task_name, is_enumeration=True)
-    try:
-        solution = execute_with_timeout(_TIMEOUT, lambda x: list(taskMethod(x)), solved_af_framework)
+
+    def solve():
+        # The deadline is enforced inside the solver calls, so no work is left running once it expires
+        # Memoized results are kept in caches shared by all frameworks, hence free them once it is solved
+        with utils.memoScope():
+            solution = tasks.solveWithDeadline(
+                lambda: list(taskMethod(solved_af_framework)) if task_type == 'EE' else taskMethod(solved_af_framework),
+                seconds=_TIMEOUT)
         if task_type == 'SE' and solution is not None:
-            parsed_solution = solved_af_framework.valuesToArguments(solution)
+            return solved_af_framework.valuesToArguments(solution)
         elif task_type == 'EE':
-            parsed_solution = [solved_af_framework.valuesToArguments(ext) for ext in solution]
-    except TimeoutError:
-        print('timeout')
+            return [solved_af_framework.valuesToArguments(ext) for ext in solution]
+        return []
+
+    try:
+        parsed_solution = cachedSolution(_CACHE, solved_af_framework, task_name, solve)
+    except TimeoutError as e:
+        print(f'timeout: {e}')
     finally:
         return parsed_solution
 
@@ -90,13 +115,18 @@ def find_acceptance(solved_af: FrameworkRepresentation, argument_value, task_nam
     # Assuming a decision problem
     assert task_name in valid_tasks, f'{task_name} is not a task in {valid_tasks}'
     acceptanceMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
+    argument_name = argument_value
     argument_value = solved_af.argumentToValue(argument_value)
     parsed_solution = False
 
+    def solve():
+        with utils.memoScope():
+            return tasks.solveWithDeadline(acceptanceMethod, solved_af, argument_value, seconds=_TIMEOUT)
+
     try:
-        parsed_solution = execute_with_timeout(_TIMEOUT, lambda x: acceptanceMethod(*x), (solved_af, argument_value,))
-    except TimeoutError:
-        print('timeout')
+        parsed_solution = cachedSolution(_CACHE, solved_af, task_name, solve, argument_name)
+    except TimeoutError as e:
+        print(f'timeout: {e}')
     finally:
         return parsed_solution
 
@@ -1,15 +1,17 @@
-import threading
 from concurrent.futures import ThreadPoolExecutor
 
-import networkx as nx
 from collections import defaultdict
-import matplotlib.pyplot as plt
 import numpy as np
 
+# networkx and matplotlib are only imported by the drawing functions, so that
+# the solver can be used without loading them.
+
 
 
 
 def draw_networkx_figure(attack_matrix, arg_mask=None, node_labels=None, node_colors=None, **kwargs):
+    import networkx as nx
+
     G = nx.DiGraph()
 
     arguments = np.arange(attack_matrix.shape[0])
@@ -39,6 +41,8 @@ def draw_networkx_figure(attack_matrix, arg_mask=None, node_labels=None, node_co
 
 
 def draw_extensions(extensions, attacks_matrix, arg_mask=None, ncols=4):
+    import matplotlib.pyplot as plt
+
     extensions = list(extensions)
 
     if len(extensions) < ncols:
@@ -66,34 +70,6 @@ def draw_extensions(extensions, attacks_matrix, arg_mask=None, ncols=4):
 
 
 
-def execute_with_timeout(timeout_secs, function, *args):
-    """
-    Executes a function on a separate thread using a timeout.
-    execute_with_timeout() ends whenever either the function returns or if the timeout elapses. In the second case
-    a TimeoutError is raised.
-    :param timeout_secs: timeout in seconds waited for the function to complete
-    :param function: function to execute
-    :param args: arguments to pass to the function
-    :return: the function's returned value, or an error is reaised in timeout elapses
-    """
-    done = threading.Event()
-    done.clear()
-    _result = None
-
-    def __fcn(*x):
-        nonlocal _result
-        _result = function(*x)
-        done.set()
-
-    thread = threading.Thread(target=__fcn, args=args)
-    thread.start()
-    if not done.wait(timeout_secs):
-        raise TimeoutError('Timeout elapsed')
-    return _result
-
-
-
-
 def parallelize_iterations(generator, function, num_workers=1):
     """
     Parallelize on multiple threads the computations on a collection of elements
@@ -1,14 +1,23 @@
 """
-usage: solved-af [ -h ] -p TASK -f INPUTFILE -fo {tgf, apx}
+usage: solved-af [ -h ] -p TASK -f INPUTFILE -fo {tgf, apx, i23, saf}
                         [ -a QUERYARGUMENT ]
                         [ --formats][ --problems][ -v ]
+                        [ --save-binary FILE ][ --cache DIRECTORY ]
+       solved-af --tasks TASK[,TASK...] -f INPUTFILE -fo FORMAT
+                        [ -a QUERYARGUMENT ][ --cache DIRECTORY ]
+       solved-af --serve [ SOCKET ]
+       solved-af --batch MANIFEST [ --workers N ][ --timeout SECONDS ]
+                        [ --cache DIRECTORY ]
+       solved-af --batch DIRECTORY -p TASK [ -a QUERYARGUMENT ]
+                        [ --workers N ][ --timeout SECONDS ]
+                        [ --cache DIRECTORY ]
 
 required arguments:
   -p TASK, --problemTask TASK
   Argrumentation framework problem task to solve
   -f INPUTFILE, --inputFile INPUTFILE
   Path to file containing an argumentation framework encoding
-  -fo {tgf, apx}, --fileFormat {tgf, apx}
+  -fo {tgf, apx, i23, saf}, --fileFormat {tgf, apx, i23, saf}
   Input file format
 
 optional arguments:
@@ -17,6 +26,27 @@ optional arguments:
   --formats             List all supported input file formats and exit
   --problems            List all supported problems tasks and exit
   -v, --validate        Validate the input file before parsing
+  --tasks TASK[,TASK...]
+  Solve several tasks on the framework sharing their work and output the
+  solution of each as a line of JSON; decision tasks are solved for every
+  argument unless -a is given
+  --save-binary FILE    Also save the framework in the binary format
+  --cache DIRECTORY     Directory of a persistent cache of solutions
+
+server mode arguments:
+  --serve [ SOCKET ]
+  Keep frameworks loaded under handles and serve JSON-RPC requests to
+  load, edit and solve tasks on them, one per line, over stdio or a Unix
+  socket at the given path (see solved_af.server for the methods)
+
+batch mode arguments:
+  --batch MANIFEST/DIRECTORY
+  Solve the jobs listed in a manifest file (lines of
+  '<file> <format> <task> [<argument>]' or JSON objects), or the task on
+  every file of a supported format in a directory, and output the result
+  of each job as a line of JSON as soon as it is solved
+  --workers N           Number of worker processes (default: CPUs)
+  --timeout SECONDS     Wall-clock time limit of each job
 """
 
 # Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
@@ -34,11 +64,14 @@ optional arguments:
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
+import os
 import sys
 
-import saf.io as io
-import saf.tasks as tasks
-from saf.framework import ListGraphFramework as Framework
+import solved_af.io as io
+import solved_af.tasks as tasks
+from solved_af.cache import ResultCache, cachedSolution, solutionToNames
+from solved_af.session import FrameworkSession, orderQueries
 
 NAME = 'Solved-AF'
 VERSION = 0.1
@@ -49,37 +82,159 @@ LONG_DESCRIPTION = F"""{DESCRIPTION} Solved-AF is intended as an educational
 
 
 def main():
+    """Entry point of the solved-af command (e.g., for a console script
+        'solved-af = solved_af.__main__:main')."""
+
     if len(sys.argv) == 1:
         _showAbout()
         sys.exit(0)
 
     args = io.parseArguments()
 
-    arguments, attack_relation = io.parseInput(
+    if args.serve is not None:
+        _serve(args.serve)
+        return
+
+    if args.batch is not None:
+        sys.exit(_runBatch(args))
+
+    af = io.loadFramework(
         args.inputFile, format=args.fileFormat, validate=args.validate)
 
-    af = Framework(arguments, attack_relation)
+    if args.save_binary is not None:
+        io.writeBinaryFramework(af, args.save_binary)
+
+    cache = None if args.cache is None else ResultCache(args.cache)
+
+    if args.tasks is not None:
+        try:
+            _solveTasks(args, af, cache)
+        except BrokenPipeError:
+            _exitOnBrokenPipe()
+        return
 
     task_name = args.problemTask.upper()
     task_type = task_name[:2]
 
-    parsed_solution = None
-
-    if args.argument is None:
-        # Assuming an enumeration problem
-        taskMethod = tasks.getTaskMethod(task_name, is_enumeration=True)
-        solution = taskMethod(af)
-        if task_type == 'SE' and solution is not None:
-            parsed_solution = af.valuesToArguments(solution)
-        elif task_type == 'EE':
-            parsed_solution = [af.valuesToArguments(ext) for ext in solution]
+    def solve():
+        parsed_solution = None
+
+        if args.argument is None:
+            # Assuming an enumeration problem
+            taskMethod = tasks.getTaskMethod(task_name, is_enumeration=True)
+            solution = taskMethod(af)
+            if task_type == 'SE' and solution is not None:
+                parsed_solution = af.valuesToArguments(solution)
+            elif task_type == 'EE':
+                # Convert the extensions lazily so that they are output
+                # while the enumeration goes on.
+                parsed_solution = (af.valuesToArguments(ext)
+                                   for ext in solution)
+        else:
+            # Assuming a decision problem
+            taskMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
+            argument_value = af.argumentToValue(args.argument)
+            parsed_solution = taskMethod(af, argument_value)
+
+        return parsed_solution
+
+    parsed_solution = cachedSolution(cache, af, task_name, solve,
+                                     args.argument)
+
+    try:
+        io.outputSolution(parsed_solution, task_type, args.fileFormat)
+    except BrokenPipeError:
+        _exitOnBrokenPipe()
+
+
+def _solveTasks(args, af, cache):
+    # Solve the tasks of the --tasks option in a session, writing the
+    # solution of each task (and query argument) as a line of JSON.
+    session = FrameworkSession(af)
+
+    if args.argument is not None:
+        argument_values = [af.argumentToValue(args.argument)]
     else:
-        # Assuming a decision problem
-        taskMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
-        argument_value = af.argumentToValue(args.argument)
-        parsed_solution = taskMethod(af, argument_value)
-
-    io.outputSolution(parsed_solution, task_type)
+        argument_values = list(af.getArguments())
+
+    queries = []
+    for task_name in args.tasks:
+        if task_name[:2] in ('EE', 'SE'):
+            queries.append((task_name, None))
+        else:
+            queries.extend((task_name, arg) for arg in argument_values)
+
+    def solve(task_name, arg):
+        solution = session.solve(task_name, arg)
+        if task_name[:2] == 'EE':
+            return [af.valuesToArguments(ext) for ext in solution]
+        elif task_name[:2] == 'SE':
+            return None if solution is None \
+                else af.valuesToArguments(solution)
+        return solution
+
+    for task_name, arg in orderQueries(queries):
+        argument = None if arg is None else af.valueToArgument(arg)
+        # Only the enumeration tasks are cached, as the key of each
+        # decision would cost as much as hashing the whole framework.
+        solution = cachedSolution(
+            cache if arg is None else None, af, task_name,
+            lambda: solve(task_name, arg), argument)
+        sys.stdout.write(json.dumps({
+            'task': task_name,
+            'argument': None if argument is None else str(argument),
+            'solution': solutionToNames(solution, task_name[:2])}) + '\n')
+        sys.stdout.flush()
+
+
+def _exitOnBrokenPipe():
+    # The reader of the output has gone away (e.g., it only needed the
+    # first few extensions), hence stop quietly.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+
+def _serve(address):
+    # Serve over stdio or the Unix socket at the given path. The server
+    # (and socketserver) is only imported in server mode.
+    import solved_af.server as server
+
+    solver_server = server.SolverServer()
+    try:
+        if address == 'stdio':
+            server.serveStream(solver_server)
+        else:
+            server.serveUnixSocket(solver_server, address)
+    except KeyboardInterrupt:
+        pass
+
+
+def _runBatch(args):
+    # Solve the jobs of a manifest or of a directory, returning the exit
+    # status: 1 if any job has not been solved. The batch module (and
+    # multiprocessing) is only imported in batch mode.
+    import solved_af.batch as batch
+
+    try:
+        if os.path.isdir(args.batch):
+            jobs = batch.directoryJobs(
+                args.batch, [args.problemTask.upper()], args.argument)
+        else:
+            jobs = batch.readManifest(args.batch)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(str(e) + '\n')
+        sys.stderr.flush()
+        return 1
+
+    try:
+        failed = batch.runBatch(jobs, workers=args.workers,
+                                timeout=args.timeout,
+                                cache_directory=args.cache)
+    except BrokenPipeError:
+        _exitOnBrokenPipe()
+
+    return 1 if failed else 0
 
 
 def _showAbout():
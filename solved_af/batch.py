@@ -0,0 +1,278 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides solved-af with a batch mode solving many jobs,
+    i.e. tasks on framework files, in one process tree and reporting
+    their results as JSON lines.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import namedtuple
+
+import solved_af.io as io
+import solved_af.tasks as tasks
+import solved_af.utils as utils
+from solved_af.cache import ResultCache, cachedSolution, solutionToNames
+from solved_af.solvers import LimitExceededError
+
+# A task on a framework file; argument is None for enumeration tasks.
+Job = namedtuple('Job', ['file', 'format', 'task', 'argument'],
+                 defaults=(None,))
+
+# Number of jobs handed to a worker at once when there are plenty of
+# them, which saves inter-process round trips on small jobs.
+MAX_CHUNK_SIZE = 16
+
+
+def formatOfFile(file_path):
+    """Get the supported format of a file from its extension (e.g.,
+        'tgf' for 'af.tgf'); None if there is none."""
+
+    extension = os.path.splitext(file_path)[1][1:].lower()
+    return extension if extension in io.getFormats() else None
+
+
+def readManifest(manifest_path):
+    """Read the jobs listed in a manifest file. Each line of the file
+        is either a job given by whitespace separated fields
+        '<file> <format> <task> [<argument>]' or a JSON object with the
+        keys 'file', 'format' (optional), 'task' and 'argument'
+        (optional). Empty lines and lines starting with '#' are
+        skipped, and relative paths are relative to the manifest.
+
+    Arguments:
+        manifest_path {str} -- path to the manifest file
+
+    Returns:
+        List[Job] -- the jobs in the order they are listed
+    """
+
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+
+    with open(manifest_path, 'r') as file:
+        for number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            try:
+                if line.startswith('{'):
+                    fields = json.loads(line)
+                    file_path = fields['file']
+                    format = fields.get('format') or formatOfFile(file_path)
+                    job = Job(file_path, format, fields['task'],
+                              fields.get('argument'))
+                else:
+                    job = Job(*line.split(maxsplit=3))
+                if not isinstance(job.file, str) or \
+                        not isinstance(job.task, str) or \
+                        not all(isinstance(field, (str, type(None)))
+                                for field in (job.format, job.argument)):
+                    raise TypeError
+                job = job._replace(file=os.path.join(base, job.file),
+                                   task=job.task.upper())
+            except (ValueError, TypeError, KeyError):
+                raise ValueError(
+                    F'Invalid job on line {number} of {manifest_path}.')
+
+            jobs.append(job)
+
+    return jobs
+
+
+def directoryJobs(directory, task_names, argument=None):
+    """List the jobs solving some tasks on each file of a supported
+        format (by its extension, see formatOfFile) in a directory.
+
+    Arguments:
+        directory {str} -- path to the directory
+        task_names {List[str]} -- the AF problem task identifiers
+
+    Keyword Arguments:
+        argument {str} -- the query argument of decision tasks
+            (default: {None})
+
+    Returns:
+        List[Job] -- the jobs ordered by file name and task
+    """
+
+    jobs = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        format = formatOfFile(name)
+        if format is None or not os.path.isfile(path):
+            continue
+        jobs.extend(Job(path, format, task.upper(), argument)
+                    for task in task_names)
+
+    return jobs
+
+
+def _solve(framework, task_name, argument):
+    # Solve a task on a framework giving the solution in argument names.
+    task_type = task_name[:2]
+    if task_name not in tasks.getTasks():
+        raise ValueError(F'Task {task_name} is not supported.')
+    if (argument is None) != (task_type in ('EE', 'SE')):
+        raise ValueError(F'Task {task_name} requires an argument.'
+                         if argument is None else
+                         F'Task {task_name} does not take an argument.')
+
+    if argument is None:
+        taskMethod = tasks.getTaskMethod(task_name, is_enumeration=True)
+        solution = taskMethod(framework)
+        if task_type == 'EE':
+            return [framework.valuesToArguments(ext) for ext in solution]
+        return None if solution is None \
+            else framework.valuesToArguments(solution)
+
+    taskMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
+    try:
+        argument_value = framework.argumentToValue(argument)
+    except KeyError:
+        raise ValueError(
+            F'Argument "{argument}" is not in the framework.') from None
+    return taskMethod(framework, argument_value)
+
+
+def solveJob(job, timeout=None, cache=None):
+    """Solve a job, reporting any failure (e.g., an invalid input file,
+        an unknown query argument or the timeout expiring) in its result
+        rather than raising it.
+
+    Arguments:
+        job {Job} -- the job
+
+    Keyword Arguments:
+        timeout {float} -- wall-clock time limit in seconds
+            (default: {None})
+        cache {saf.cache.ResultCache} -- the cache of solutions to use
+            (default: {None})
+
+    Returns:
+        Dict -- the JSON serialisable result: the fields of the job, the
+            'status' ('ok', 'timeout' or 'error'), the 'solution' or an
+            error 'message' and the 'seconds' taken
+    """
+
+    result = job._asdict()
+    start = time.monotonic()
+
+    try:
+        with utils.memoScope():
+            framework = io.readFramework(job.file, job.format)
+            solution = tasks.solveWithDeadline(
+                cachedSolution, cache, framework, job.task,
+                lambda: _solve(framework, job.task, job.argument),
+                job.argument, seconds=timeout)
+        result['status'] = 'ok'
+        result['solution'] = solutionToNames(solution, job.task[:2])
+    except LimitExceededError as e:
+        result['status'] = 'timeout'
+        result['message'] = str(e)
+    except io.InvalidInputError as e:
+        result['status'] = 'error'
+        result['message'] = F'Invalid input file! {e}'
+    except OSError as e:
+        result['status'] = 'error'
+        result['message'] = F'{e.strerror}: {job.file}'
+    except SystemExit:
+        # The SAT solver reports its failure to run on stderr and exits,
+        # which would take the worker process down.
+        result['status'] = 'error'
+        result['message'] = 'The SAT solver could not be run.'
+    except Exception as e:
+        result['status'] = 'error'
+        result['message'] = str(e) or type(e).__name__
+
+    result['seconds'] = round(time.monotonic() - start, 6)
+
+    return result
+
+
+# The solution cache of each worker process (see _initialiseWorker).
+_workerCache = None
+_workerTimeout = None
+
+
+def _initialiseWorker(cache_directory, timeout):
+    global _workerCache, _workerTimeout
+    _workerCache = None if cache_directory is None \
+        else ResultCache(cache_directory)
+    _workerTimeout = timeout
+
+
+def _solveIndexedJob(indexed_job):
+    index, job = indexed_job
+    result = solveJob(job, _workerTimeout, _workerCache)
+    return dict(job=index, **result)
+
+
+def runBatch(jobs, workers=None, timeout=None, cache_directory=None,
+             output=None):
+    """Solve jobs on a pool of worker processes and write their results
+        (see solveJob) as JSON lines as soon as each job is done, i.e.
+        not necessarily in the order of the jobs. Each result also
+        holds the index of its job under 'job'.
+
+    Arguments:
+        jobs {List[Job]} -- the jobs to solve
+
+    Keyword Arguments:
+        workers {int} -- the number of worker processes; the jobs are
+            solved in this process if 1, and by as many workers as
+            there are CPUs if None (default: {None})
+        timeout {float} -- wall-clock time limit of each job in seconds
+            (default: {None})
+        cache_directory {str} -- directory of a persistent cache of
+            solutions shared by the workers (default: {None})
+        output {File} -- where to write the results
+            (default: {sys.stdout})
+
+    Returns:
+        int -- the number of jobs which have not been solved
+    """
+
+    output = sys.stdout if output is None else output
+    workers = workers or os.cpu_count() or 1
+    indexed_jobs = list(enumerate(jobs))
+    failed = 0
+
+    def write(result):
+        nonlocal failed
+        failed += result['status'] != 'ok'
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+
+    if workers == 1 or len(indexed_jobs) <= 1:
+        _initialiseWorker(cache_directory, timeout)
+        for indexed_job in indexed_jobs:
+            write(_solveIndexedJob(indexed_job))
+        return failed
+
+    chunk_size = max(1, min(MAX_CHUNK_SIZE,
+                            len(indexed_jobs) // (4 * workers)))
+    with multiprocessing.Pool(workers, _initialiseWorker,
+                              (cache_directory, timeout)) as pool:
+        for result in pool.imap_unordered(_solveIndexedJob, indexed_jobs,
+                                          chunk_size):
+            write(result)
+
+    return failed
@@ -0,0 +1,21 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This package provides solved-af with benchmarks timing its tasks on
+    synthetic frameworks (see solved_af.benchmarks.generators) across
+    sweeps of sizes and comparing the measurements against stored
+    baselines (see solved_af.benchmarks.suite). Run it with
+    'python -m solved_af.benchmarks'.
+"""
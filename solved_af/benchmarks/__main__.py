@@ -0,0 +1,196 @@
+"""
+usage: python -m solved_af.benchmarks [ --generators NAME[,NAME...] ]
+                        [ --sizes N[,N...] ][ --tasks TASK[,TASK...] ]
+                        [ --repeat N ][ --queries N ][ --seed N ]
+                        [ --timeout SECONDS ][ --backend BACKEND ]
+                        [ --probabilistic ][ --uncertain-attacks N ]
+                        [ --save-baseline FILE ][ --baseline FILE ]
+                        [ --tolerance FRACTION ]
+
+Time the AF tasks on generated frameworks across a sweep of sizes and
+output a line per task and framework: its wall time, SAT solver queries
+and peak memory. If a baseline is given, the measurements which regress
+against it are listed after them and the exit status is 1.
+
+optional arguments:
+  --generators NAME[,NAME...]
+  Generators of the frameworks (default: all, see
+  solved_af.benchmarks.generators)
+  --sizes N[,N...]      Numbers of arguments of the frameworks
+  --tasks TASK[,TASK...]
+  Tasks to time (default: all)
+  --repeat N            Timed runs of each task (default: 3)
+  --queries N           Arguments each decision task is solved for
+  --seed N              Seed of the generators
+  --timeout SECONDS     Wall-clock time limit of each run
+  --backend BACKEND     SAT backend (see saf.tasks.getSATBackends)
+  --probabilistic       Time the probabilities of the tasks computed by the
+  ProbabilisiticWrapper of PyPLAF instead
+  --uncertain-attacks N
+  Attacks of probability 0.5 of the probabilistic frameworks
+  --save-baseline FILE  Store the measurements as a baseline
+  --baseline FILE       Compare the measurements against a baseline
+  --tolerance FRACTION  Relative growth of the wall time and peak memory
+  allowed against the baseline (default: 0.25)
+"""
+
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+
+import solved_af.tasks as tasks
+from solved_af.benchmarks.generators import getGenerators
+from solved_af.benchmarks.suite import (compareToBaseline, loadBaseline,
+                                        runSuite, saveBaseline)
+
+DEFAULT_SIZES = [25, 50, 100]
+# The ProbabilisiticWrapper solves each task on 2^uncertain-attacks
+# frameworks held as dense attack matrices, hence smaller sizes.
+DEFAULT_PROBABILISTIC_SIZES = [8, 16]
+
+_ROW = '{:<16} {:>7} {:<9} {:>11} {:>8} {:>12} {}'
+
+
+def _listOf(type, choices=None):
+    # Argparse type of a comma separated list of values.
+    def parse(value):
+        try:
+            values = [type(item.strip()) for item in value.split(',')]
+        except ValueError:
+            raise argparse.ArgumentTypeError(F'invalid list: {value}')
+        unknown = [str(v) for v in values
+                   if choices is not None and v not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                F'invalid choice(s): {", ".join(unknown)}')
+        return values
+
+    return parse
+
+
+def _initialiseArgumentParser():
+    parser = argparse.ArgumentParser(prog='python -m solved_af.benchmarks')
+
+    parser.add_argument('--generators',
+                        type=_listOf(str, getGenerators()),
+                        default=getGenerators(),
+                        metavar='<name>[,<name>...]',
+                        help='Generators of the frameworks (default: all)')
+    parser.add_argument('--sizes',
+                        type=_listOf(int),
+                        metavar='<n>[,<n>...]',
+                        help='Numbers of arguments of the frameworks')
+    parser.add_argument('--tasks',
+                        type=_listOf(lambda name: name.upper(),
+                                     tasks.getTasks()),
+                        default=tasks.getTasks(),
+                        metavar='<task>[,<task>...]',
+                        help='Tasks to time (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, metavar='<n>',
+                        help='Timed runs of each task (default: 3)')
+    parser.add_argument('--queries', type=int, default=3, metavar='<n>',
+                        help='Arguments each decision task is solved for \
+                            (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, metavar='<n>',
+                        help='Seed of the generators (default: 0)')
+    parser.add_argument('--timeout', type=float, metavar='<seconds>',
+                        help='Wall-clock time limit of each run')
+    parser.add_argument('--backend',
+                        choices=tasks.getSATBackends(),
+                        default=tasks.SAT_BACKEND,
+                        help='SAT backend (default: %(default)s)')
+    parser.add_argument('--probabilistic',
+                        action='store_true',
+                        help='Time the probabilities of the tasks computed \
+                            by the ProbabilisiticWrapper instead')
+    parser.add_argument('--uncertain-attacks', type=int, default=3,
+                        metavar='<n>',
+                        help='Attacks of probability 0.5 of the \
+                            probabilistic frameworks (default: 3)')
+    parser.add_argument('--save-baseline', type=str, metavar='<file>',
+                        help='Store the measurements as a baseline')
+    parser.add_argument('--baseline', type=str, metavar='<file>',
+                        help='Compare the measurements against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        metavar='<fraction>',
+                        help='Relative growth of the wall time and peak \
+                            memory allowed (default: 0.25)')
+
+    return parser
+
+
+def _formatMeasurement(measurement):
+    def show(value, format='{}'):
+        return '-' if value is None else format.format(value)
+
+    return _ROW.format(measurement.generator, measurement.size,
+                       measurement.task,
+                       show(measurement.seconds, '{:.4f}'),
+                       show(measurement.solver_calls),
+                       show(measurement.peak_bytes),
+                       measurement.status)
+
+
+def main():
+    parser = _initialiseArgumentParser()
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline, backend = loadBaseline(args.baseline)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(F'cannot load the baseline: {e}')
+        if backend != args.backend:
+            sys.stderr.write(F'The baseline was measured with the '
+                             F'"{backend}" backend, not "{args.backend}".\n')
+
+    if args.sizes is None:
+        args.sizes = DEFAULT_PROBABILISTIC_SIZES if args.probabilistic \
+            else DEFAULT_SIZES
+    tasks.SAT_BACKEND = args.backend
+
+    print(_ROW.format('generator', 'size', 'task', 'seconds', 'calls',
+                      'peak bytes', 'status'))
+    measurements = []
+    for measurement in runSuite(args.generators, args.sizes, args.tasks,
+                                seed=args.seed, repeat=args.repeat,
+                                queries=args.queries, timeout=args.timeout,
+                                probabilistic=args.probabilistic,
+                                uncertain_attacks=args.uncertain_attacks):
+        measurements.append(measurement)
+        print(_formatMeasurement(measurement), flush=True)
+
+    if args.save_baseline is not None:
+        saveBaseline(measurements, args.save_baseline, args.backend)
+
+    if baseline is None:
+        return
+
+    regressions = [c for c in compareToBaseline(measurements, baseline,
+                                                args.tolerance)
+                   if c.regressed]
+    print(F'\n{len(regressions)} regression(s) against {args.baseline}')
+    for c in regressions:
+        print(F'{c.generator} {c.size} {c.task}: {c.metric} '
+              F'{c.baseline} -> {c.current}')
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides the solved-af benchmarks with generators of
+    synthetic argumentation frameworks. Each generator takes the number
+    of arguments, a seed and its own parameters, and the same seed
+    always generates the same framework. The arguments are named 1 to
+    the number of arguments.
+"""
+
+import bisect
+import math
+import random
+
+from solved_af.framework import ListGraphFramework
+
+
+def _framework(size, attacks):
+    return ListGraphFramework(range(1, size + 1), sorted(attacks))
+
+
+def _sampleIndices(count, probability, rng):
+    # Sample each index of range(count) with a probability in time
+    # linear in the number of sampled indices, by skipping geometrically
+    # distributed gaps (Batagelj and Brandes, 2005).
+    if probability <= 0:
+        return
+    if probability >= 1:
+        yield from range(count)
+        return
+
+    log_q = math.log(1 - probability)
+    index = -1
+    while True:
+        index += 1 + int(math.log(1 - rng.random()) / log_q)
+        if index >= count:
+            return
+        yield index
+
+
+def erdosRenyi(size, seed=0, degree=2.0):
+    """Generate a framework in which each argument attacks each other
+        argument independently with the same probability.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        degree {float} -- the expected number of arguments attacked by
+            each argument (default: {2.0})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    if size < 2:
+        return _framework(size, [])
+
+    attacks = []
+    for index in _sampleIndices(size * (size - 1), degree / (size - 1), rng):
+        attacker, offset = divmod(index, size - 1)
+        attacked = offset + (offset >= attacker)
+        attacks.append((attacker + 1, attacked + 1))
+
+    return _framework(size, attacks)
+
+
+def barabasiAlbert(size, seed=0, attachments=2):
+    """Generate a framework by preferential attachment: each argument
+        in turn is connected to a number of the previous arguments,
+        chosen with probabilities proportional to the number of attacks
+        they take part in. Each connection is an attack in a random
+        direction, hence a few arguments attack or are attacked by many
+        others.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        attachments {int} -- the number of previous arguments each
+            argument is connected to (default: {2})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    attacks = set()
+    # Each argument is listed once per attack it takes part in, so that
+    # a uniform choice from the list is a preferential one.
+    endpoints = []
+
+    for arg in range(attachments + 1, size + 1):
+        if endpoints:
+            targets = set()
+            while len(targets) < attachments:
+                targets.add(rng.choice(endpoints))
+        else:
+            targets = set(range(1, attachments + 1))
+
+        for target in sorted(targets):
+            attacks.add((arg, target) if rng.random() < 0.5
+                        else (target, arg))
+            endpoints.extend((arg, target))
+
+    return _framework(size, attacks)
+
+
+def grid(size, seed=0, mutual=0.5):
+    """Generate a framework whose arguments lie on a square grid (row
+        by row), each attacking or being attacked by its right and lower
+        neighbours.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        mutual {float} -- the probability that two neighbours attack
+            each other; otherwise one of them attacks the other
+            (default: {0.5})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    width = max(1, math.ceil(math.sqrt(size)))
+    attacks = []
+
+    for arg in range(size):
+        neighbours = [arg + width]
+        if (arg + 1) % width:
+            neighbours.append(arg + 1)
+        for neighbour in neighbours:
+            if neighbour >= size:
+                continue
+            if rng.random() < mutual:
+                attacks.append((arg + 1, neighbour + 1))
+                attacks.append((neighbour + 1, arg + 1))
+            elif rng.random() < 0.5:
+                attacks.append((arg + 1, neighbour + 1))
+            else:
+                attacks.append((neighbour + 1, arg + 1))
+
+    return _framework(size, attacks)
+
+
+def layeredAcyclic(size, seed=0, layers=None, degree=2):
+    """Generate an acyclic framework whose arguments are split into
+        layers, the arguments of each layer being attacked only by
+        arguments of the previous layer. Its grounded labelling decides
+        all arguments.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        layers {int} -- the number of layers; about the square root of
+            the size if None (default: {None})
+        degree {int} -- the number of attackers of each argument outside
+            the first layer, if the previous layer is large enough
+            (default: {2})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    if layers is None:
+        layers = max(1, round(math.sqrt(size)))
+    layers = max(1, min(layers, size))
+    # The first argument of each layer, and the end of the last one.
+    starts = [1 + layer * size // layers for layer in range(layers + 1)]
+
+    attacks = []
+    for layer in range(1, layers):
+        previous = range(starts[layer - 1], starts[layer])
+        for arg in range(starts[layer], starts[layer + 1]):
+            attacks.extend((attacker, arg) for attacker in
+                           rng.sample(previous, min(degree, len(previous))))
+
+    return _framework(size, attacks)
+
+
+def sccHeavy(size, seed=0, scc_size=8, degree=1.0, cross_attacks=2):
+    """Generate a framework made of many strongly connected components:
+        consecutive blocks of arguments, each a cycle with additional
+        random attacks within it. The components are ordered and each
+        is attacked by a few arguments of the previous components.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        scc_size {int} -- the number of arguments of each component but
+            possibly the last (default: {8})
+        degree {float} -- the expected number of additional attacks by
+            each argument within its component (default: {1.0})
+        cross_attacks {int} -- the number of attacks on each component
+            from the previous ones (default: {2})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    attacks = set()
+
+    for start in range(1, size + 1, scc_size):
+        members = list(range(start, min(start + scc_size, size + 1)))
+        count = len(members)
+
+        attacks.update(zip(members, members[1:] + members[:1]))
+        if count > 1:
+            for index in _sampleIndices(count * count, degree / count, rng):
+                attacks.add((members[index // count],
+                             members[index % count]))
+
+        if start > 1:
+            for _ in range(cross_attacks):
+                attacks.add((rng.randrange(1, start), rng.choice(members)))
+
+    return _framework(size, attacks)
+
+
+def iccmaStyle(size, seed=0, component_size=20, inner_probability=0.25,
+               outer_degree=1.0, self_attacks=0.01):
+    """Generate a framework in the style of the random instances of the
+        ICCMA competitions (e.g., those of the SCC generator of the
+        probo benchmark suite): components of random sizes, densely
+        attacking within themselves, with sparser attacks from earlier
+        components on later ones and a few self-attacking arguments.
+
+    Arguments:
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        component_size {int} -- the mean number of arguments of a
+            component (default: {20})
+        inner_probability {float} -- the probability of an attack
+            between two arguments of a component (default: {0.25})
+        outer_degree {float} -- the mean number of attacks on each
+            argument from earlier components (default: {1.0})
+        self_attacks {float} -- the probability that an argument attacks
+            itself (default: {0.01})
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    rng = random.Random(seed)
+    attacks = set()
+
+    num_of_components = max(1, round(size / component_size))
+    cuts = sorted(rng.sample(range(2, size + 1),
+                             min(num_of_components - 1, max(0, size - 1))))
+    starts = [1] + cuts + [size + 1]
+
+    for start, end in zip(starts, starts[1:]):
+        count = end - start
+        for index in _sampleIndices(count * count, inner_probability, rng):
+            attacker, attacked = divmod(index, count)
+            if attacker != attacked:
+                attacks.add((start + attacker, start + attacked))
+
+    if len(starts) > 2:
+        for _ in range(round(outer_degree * (size - starts[1] + 1))):
+            attacked = rng.randrange(starts[1], size + 1)
+            # Any argument of the components before that of the attacked.
+            component = bisect.bisect_right(starts, attacked) - 1
+            attacks.add((rng.randrange(1, starts[component]), attacked))
+
+    for arg in _sampleIndices(size, self_attacks, rng):
+        attacks.add((arg + 1, arg + 1))
+
+    return _framework(size, attacks)
+
+
+_generators = {
+    # Here list all supported generators by the name they are referred
+    # to by in the benchmarks.
+    'erdos-renyi': erdosRenyi,
+    'barabasi-albert': barabasiAlbert,
+    'grid': grid,
+    'layered': layeredAcyclic,
+    'scc': sccHeavy,
+    'iccma': iccmaStyle
+}
+
+
+def getGenerators():
+    return list(_generators.keys())
+
+
+def generateFramework(generator_name, size, seed=0, **parameters):
+    """Generate a framework with one of the generators.
+
+    Arguments:
+        generator_name {str} -- the name of the generator (see
+            getGenerators)
+        size {int} -- the number of arguments
+
+    Keyword Arguments:
+        seed {int} -- the seed of the random generator (default: {0})
+        parameters -- the generator's own parameters
+
+    Returns:
+        ListGraphFramework -- the framework
+    """
+
+    try:
+        generator = _generators[generator_name]
+    except KeyError:
+        raise ValueError(
+            F'Generator "{generator_name}" is not supported! Supported '
+            F'generators are: {", ".join(getGenerators())}.') from None
+
+    return generator(size, seed=seed, **parameters)
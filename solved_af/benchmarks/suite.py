@@ -0,0 +1,390 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides the solved-af benchmarks, which time the AF
+    tasks (and the probabilities computed by the ProbabilisiticWrapper
+    of PyPLAF) on generated frameworks of growing sizes, and compare the
+    measurements against a stored baseline.
+"""
+
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+
+import solved_af.tasks as tasks
+import solved_af.utils as utils
+from solved_af.benchmarks.generators import generateFramework
+from solved_af.solvers import LimitExceededError
+
+# A task timed on a generated framework. The seconds are the least wall
+# time of the repeated runs, the peak memory is that allocated by Python
+# during a run (hence not by external SAT solver processes) and the
+# status is either 'ok', 'timeout' or 'skipped' (once the task has timed
+# out on a smaller framework of the same generator).
+Measurement = namedtuple('Measurement', ['generator', 'size', 'task',
+                                         'seconds', 'solver_calls',
+                                         'peak_bytes', 'status'])
+
+# A difference between a measurement and its baseline; regressed is set
+# if the measurement is worse beyond the tolerance.
+Comparison = namedtuple('Comparison', ['generator', 'size', 'task',
+                                       'metric', 'baseline', 'current',
+                                       'regressed'])
+
+BASELINE_VERSION = 1
+
+# Differences in wall time below this many seconds are noise.
+MIN_SECONDS_DIFFERENCE = 0.01
+
+# Prefix of the probabilistic tasks, e.g. 'P-EE-PR' is the probability
+# of the preferred extensions computed by the ProbabilisiticWrapper.
+PROBABILISTIC_PREFIX = 'P-'
+
+
+class SolverCallCounter:
+    """Counts the SAT solvers constructed and the queries made to them
+        under countingSolverCalls.
+    """
+
+    def __init__(self):
+        self.solvers = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _countingBackend(self, makeSolver):
+        def make(*args):
+            solver = makeSolver(*args)
+            solve = solver.solve
+
+            def countingSolve(assumptions=()):
+                with self._lock:
+                    self.calls += 1
+                return solve(assumptions)
+
+            solver.solve = countingSolve
+            with self._lock:
+                self.solvers += 1
+            return solver
+
+        return make
+
+
+@contextlib.contextmanager
+def countingSolverCalls():
+    """Context manager counting the SAT solvers constructed and queried
+        by all tasks solved under it (of any backend, see
+        saf.tasks.getSATBackends). NB it is not meant to be entered by
+        concurrent threads.
+
+    Returns:
+        SolverCallCounter -- the counts
+    """
+
+    counter = SolverCallCounter()
+    backends = dict(tasks._satBackends)
+    tasks._satBackends.update(
+        (name, counter._countingBackend(makeSolver))
+        for name, makeSolver in backends.items())
+    try:
+        yield counter
+    finally:
+        tasks._satBackends.update(backends)
+
+
+def measure(solve, repeat=3, timeout=None):
+    """Measure a function solving a task: its least wall time over a
+        number of runs, then the number of SAT solver queries and the
+        peak memory allocated in one more (traced, hence slower) run.
+
+    Arguments:
+        solve {Callable} -- method solving the task, which must not
+            return a generator which is yet to be consumed
+
+    Keyword Arguments:
+        repeat {int} -- the number of timed runs (default: {3})
+        timeout {float} -- wall-clock time limit of each run in seconds
+            (default: {None})
+
+    Returns:
+        Tuple[float, int, int] -- the seconds, SAT solver queries and
+            peak bytes
+
+    Raises:
+        saf.solvers.LimitExceededError -- if a run times out
+    """
+
+    best = None
+    for _ in range(max(1, repeat)):
+        with utils.memoScope():
+            start = time.perf_counter()
+            tasks.solveWithDeadline(solve, seconds=timeout)
+            seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        with countingSolverCalls() as counter, utils.memoScope():
+            tasks.solveWithDeadline(solve, seconds=timeout)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return best, counter.calls, peak_bytes
+
+
+def queryArguments(framework, count):
+    """Choose up to a number of arguments of a framework, evenly spread
+        over its argument values, to query decision tasks for."""
+
+    values = sorted(framework.getArguments())
+    if not values or count <= 0:
+        return []
+
+    count = min(count, len(values))
+    return [values[i * len(values) // count] for i in range(count)]
+
+
+def taskSolver(framework, task_name, query_arguments):
+    """Get a function solving a task on a framework: enumerating all
+        extensions of an EE task, or deciding a decision task for each
+        of the query arguments."""
+
+    task_type = task_name[:2]
+
+    if task_type in ('EE', 'SE'):
+        taskMethod = tasks.getTaskMethod(task_name, is_enumeration=True)
+        if task_type == 'EE':
+            return lambda: sum(1 for _ in taskMethod(framework))
+        return lambda: taskMethod(framework)
+
+    taskMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
+    return lambda: [taskMethod(framework, arg) for arg in query_arguments]
+
+
+def probabilisticSolver(framework, task_name, query_arguments,
+                        uncertain_attacks=3):
+    """Get a function computing, for a framework made probabilistic,
+        the probabilities of the extensions of an EE or SE task (see
+        ProbabilisiticWrapper.get_p_extension) or of the acceptance of
+        each query argument by a decision task (see get_p_decision).
+        NB requires the argumentation_framework package of PyPLAF.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework, whose arguments
+            are named 1 to its size (see
+            solved_af.benchmarks.generators)
+        task_name {str} -- the AF problem task identifier (e.g., EE-CO)
+        query_arguments {List[int]} -- the arguments of decision tasks
+
+    Keyword Arguments:
+        uncertain_attacks {int} -- the number of attacks given the
+            probability 0.5, hence the wrapper solves the task on 2 to
+            this power frameworks (default: {3})
+
+    Returns:
+        Callable -- the function
+    """
+
+    from argumentation_framework.frameworks import (ArgumentationFramework,
+                                                    ProbabilisiticWrapper)
+
+    af = ArgumentationFramework(len(framework))
+    attacks = sorted(framework.getAttacks())
+    for attacker, attacked in attacks:
+        af.set_attacks(attacker - 1, attacked - 1, True)
+
+    wrapper = ProbabilisiticWrapper(af)
+    for attacker, attacked in attacks[:uncertain_attacks]:
+        wrapper.set_p_attacks(attacker - 1, attacked - 1, 0.5)
+
+    if task_name[:2] in ('EE', 'SE'):
+        return lambda: list(wrapper.get_p_extension(task_name))
+    return lambda: [wrapper.get_p_decision(arg - 1, task_name)
+                    for arg in query_arguments]
+
+
+def runSuite(generator_names, sizes, task_names, seed=0, repeat=3,
+             queries=3, timeout=None, probabilistic=False,
+             uncertain_attacks=3):
+    """Time tasks on the frameworks of some generators across a sweep
+        of sizes. A task which times out on a framework is skipped on
+        the larger frameworks of the same generator.
+
+    Arguments:
+        generator_names {List[str]} -- the generators (see
+            solved_af.benchmarks.generators.getGenerators)
+        sizes {List[int]} -- the numbers of arguments of the frameworks
+        task_names {List[str]} -- the AF problem task identifiers
+
+    Keyword Arguments:
+        seed {int} -- the seed of the generators (default: {0})
+        repeat {int} -- the number of timed runs of each task
+            (default: {3})
+        queries {int} -- the number of arguments each decision task is
+            solved for (default: {3})
+        timeout {float} -- wall-clock time limit of each run in seconds
+            (default: {None})
+        probabilistic {bool} -- whether to time the probabilities of the
+            tasks computed by the ProbabilisiticWrapper instead of the
+            tasks themselves (see probabilisticSolver) (default: {False})
+        uncertain_attacks {int} -- the number of uncertain attacks of
+            the probabilistic frameworks (default: {3})
+
+    Returns:
+        Generator[Measurement] -- the measurements as they are made
+    """
+
+    for generator_name in generator_names:
+        timed_out = set()
+
+        for size in sorted(sizes):
+            framework = generateFramework(generator_name, size, seed)
+            query_arguments = queryArguments(framework, queries)
+
+            for task_name in task_names:
+                label = PROBABILISTIC_PREFIX + task_name if probabilistic \
+                    else task_name
+                if task_name in timed_out:
+                    yield Measurement(generator_name, size, label,
+                                      None, None, None, 'skipped')
+                    continue
+
+                if probabilistic:
+                    solve = probabilisticSolver(framework, task_name,
+                                                query_arguments,
+                                                uncertain_attacks)
+                else:
+                    solve = taskSolver(framework, task_name,
+                                       query_arguments)
+
+                try:
+                    seconds, calls, peak_bytes = measure(solve, repeat,
+                                                         timeout)
+                except LimitExceededError:
+                    timed_out.add(task_name)
+                    yield Measurement(generator_name, size, label,
+                                      None, None, None, 'timeout')
+                    continue
+
+                yield Measurement(generator_name, size, label,
+                                  round(seconds, 6), calls, peak_bytes, 'ok')
+
+
+def saveBaseline(measurements, file_path, backend=None):
+    """Store measurements as a baseline in a JSON file.
+
+    Arguments:
+        measurements {Iterable[Measurement]} -- the measurements
+        file_path {str} -- path to the file
+
+    Keyword Arguments:
+        backend {str} -- the SAT backend measured (default:
+            {saf.tasks.SAT_BACKEND})
+    """
+
+    content = {
+        'version': BASELINE_VERSION,
+        'backend': tasks.SAT_BACKEND if backend is None else backend,
+        'measurements': [m._asdict() for m in measurements]
+    }
+    with open(file_path, 'w') as file:
+        json.dump(content, file, indent=1)
+        file.write('\n')
+
+
+def loadBaseline(file_path):
+    """Load a baseline stored by saveBaseline.
+
+    Arguments:
+        file_path {str} -- path to the file
+
+    Returns:
+        Tuple[List[Measurement], str] -- the measurements and the SAT
+            backend measured
+    """
+
+    with open(file_path, 'r') as file:
+        content = json.load(file)
+
+    if content.get('version') != BASELINE_VERSION:
+        raise ValueError(F'{file_path} is not a baseline of version '
+                         F'{BASELINE_VERSION}.')
+
+    return [Measurement(**m) for m in content['measurements']], \
+        content.get('backend')
+
+
+def compareToBaseline(measurements, baseline, tolerance=0.25):
+    """Compare measurements against those of a baseline made on the
+        same generators, sizes and tasks. The wall time and peak memory
+        regress if they grow by more than the tolerance, the solver
+        calls regress if there are any more of them and the status
+        regresses if a task no longer completes.
+
+    Arguments:
+        measurements {Iterable[Measurement]} -- the measurements
+        baseline {Iterable[Measurement]} -- the measurements of the
+            baseline; those of no measurement are ignored
+
+    Keyword Arguments:
+        tolerance {float} -- the relative growth allowed
+            (default: {0.25})
+
+    Returns:
+        List[Comparison] -- the comparisons of the metrics which differ
+    """
+
+    by_case = {(m.generator, m.size, m.task): m for m in baseline}
+    comparisons = []
+
+    for current in measurements:
+        case = (current.generator, current.size, current.task)
+        previous = by_case.get(case)
+        if previous is None:
+            continue
+
+        if previous.status != current.status:
+            comparisons.append(Comparison(
+                *case, 'status', previous.status, current.status,
+                previous.status == 'ok'))
+        if previous.status != 'ok' or current.status != 'ok':
+            continue
+
+        if current.seconds != previous.seconds:
+            comparisons.append(Comparison(
+                *case, 'seconds', previous.seconds, current.seconds,
+                current.seconds > previous.seconds * (1 + tolerance) and
+                current.seconds - previous.seconds > MIN_SECONDS_DIFFERENCE))
+        if current.solver_calls != previous.solver_calls:
+            comparisons.append(Comparison(
+                *case, 'solver_calls', previous.solver_calls,
+                current.solver_calls,
+                current.solver_calls > previous.solver_calls))
+        if current.peak_bytes != previous.peak_bytes:
+            comparisons.append(Comparison(
+                *case, 'peak_bytes', previous.peak_bytes, current.peak_bytes,
+                current.peak_bytes > previous.peak_bytes * (1 + tolerance)))
+
+    return comparisons
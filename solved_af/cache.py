@@ -0,0 +1,316 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides solved-af with a persistent on-disk cache of
+    AF task solutions keyed by the content of the framework and task.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Default cap on the total size of the cached solutions in bytes.
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# Cap on the size of a single cached solution in bytes. The extensions of
+# larger enumerations are passed on without being kept or cached.
+MAX_ENTRY_BYTES = 16 * 2**20
+
+_MISSING = object()
+
+
+def taskKey(arguments, attacks, task_name, argument=None):
+    """Compute the canonical key of a task on a framework. The key does
+        not depend on the order in which the arguments and attacks are
+        given.
+
+    Arguments:
+        arguments {Iterable} -- the names of the framework's arguments
+        attacks {Iterable[Tuple]} -- the attacks as pairs of names
+        task_name {str} -- the AF problem task identifier (e.g., EE-CO)
+
+    Keyword Arguments:
+        argument {str} -- the name of the query argument of a decision
+            task (default: {None})
+
+    Returns:
+        str -- hex digest identifying the task on the framework
+    """
+
+    canonical = {
+        'arguments': sorted(str(arg) for arg in arguments),
+        'attacks': sorted((str(attacker), str(attacked))
+                          for attacker, attacked in attacks),
+        'task': task_name.upper(),
+        'argument': None if argument is None else str(argument)
+    }
+    encoded = json.dumps(canonical, separators=(',', ':')).encode()
+
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def frameworkTaskKey(framework, task_name, argument=None):
+    """Compute the canonical key of a task on a framework representation
+        (see taskKey) from its argument names.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        task_name {str} -- the AF problem task identifier (e.g., EE-CO)
+
+    Keyword Arguments:
+        argument {str} -- the name of the query argument of a decision
+            task (default: {None})
+
+    Returns:
+        str -- hex digest identifying the task on the framework
+    """
+
+    arguments = framework.valuesToArguments(framework.getArguments())
+    attacks = (framework.valuesToArguments(attack)
+               for attack in framework.getAttacks())
+
+    return taskKey(arguments, attacks, task_name, argument)
+
+
+def solutionToNames(solution, task_type):
+    """Convert a solution given in argument names into its cacheable
+        (JSON serialisable) form, in which all names are strings.
+
+    Arguments:
+        solution {List[List] or List or bool or None} -- the solution
+        task_type {str} -- the task type (e.g., EE)
+
+    Returns:
+        List[List[str]] or List[str] or bool or None -- the solution
+    """
+
+    if task_type == 'EE':
+        return [[str(arg) for arg in ext] for ext in solution]
+    elif task_type == 'SE':
+        return None if solution is None else [str(arg) for arg in solution]
+    return bool(solution)
+
+
+def solutionFromNames(solution, task_type, arguments):
+    """Convert a cached solution back to the framework's own argument
+        names (which need not be strings).
+
+    Arguments:
+        solution {List[List[str]] or List[str] or bool or None} -- the
+            cached solution
+        task_type {str} -- the task type (e.g., EE)
+        arguments {Iterable} -- the names of the framework's arguments
+
+    Returns:
+        List[List] or List or bool or None -- the solution
+    """
+
+    by_name = {str(arg): arg for arg in arguments}
+
+    if task_type == 'EE':
+        return [[by_name[arg] for arg in ext] for ext in solution]
+    elif task_type == 'SE':
+        return None if solution is None else [by_name[arg]
+                                              for arg in solution]
+    return solution
+
+
+class ResultCache:
+    """Persistent cache of AF task solutions stored as one JSON file per
+        key in a local directory. The least recently used solutions are
+        evicted once the directory grows beyond a size cap.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """Constructor of the ResultCache.
+
+        Arguments:
+            directory {str} -- the directory to store the solutions in,
+                created if it does not exist
+
+        Keyword Arguments:
+            max_bytes {int} -- cap on the total size of the stored
+                solutions (default: {DEFAULT_MAX_BYTES})
+        """
+
+        self._directory = os.path.abspath(os.path.expanduser(directory))
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self._directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self._directory, key[:2], key + '.json')
+
+    def _entries(self):
+        for root, _, files in os.walk(self._directory):
+            for name in files:
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+    def get(self, key, default=None):
+        """Get the solution stored under a key, marking it as recently
+            used.
+
+        Arguments:
+            key {str} -- the key of the solution (see taskKey)
+
+        Keyword Arguments:
+            default -- the value to return if nothing is stored under
+                the key (default: {None})
+        """
+
+        path = self._path(key)
+        try:
+            with open(path, 'r') as file:
+                solution = json.load(file)['solution']
+        except (OSError, ValueError, KeyError):
+            return default
+
+        try:
+            # The modification time orders entries by their last use.
+            os.utime(path)
+        except OSError:
+            pass
+
+        return solution
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def put(self, key, solution):
+        """Store a JSON serialisable solution under a key, evicting the
+            least recently used solutions if the size cap is exceeded.
+        """
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = json.dumps({'solution': solution})
+
+        # Write to a temporary file first so that readers (possibly in
+        # other processes) never see a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as file:
+            file.write(content)
+
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += os.path.getsize(path)
+
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if self._size <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all stored solutions."""
+
+        with self._lock:
+            for path in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+
+def cachedSolution(cache, framework, task_name, solve, argument=None):
+    """Get the solution of a task on a framework from a cache, or solve
+        it and store the solution in the cache if it is not there.
+
+    Arguments:
+        cache {ResultCache or None} -- the cache; None disables caching
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        task_name {str} -- the AF problem task identifier (e.g., EE-CO)
+        solve {Callable} -- method returning the solution in argument
+            names if it is not cached; the extensions of an EE task may
+            be returned by a generator
+
+    Keyword Arguments:
+        argument {str} -- the name of the query argument of a decision
+            task (default: {None})
+
+    Returns:
+        List[List] or List or bool or None -- the solution; a
+            generator for an EE task solved by a generator
+    """
+
+    if cache is None:
+        return solve()
+
+    key = frameworkTaskKey(framework, task_name, argument)
+    task_type = task_name[:2].upper()
+
+    cached = cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        arguments = framework.valuesToArguments(framework.getArguments())
+        return solutionFromNames(cached, task_type, arguments)
+
+    solution = solve()
+    if task_type == 'EE' and not isinstance(solution, list):
+        return _cachingEnumeration(cache, key, solution)
+
+    cache.put(key, solutionToNames(solution, task_type))
+
+    return solution
+
+
+def _cachingEnumeration(cache, key, extensions):
+    # Pass the extensions on as they are enumerated and store them once
+    # the enumeration is complete, unless they (roughly) grow beyond the
+    # size of an entry, in which case they are no longer kept.
+    max_bytes = min(MAX_ENTRY_BYTES, cache._max_bytes)
+    enumerated = []
+    size = 0
+
+    for ext in extensions:
+        if enumerated is not None:
+            # Each name is quoted and followed by a separator.
+            size += sum(len(str(arg)) + 4 for arg in ext) + 4
+            if size > max_bytes:
+                enumerated = None
+            else:
+                enumerated.append(ext)
+        yield ext
+
+    if enumerated is not None:
+        cache.put(key, solutionToNames(enumerated, 'EE'))
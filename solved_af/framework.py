@@ -18,24 +18,50 @@
 """
 
 import abc
+from collections import deque
 from typing import List, Set
 
 import solved_af.utils as utils
 
+try:
+    import numpy as np
+except ImportError:
+    # Only the CSRFramework representation requires numpy.
+    np = None
+
+# Bound in bytes on the intermediate matrices of the batched methods of
+# CSRFramework.
+BATCH_BYTES = 2**26
+
+# Grounded labels of arguments as stored by CSRFramework.
+GROUNDED_UND, GROUNDED_IN, GROUNDED_OUT = 0, 1, 2
+
 
 class FrameworkRepresentation(metaclass=abc.ABCMeta):
     """Abstract class defining the base framework representation."""
 
     def __init__(self, arguments, attacks):
         super().__init__()
+        self._setArgumentNames(arguments)
+        if self._arguments_to_values is None:
+            # The attacks are given as argument values already.
+            self._args = list(arguments)
+            self._atts = [list(attack) for attack in attacks]
+        else:
+            self._args = self.argumentsToValues(arguments)
+            self._atts = [[self.argumentToValue(arg)
+                           for arg in attack] for attack in attacks]
+
+    def _setArgumentNames(self, arguments):
+        # Numeric arguments named 1..n (given as a range) are mapped to
+        # values by the identity instead of via a dict.
         self._values_to_arguments = arguments
-        self._arguments_to_values = {arg: i for i,
-                                     arg in enumerate(arguments, start=1)}
-        self._args = self.argumentsToValues(arguments)
-        self._atts = [[self.argumentToValue(arg)
-                       for arg in attack] for attack in attacks]
+        self._arguments_to_values = None if isIdentityNaming(arguments) \
+            else {arg: i for i, arg in enumerate(arguments, start=1)}
 
     def argumentToValue(self, argument_name: str) -> int:
+        if self._arguments_to_values is None:
+            return _identityValue(argument_name, self._values_to_arguments)
         return self._arguments_to_values[argument_name]
 
     def valueToArgument(self, argument_value: int) -> str:
@@ -50,6 +76,27 @@ class FrameworkRepresentation(metaclass=abc.ABCMeta):
     def __iter__(self):
         return iter(self._args)
 
+    def subFramework(self, argument_values):
+        """Construct the sub-framework induced by some of the arguments of
+            this framework, i.e. keeping only the attacks between them.
+            The arguments of the sub-framework are named by their values
+            in this framework.
+
+        Arguments:
+            argument_values {Iterable[int]} -- the arguments to keep
+
+        Returns:
+            FrameworkRepresentation -- the induced sub-framework
+        """
+
+        arguments = list(argument_values)
+        kept = set(arguments)
+        attacks = [(arg, attacked) for arg in arguments
+                   for attacked in self.getAttackedBy(arg)
+                   if attacked in kept]
+
+        return type(self)(arguments, attacks)
+
     @classmethod
     def __subclasshook__(cls, subclass):
         return (hasattr(subclass, 'getAttackersOf') and
@@ -107,8 +154,6 @@ class ListGraphFramework(FrameworkRepresentation):
         arguments which it is attacking and is attacked by.
     """
 
-    # TODO Add SCC and layer split support in construction
-
     def __init__(self, arguments, attacks):
         """Construct the framework from parsed and validated data.
         Where arguments is a list of named/numbered arguments."""
@@ -120,6 +165,9 @@ class ListGraphFramework(FrameworkRepresentation):
 
         self.LENGTH = len(self._node_list)
 
+        self._sccs = stronglyConnectedComponents(self)
+        self._scc_layers = sccLayers(self, self._sccs)
+
     def __len__(self):
         return self.LENGTH
 
@@ -188,62 +236,1002 @@ class ListGraphFramework(FrameworkRepresentation):
     def getAttacks(self):
         return self._atts
 
+    def getSCCs(self):
+        """Get the strongly connected components of the framework in a
+            topological order of its condensation."""
+        return self._sccs
+
+    def getSCCLayers(self):
+        """Get the strongly connected components of the framework
+            grouped into layers, where the components of a layer are
+            attacked by components of preceding layers only."""
+        return self._scc_layers
+
+
+class BitsetFramework(FrameworkRepresentation):
+    """Framework representation via keeping for each argument the sets
+        of arguments which it is attacking and is attacked by both as
+        sets and as bitmasks (arbitrary precision ints in which the
+        bit arg_value - 1 stands for an argument), so that the
+        characteristic function and other operations on sets of
+        arguments are carried out by bitwise operations.
+
+        NB the bitmasks take up to |A|^2 bits, hence this
+        representation suits small or dense frameworks.
+    """
+
+    def __init__(self, arguments, attacks):
+        """Construct the framework from parsed and validated data.
+        Where arguments is a list of named/numbered arguments."""
+        super().__init__(arguments, attacks)
+        attacking = [set() for _ in range(len(self._args))]
+        attacked_by = [set() for _ in range(len(self._args))]
+        for (attacker, attacked) in self._atts:
+            attacking[attacker - 1].add(attacked)
+            attacked_by[attacked - 1].add(attacker)
+
+        self._attacking = [frozenset(args) for args in attacking]
+        self._attacked_by = [frozenset(args) for args in attacked_by]
+        self._attacking_masks = [argumentsToMask(args)
+                                 for args in attacking]
+        self._attacked_by_masks = [argumentsToMask(args)
+                                   for args in attacked_by]
+        self._all_mask = (1 << len(self._args)) - 1
+
+        self.LENGTH = len(self._args)
+
+        self._sccs = stronglyConnectedComponents(self)
+        self._scc_layers = sccLayers(self, self._sccs)
+
+    def __len__(self):
+        return self.LENGTH
+
+    def characteristic(self, argument_values):
+        """The charachteristic function of the AF defined as giving the
+            set of arguments in the AF which defend some other set of
+            arguments.
+
+        Arguments:
+            argument_values {Set[int]} -- the arguments whose defending
+                set to find
+
+        Returns:
+            Set[int] -- the defnding set of argument_values
+        """
+
+        return maskToArguments(
+            self.characteristicMask(argumentsToMask(argument_values)))
+
+    def characteristicMask(self, mask):
+        """The characteristic function of the AF on bitmasks.
+
+        Arguments:
+            mask {int} -- the bitmask of the arguments whose defending
+                set to find
+
+        Returns:
+            int -- the bitmask of the defending set
+        """
+
+        # An argument is defended iff none of its attackers is left
+        # unattacked by the arguments, i.e. F(S) = A \ (A \ S+)+.
+        unattacked = self._all_mask & ~self.getAttackedByMask(mask)
+        return self._all_mask & ~self.getAttackedByMask(unattacked)
+
+    def getAttackedBy(self, arg):
+        return self._attacking[arg - 1]
+
+    def getAttackersOf(self, arg):
+        return self._attacked_by[arg - 1]
+
+    def getAttackedBySet(self, arg_set):
+        return maskToArguments(self.getAttackedByMask(
+            argumentsToMask(arg_set)))
+
+    def getAttackersOfSet(self, arg_set):
+        return maskToArguments(self.getAttackersOfMask(
+            argumentsToMask(arg_set)))
+
+    def getAttackedByMask(self, mask):
+        """Get the bitmask of all arguments attacked by the arguments of
+            a bitmask."""
+        return _unionOfMasks(self._attacking_masks, mask)
+
+    def getAttackersOfMask(self, mask):
+        """Get the bitmask of all arguments attacking the arguments of
+            a bitmask."""
+        return _unionOfMasks(self._attacked_by_masks, mask)
+
+    def isConflictFreeMask(self, mask):
+        return self.getAttackedByMask(mask) & mask == 0
+
+    def getAllArgumentsMask(self):
+        return self._all_mask
+
+    def getArguments(self):
+        return self._args
+
+    def getAttacks(self):
+        return self._atts
+
+    def getSCCs(self):
+        """Get the strongly connected components of the framework in a
+            topological order of its condensation."""
+        return self._sccs
+
+    def getSCCLayers(self):
+        """Get the strongly connected components of the framework
+            grouped into layers, where the components of a layer are
+            attacked by components of preceding layers only."""
+        return self._scc_layers
+
+
+class CSRFramework(FrameworkRepresentation):
+    """Framework representation via NumPy index arrays in the fashion
+        of sparse CSR and CSC matrices: the arguments attacked by the
+        argument with value i are out_targets[out_offsets[i - 1]:
+        out_offsets[i]] and its attackers are in_sources[in_offsets[
+        i - 1]:in_offsets[i]]. It takes a few bytes per attack, which
+        suits frameworks with millions of attacks.
+
+        The batched methods (e.g., characteristicBatch) evaluate many
+        sets of arguments, given as the rows of a boolean matrix, at
+        once.
+
+        NB requires numpy.
+    """
+
+    def __init__(self, arguments, attacks):
+        """Construct the framework from parsed and validated data.
+        Where arguments is a list of named/numbered arguments."""
+        if np is None:
+            raise ImportError('CSRFramework requires the numpy package.')
+
+        self._setArgumentNames(arguments)
+        to_value = self._arguments_to_values
+        if to_value is None:
+            edges = np.fromiter((arg for attack in attacks
+                                 for arg in attack), dtype=np.int32)
+        else:
+            edges = np.fromiter((to_value[arg] for attack in attacks
+                                 for arg in attack), dtype=np.int32)
+        self._initArrays(len(arguments), edges.reshape(-1, 2))
+
+    @classmethod
+    def fromEdgeArrays(cls, attackers, attacked, arguments=None,
+                       num_of_arguments=None):
+        """Construct the framework from arrays of argument values (from
+            1 to the number of arguments) of the attackers and attacked
+            arguments of the attacks. If the attacks are sorted by
+            attacker and then by attacked argument without duplicates,
+            and are given as int32 arrays, they are used without being
+            copied.
+
+        Arguments:
+            attackers {ArrayLike} -- the attacker of each attack
+            attacked {ArrayLike} -- the attacked argument of each attack
+
+        Keyword Arguments:
+            arguments {Sequence} -- the names of the arguments; the
+                argument values themselves if None (default: {None})
+            num_of_arguments {int} -- the number of arguments if no
+                names are given; the largest value in the attacks if
+                None (default: {None})
+
+        Returns:
+            CSRFramework -- the framework
+        """
+
+        if np is None:
+            raise ImportError('CSRFramework requires the numpy package.')
+
+        attackers = np.asarray(attackers, dtype=np.int32)
+        attacked = np.asarray(attacked, dtype=np.int32)
 
-@utils.memoize
-def extensionToInt(extension):
-    """Convert an extension into a binary value of arbitrary precision
-    in order to comapre extensions efficiently.
+        if arguments is None:
+            if num_of_arguments is None:
+                num_of_arguments = int(max(attackers.max(initial=0),
+                                           attacked.max(initial=0)))
+            arguments = range(1, num_of_arguments + 1)
+
+        framework = cls.__new__(cls)
+        framework._values_to_arguments = arguments
+        framework._arguments_to_values = None
+        framework._initArrays(len(arguments), attackers, attacked)
+
+        return framework
+
+    @classmethod
+    def fromFramework(cls, framework):
+        """Construct a CSRFramework with the same arguments and attacks
+            as another framework representation (e.g., to use the
+            batched methods on it).
+        """
+
+        attacks = np.array(framework.getAttacks(),
+                           dtype=np.int32).reshape(-1, 2)
+        return cls.fromEdgeArrays(
+            attacks[:, 0], attacks[:, 1],
+            arguments=framework.valuesToArguments(framework.getArguments()))
+
+    @classmethod
+    def fromSortedArrays(cls, arguments, out_sources, out_targets,
+                         in_sources, in_targets, scc_ids=None,
+                         grounded_labels=None):
+        """Construct the framework from its attacks sorted both ways,
+            which are used as given without being checked, sorted or
+            copied (e.g., arrays mapped from a file by saf.io).
+
+        Arguments:
+            arguments {Sequence} -- the names of the arguments
+            out_sources {np.ndarray} -- the attackers of the attacks
+                sorted by attacker and then by attacked argument
+            out_targets {np.ndarray} -- the attacked arguments in the
+                same order
+            in_sources {np.ndarray} -- the attackers of the attacks
+                sorted by attacked argument and then by attacker
+            in_targets {np.ndarray} -- the attacked arguments in the
+                same order
+
+        Keyword Arguments:
+            scc_ids {np.ndarray} -- the index of the SCC of each
+                argument in a topological order of the SCCs, if known
+                (default: {None})
+            grounded_labels {np.ndarray} -- the grounded label of each
+                argument (see getGroundedLabels), if known
+                (default: {None})
+
+        Returns:
+            CSRFramework -- the framework
+        """
+
+        if np is None:
+            raise ImportError('CSRFramework requires the numpy package.')
+
+        framework = cls.__new__(cls)
+        framework._values_to_arguments = arguments
+        framework._arguments_to_values = None
+        framework._setArrays(len(arguments), out_sources, out_targets,
+                             in_sources, in_targets, scc_ids,
+                             grounded_labels)
+
+        return framework
+
+    def _initArrays(self, num_of_args, attackers, attacked=None):
+        if attacked is None:
+            # A single (m, 2) array of attacks
+            attackers, attacked = attackers[:, 0], attackers[:, 1]
+
+        # Encode each attack as a single int ordering the attacks by
+        # attacker and then by attacked argument.
+        codes = attackers.astype(np.int64) * (num_of_args + 1) + attacked
+        if len(codes) > 1 and not np.all(codes[1:] > codes[:-1]):
+            # Sort the attacks and drop duplicates.
+            codes = sortedUnique(codes)
+            attackers, attacked = np.divmod(codes, num_of_args + 1)
+            attackers = attackers.astype(np.int32)
+            attacked = attacked.astype(np.int32)
+
+        # Same for the order by attacked argument and then by attacker.
+        codes = attacked.astype(np.int64) * (num_of_args + 1) + attackers
+        codes.sort()
+        in_targets, in_sources = np.divmod(codes, num_of_args + 1)
+        del codes
+
+        self._setArrays(num_of_args, attackers, attacked,
+                        in_sources.astype(np.int32),
+                        in_targets.astype(np.int32))
+
+    def _setArrays(self, num_of_args, out_sources, out_targets,
+                   in_sources, in_targets, scc_ids=None,
+                   grounded_labels=None):
+        self._num_of_args = num_of_args
+        self._out_sources = out_sources
+        self._out_targets = out_targets
+        self._out_offsets = _offsets(out_sources, num_of_args)
+        self._in_sources = in_sources
+        self._in_targets = in_targets
+        self._in_offsets = _offsets(in_targets, num_of_args)
+
+        self._scc_ids = scc_ids
+        self._grounded_labels = grounded_labels
+        self._sccs = None
+        self._scc_layers = None
+
+    def argumentToValue(self, argument_name):
+        if self._arguments_to_values is None:
+            if isIdentityNaming(self._values_to_arguments):
+                return _identityValue(argument_name,
+                                      self._values_to_arguments)
+            self._arguments_to_values = {
+                arg: i for i, arg in enumerate(self._values_to_arguments,
+                                               start=1)}
+        return self._arguments_to_values[argument_name]
+
+    def __len__(self):
+        return self._num_of_args
+
+    def __iter__(self):
+        return iter(range(1, self._num_of_args + 1))
+
+    def subFramework(self, argument_values):
+        arguments = list(argument_values)
+        new_values = np.zeros(self._num_of_args + 1, dtype=np.int32)
+        new_values[arguments] = np.arange(1, len(arguments) + 1)
+
+        kept = (new_values[self._out_sources] > 0) & \
+            (new_values[self._out_targets] > 0)
+
+        return type(self).fromEdgeArrays(
+            new_values[self._out_sources[kept]],
+            new_values[self._out_targets[kept]], arguments=arguments)
+
+    def characteristic(self, argument_values):
+        """The charachteristic function of the AF defined as giving the
+            set of arguments in the AF which defend some other set of
+            arguments.
+
+        Arguments:
+            argument_values {Set[int]} -- the arguments whose defending
+                set to find
+
+        Returns:
+            Set[int] -- the defnding set of argument_values
+        """
+
+        attacked = self._attackedBy(self._selection(argument_values))
+        # Count the attackers of each argument which are not attacked.
+        undefeated = np.bincount(self._in_targets,
+                                 weights=~attacked[self._in_sources],
+                                 minlength=self._num_of_args + 1)
+        defended = np.flatnonzero(undefeated == 0)
+        return set(defended[defended > 0].tolist())
+
+    def characteristicBatch(self, candidates):
+        """The characteristic function applied to many sets of arguments
+            at once.
+
+        Arguments:
+            candidates {np.ndarray} -- boolean matrix with a row per set
+                of arguments and a column per argument, where the
+                column j stands for the argument with value j + 1
+
+        Returns:
+            np.ndarray -- boolean matrix with the defending set of each
+                of the sets as its rows
+        """
+
+        def characteristicColumns(packed):
+            return self._characteristicColumns(packed)
+
+        packed = self._mapColumns(characteristicColumns, candidates,
+                                  self._num_of_args)
+        return _unpackColumns(packed, len(candidates))
+
+    def isConflictFreeBatch(self, candidates):
+        """Check whether each of many sets of arguments is conflict-free.
+
+        Arguments:
+            candidates {np.ndarray} -- boolean matrix of the sets (see
+                characteristicBatch)
+
+        Returns:
+            np.ndarray -- boolean vector with an entry for each set
+        """
+
+        def conflictingColumns(packed):
+            attacked = self._attackedColumns(packed)
+            return np.bitwise_or.reduce(packed & attacked, axis=0,
+                                        keepdims=True)
+
+        packed = self._mapColumns(conflictingColumns, candidates, 1)
+        return ~_unpackColumns(packed, len(candidates))[:, 0]
+
+    def isAdmissibleBatch(self, candidates):
+        """Check whether each of many sets of arguments is admissible,
+            i.e. conflict-free and defending all of its arguments.
+
+        Arguments:
+            candidates {np.ndarray} -- boolean matrix of the sets (see
+                characteristicBatch)
+
+        Returns:
+            np.ndarray -- boolean vector with an entry for each set
+        """
+
+        def inadmissibleColumns(packed):
+            attacked = self._attackedColumns(packed)
+            defended = self._characteristicColumns(packed, attacked)
+            return np.bitwise_or.reduce(
+                (packed & attacked) | (packed & ~defended), axis=0,
+                keepdims=True)
+
+        packed = self._mapColumns(inadmissibleColumns, candidates, 1)
+        return ~_unpackColumns(packed, len(candidates))[:, 0]
+
+    # The batched methods work on the candidate sets packed into the
+    # bits of a uint8 matrix with a row per argument, so that a row of
+    # it holds the membership of the argument in 8 sets per byte and
+    # operations on the rows act on all the sets at once.
+
+    def _attackedColumns(self, packed):
+        # An argument is attacked by a set iff any of its attackers is
+        # in the set.
+        return _segmentOr(packed[self._in_sources - 1], self._in_offsets)
+
+    def _characteristicColumns(self, packed, attacked=None):
+        if attacked is None:
+            attacked = self._attackedColumns(packed)
+        # An argument is defended iff none of its attackers is left
+        # unattacked.
+        return ~_segmentOr(~attacked[self._in_sources - 1],
+                           self._in_offsets)
+
+    def _mapColumns(self, function, candidates, num_of_rows):
+        candidates = np.asarray(candidates, dtype=bool)
+        if candidates.ndim != 2 or candidates.shape[1] != self._num_of_args:
+            raise ValueError('candidates must be a matrix with a column '
+                             'for each argument')
+
+        packed = np.packbits(candidates, axis=0, bitorder='little').T
+        # Process the packed sets in chunks so that the intermediate
+        # matrices (a row per attack) stay within BATCH_BYTES.
+        chunk = max(1, BATCH_BYTES // max(1, len(self._in_sources)))
+        result = np.empty((num_of_rows, packed.shape[1]), dtype=np.uint8)
+        for start in range(0, packed.shape[1], chunk):
+            result[:, start:start + chunk] = function(
+                np.ascontiguousarray(packed[:, start:start + chunk]))
+        return result
+
+    def _selection(self, argument_values):
+        selected = np.zeros(self._num_of_args + 1, dtype=bool)
+        selected[np.fromiter(argument_values, dtype=np.int64)] = True
+        return selected
+
+    def _attackedBy(self, selected):
+        attacked = np.zeros(self._num_of_args + 1, dtype=bool)
+        attacked[self._out_targets[selected[self._out_sources]]] = True
+        return attacked
+
+    def getAttackedBy(self, arg):
+        return self._out_targets[
+            self._out_offsets[arg - 1]:self._out_offsets[arg]].tolist()
+
+    def getAttackersOf(self, arg):
+        return self._in_sources[
+            self._in_offsets[arg - 1]:self._in_offsets[arg]].tolist()
+
+    def getAttackedBySet(self, arg_set):
+        attacked = self._attackedBy(self._selection(arg_set))
+        return set(np.flatnonzero(attacked).tolist())
+
+    def getAttackersOfSet(self, arg_set):
+        selected = self._selection(arg_set)
+        attackers = np.zeros(self._num_of_args + 1, dtype=bool)
+        attackers[self._in_sources[selected[self._in_targets]]] = True
+        return set(np.flatnonzero(attackers).tolist())
+
+    def getArguments(self):
+        return range(1, self._num_of_args + 1)
+
+    def getAttacks(self):
+        """Get all attacks in the framework as an (|R|, 2) array."""
+        return np.column_stack((self._out_sources, self._out_targets))
+
+    def getAttackerArrays(self):
+        """Get the attackers of all arguments in CSC form, i.e. the
+            offsets and the attackers sorted by the attacked argument.
+        """
+        return self._in_offsets, self._in_sources
+
+    def getSortedArrays(self):
+        """Get the attackers and attacked arguments of the attacks
+            sorted by attacker and sorted by attacked argument (see
+            fromSortedArrays)."""
+        return (self._out_sources, self._out_targets,
+                self._in_sources, self._in_targets)
+
+    def getSCCs(self):
+        """Get the strongly connected components of the framework in a
+            topological order of its condensation. They are computed on
+            first use, since they are not needed by most tasks."""
+        if self._sccs is None:
+            if self._scc_ids is None:
+                self._sccs = stronglyConnectedComponents(self)
+            else:
+                self._sccs = _groupByIds(self._scc_ids)
+        return self._sccs
+
+    def getSCCIds(self):
+        """Get the index of the SCC of each argument (as an array with
+            the index of the argument with value i at i - 1) in the
+            order of getSCCs."""
+        if self._scc_ids is None:
+            scc_ids = np.empty(self._num_of_args, dtype=np.int32)
+            for i, scc in enumerate(self.getSCCs()):
+                scc_ids[np.asarray(scc) - 1] = i
+            self._scc_ids = scc_ids
+        return self._scc_ids
+
+    def getGroundedLabels(self):
+        """Get the grounded labelling of the framework stored with it,
+            as an array with the label of the argument with value i at
+            i - 1: GROUNDED_IN, GROUNDED_OUT or GROUNDED_UND. None if
+            it is not known, in which case iterGroundedLabelling
+            computes it."""
+        return self._grounded_labels
+
+    def getSCCLayers(self):
+        """Get the strongly connected components of the framework
+            grouped into layers, where the components of a layer are
+            attacked by components of preceding layers only."""
+        if self._scc_layers is None:
+            self._scc_layers = sccLayers(self, self.getSCCs())
+        return self._scc_layers
+
+
+def isIdentityNaming(arguments):
+    """Check whether the arguments of a framework are named by their
+        values, i.e. they are given as range(1, n + 1)."""
+
+    return isinstance(arguments, range) and arguments.start == 1 and \
+        arguments.step == 1
+
+
+def _identityValue(argument_name, arguments):
+    # The value of an argument named by its value (also as a string,
+    # e.g. a query argument given on the command line).
+    try:
+        value = int(argument_name)
+    except (TypeError, ValueError):
+        raise KeyError(argument_name) from None
+    if value not in arguments:
+        raise KeyError(argument_name)
+    return value
+
+
+def sortedUnique(values):
+    """Get the sorted unique values of a numpy array (like np.unique but
+        via an in-place sort, which is considerably faster for large
+        integer arrays).
+    """
+
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _groupByIds(ids):
+    # Group the argument values by an array of their group indices.
+    if len(ids) == 0:
+        return []
+    order = np.argsort(ids, kind='stable')
+    bounds = np.searchsorted(ids[order], np.arange(1, int(ids.max()) + 1))
+    return [(group + 1).tolist() for group in np.split(order, bounds)]
+
+
+def _segmentOr(rows, offsets):
+    # Bitwise or over the row segments rows[offsets[i]:offsets[i + 1]]
+    # of a matrix, where empty segments are all zeros.
+    result = np.zeros((len(offsets) - 1, rows.shape[1]), dtype=rows.dtype)
+    nonempty = offsets[:-1] < offsets[1:]
+    if len(rows) > 0:
+        result[nonempty] = np.bitwise_or.reduceat(
+            rows, offsets[:-1][nonempty], axis=0)
+    return result
+
+
+def _unpackColumns(packed, num_of_sets):
+    # Unpack a matrix of packed sets back into a row per set.
+    return np.unpackbits(packed, axis=1, count=num_of_sets,
+                         bitorder='little').T.astype(bool)
+
+
+def argumentSetsToMatrix(framework, argument_sets):
+    """Get the boolean matrix of a list of sets of arguments, as taken
+        by the batched methods of CSRFramework (e.g.,
+        characteristicBatch).
 
     Arguments:
-        extension {List[int]} -- the extension to get the
-            binary representation of
+        framework {FrameworkRepresentation} -- the framework of the
+            arguments
+        argument_sets {List[Iterable[int]]} -- the sets of arguments
 
     Returns:
-        int -- the representation of the extension
+        np.ndarray -- boolean matrix with a row per set of arguments
     """
 
-    rep = 0
+    matrix = np.zeros((len(argument_sets), len(framework)), dtype=bool)
+    for row, argument_values in zip(matrix, argument_sets):
+        row[np.fromiter(argument_values, dtype=np.int64) - 1] = True
+    return matrix
 
-    for arg in extension:
-        rep += 2**(arg-1)
 
-    return rep
+def matrixToArgumentSets(matrix):
+    """Get the sets of arguments of the rows of a boolean matrix (see
+        argumentSetsToMatrix)."""
 
+    return [set((np.flatnonzero(row) + 1).tolist()) for row in matrix]
 
-def isIncluded(extension, other):
-    """Check if an extension is included in another
-        (w.r.t set inclusion).
+
+def _offsets(sorted_values, num_of_args):
+    # Offsets of the runs of each argument value in a sorted array, from
+    # the counts of the values (a linear pass rather than a binary
+    # search per argument).
+    offsets = np.zeros(num_of_args + 1, dtype=np.int64)
+    counts = np.bincount(sorted_values, minlength=num_of_args + 1)
+    np.cumsum(counts[1:], out=offsets[1:])
+    return offsets
+
+
+def argumentsToMask(argument_values):
+    """Get the bitmask of a set of arguments, in which the bit
+        arg_value - 1 is set for each of the arguments."""
+
+    mask = 0
+    for arg in argument_values:
+        mask |= 1 << (arg - 1)
+    return mask
+
+
+def maskToArguments(mask):
+    """Get the set of arguments of a bitmask (see argumentsToMask)."""
+
+    arguments = set()
+    while mask:
+        lowest = mask & -mask
+        arguments.add(lowest.bit_length())
+        mask ^= lowest
+    return arguments
+
+
+def _unionOfMasks(masks, selection):
+    # Union of the masks of the arguments in the selection bitmask.
+    union = 0
+    while selection:
+        lowest = selection & -selection
+        union |= masks[lowest.bit_length() - 1]
+        selection ^= lowest
+    return union
+
+
+def stronglyConnectedComponents(framework):
+    """Compute the strongly connected components (SCCs) of the attack
+        graph of a framework via (an iterative version of) Tarjan's
+        algorithm in O(|A| + |R|) time.
 
     Arguments:
-        extension {List[int]} -- extension to check inclusion for
-        other {List[int]} -- extension to check inclusion against
+        framework {FrameworkRepresentation} -- the framework to split
 
     Returns:
-        bool -- if the extension is included in the other
+        List[List[int]] -- the SCCs in a topological order of the
+            condensation, i.e. no SCC is attacked by a later one
     """
 
-    ext_rep = extensionToInt(extension)
-    other_rep = extensionToInt(other)
+    index_of, lowlink = {}, {}
+    on_stack = set()
+    stack, sccs = [], []
+
+    for root in framework.getArguments():
+        if root in index_of:
+            continue
+
+        index_of[root] = lowlink[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(framework.getAttackedBy(root)))]
+
+        while work:
+            arg, attacked_iter = work[-1]
+
+            for attacked in attacked_iter:
+                if attacked not in index_of:
+                    index_of[attacked] = lowlink[attacked] = len(index_of)
+                    stack.append(attacked)
+                    on_stack.add(attacked)
+                    work.append((attacked,
+                                 iter(framework.getAttackedBy(attacked))))
+                    break
+                elif attacked in on_stack:
+                    lowlink[arg] = min(lowlink[arg], index_of[attacked])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[arg])
+
+                if lowlink[arg] == index_of[arg]:
+                    scc = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == arg:
+                            break
+                    sccs.append(scc)
+
+    # Tarjan's algorithm finds the SCCs in reverse topological order.
+    sccs.reverse()
+
+    return sccs
+
+
+def sccLayers(framework, sccs):
+    """Group the strongly connected components of a framework into
+        layers by the length of the longest chain of SCCs attacking
+        them. SCCs in the same layer do not attack each other.
 
-    if ext_rep > other_rep:
-        return False
+    Arguments:
+        framework {FrameworkRepresentation} -- the framework
+        sccs {List[List[int]]} -- its SCCs in topological order
+
+    Returns:
+        List[List[List[int]]] -- the layers of SCCs
+    """
 
-    return other_rep & ext_rep == ext_rep
+    scc_of = {arg: i for i, scc in enumerate(sccs) for arg in scc}
+    depth = [0] * len(sccs)
+    layers = []
 
+    for i, scc in enumerate(sccs):
+        for arg in scc:
+            for attacker in framework.getAttackersOf(arg):
+                j = scc_of[attacker]
+                if j != i:
+                    depth[i] = max(depth[i], depth[j] + 1)
 
-# def getMinimal(extensions):
-#     extensions.sort(key=len)
-#     for ext in extensions:
-#         if all((isIncluded(ext, other) for other in extensions)):
-#             return ext
+        if depth[i] == len(layers):
+            layers.append([])
+        layers[depth[i]].append(scc)
+
+    return layers
+
+
+def iterGroundedLabelling(framework):
+    """Label the arguments of a framework with the grounded labelling
+        one argument at a time. An argument is in-labeled once all of
+        its attackers are out-labeled and is out-labeled once one of
+        its attackers is in-labeled. Each argument and attack is
+        considered at most once, hence the whole labelling takes
+        O(|A| + |R|) time. Arguments which are never yielded are
+        und-labeled. A labelling stored with the framework (see
+        CSRFramework.getGroundedLabels) is yielded as it is.
+
+    Arguments:
+        framework {FrameworkRepresentation} -- the framework to label
+
+    Returns:
+        Generator[Tuple[int, bool]] -- pairs of an argument and whether
+            it is in-labeled (True) or out-labeled (False) in the order
+            they are labeled
+    """
+
+    labels = getattr(framework, 'getGroundedLabels', lambda: None)()
+    if labels is not None:
+        # The labelling is stored with the framework.
+        for arg in (np.flatnonzero(labels == GROUNDED_IN) + 1).tolist():
+            yield arg, True
+        for arg in (np.flatnonzero(labels == GROUNDED_OUT) + 1).tolist():
+            yield arg, False
+        return
+
+    # Number of attackers of each argument not yet out-labeled
+    unrefuted_attackers = {arg: len(framework.getAttackersOf(arg))
+                           for arg in framework.getArguments()}
+    queue = deque(arg for arg, count in unrefuted_attackers.items()
+                  if count == 0)
+    out_labeled = set()
+
+    while queue:
+        arg = queue.popleft()
+        yield arg, True
+
+        for attacked in framework.getAttackedBy(arg):
+            if attacked in out_labeled:
+                continue
+            out_labeled.add(attacked)
+            yield attacked, False
+
+            for target in framework.getAttackedBy(attacked):
+                unrefuted_attackers[target] -= 1
+                if unrefuted_attackers[target] == 0:
+                    queue.append(target)
+
+
+def groundedLabelling(framework):
+    """Compute the grounded labelling of a framework.
+
+    Arguments:
+        framework {FrameworkRepresentation} -- the framework to label
+
+    Returns:
+        Tuple[Set[int], Set[int], Set[int]] -- the in-, out- and
+            und-labeled arguments respectively
+    """
+
+    in_labeled, out_labeled = set(), set()
+    for arg, is_in in iterGroundedLabelling(framework):
+        (in_labeled if is_in else out_labeled).add(arg)
+
+    und_labeled = set(framework.getArguments()) - in_labeled - out_labeled
+
+    return in_labeled, out_labeled, und_labeled
+
+
+def ancestorsOf(framework, argument_value):
+    """Get the arguments from which a given argument can be reached via
+        attacks, including the argument itself.
+
+    Arguments:
+        framework {FrameworkRepresentation} -- the framework
+        argument_value {int} -- the argument to get the ancestors of
+
+    Returns:
+        Set[int] -- the ancestors of the argument
+    """
+
+    ancestors = {argument_value}
+    queue = deque(ancestors)
+
+    while queue:
+        for attacker in framework.getAttackersOf(queue.popleft()):
+            if attacker not in ancestors:
+                ancestors.add(attacker)
+                queue.append(attacker)
+
+    return ancestors
+
+
+class InclusionFilter:
+    """Incremental filter of the maximal (or minimal) extensions w.r.t.
+        set inclusion among all extensions added to it so far. The
+        extensions kept are indexed by a posting bitmap per argument
+        (an int whose bit i is set iff the i-th extension kept contains
+        the argument), so that the kept supersets of an extension are
+        found by intersecting the bitmaps of its arguments and the kept
+        subsets by excluding the bitmaps of the other arguments.
+    """
+
+    def __init__(self, minimal=False, sorted_by_size=False):
+        """Constructor of the InclusionFilter.
+
+        Keyword Arguments:
+            minimal {bool} -- keep the minimal instead of the maximal
+                extensions (default: {False})
+            sorted_by_size {bool} -- whether the extensions are added in
+                order of non-increasing size (non-decreasing if
+                minimal), in which case no extension kept is ever
+                dropped again (default: {False})
+        """
+
+        self._minimal = minimal
+        self._sorted_by_size = sorted_by_size
+        self._extensions = []
+        self._postings = {}
+        self._alive = 0
+        self._num_alive = 0
+
+    def __len__(self):
+        return self._num_alive
+
+    def add(self, extension) -> bool:
+        """Add an extension to the filter.
+
+        Arguments:
+            extension {Iterable[int]} -- the extension to add
+
+        Returns:
+            bool -- whether the extension is kept, i.e. is maximal (or
+                minimal) w.r.t. the extensions added so far
+        """
+
+        extension = frozenset(extension)
+
+        if self._minimal:
+            dominated, dominating = self._subsetsOf, self._supersetsOf
+        else:
+            dominated, dominating = self._supersetsOf, self._subsetsOf
+
+        # An extension equal to a kept one is dominated by it as well.
+        if dominated(extension):
+            return False
+        if not self._sorted_by_size:
+            self._remove(dominating(extension))
+
+        bit = 1 << len(self._extensions)
+        self._extensions.append(extension)
+        for arg in extension:
+            self._postings[arg] = self._postings.get(arg, 0) | bit
+        self._alive |= bit
+        self._num_alive += 1
+
+        return True
+
+    def getExtensions(self):
+        """Get the extensions kept, in the order they were added."""
+        return [ext for ext in self._extensions if ext is not None]
+
+    def _supersetsOf(self, extension):
+        supersets = self._alive
+        for arg in extension:
+            supersets &= self._postings.get(arg, 0)
+            if not supersets:
+                break
+        return supersets
+
+    def _subsetsOf(self, extension):
+        excluded = 0
+        for arg, posting in self._postings.items():
+            if arg not in extension:
+                excluded |= posting
+        return self._alive & ~excluded
+
+    def _remove(self, mask):
+        if not mask:
+            return
+
+        self._alive &= ~mask
+        while mask:
+            lowest = mask & -mask
+            self._extensions[lowest.bit_length() - 1] = None
+            self._num_alive -= 1
+            mask ^= lowest
+
+        # Rebuild the index once most of it refers to dropped
+        # extensions, so that the bitmaps do not grow without bound.
+        if len(self._extensions) > 2 * self._num_alive + 64:
+            extensions = self.getExtensions()
+            self._extensions, self._postings = [], {}
+            self._alive, self._num_alive = 0, 0
+            sorted_by_size = self._sorted_by_size
+            self._sorted_by_size = True
+            for ext in extensions:
+                self.add(ext)
+            self._sorted_by_size = sorted_by_size
+
+
+def filterByInclusion(extensions, minimal=False, sorted_by_size=False):
+    """Filter the maximal (or minimal) extensions w.r.t. set inclusion
+        from an iterable, e.g., an enumeration generator, keeping only
+        the currently maximal ones in memory. If the extensions come
+        sorted by size, each one is yielded as soon as it is known to be
+        maximal; otherwise all are yielded once the iterable is
+        exhausted.
+
+    Arguments:
+        extensions {Iterable[Iterable[int]]} -- the extensions
+
+    Keyword Arguments:
+        minimal {bool} -- filter the minimal instead of the maximal
+            extensions (default: {False})
+        sorted_by_size {bool} -- whether the extensions come in order of
+            non-increasing size (non-decreasing if minimal)
+            (default: {False})
+
+    Returns:
+        Generator[FrozenSet[int]] -- the maximal (or minimal) extensions
+    """
+
+    inclusion_filter = InclusionFilter(minimal, sorted_by_size)
+
+    for ext in extensions:
+        if inclusion_filter.add(ext) and sorted_by_size:
+            yield frozenset(ext)
+
+    if not sorted_by_size:
+        yield from inclusion_filter.getExtensions()
 
 
 def getAllMaximal(extensions):
     """Filter all maximal (w.r.t. set inclusion) extension from an
-        iterable. Do this by keeping a reference to a currenly maximal
-        set of extension and either adding the next extension from the
-        iterable to it or removing those found not to be maximal from it
-        after considering the said next extension.
+        iterable. Do this by sorting the extensions by their size, so
+        that an extension is maximal iff no larger maximal extension
+        found before it includes it, which is checked by an
+        InclusionFilter.
 
     Arguments:
         extensions {List[List[int]]} -- list of extensions to find the
@@ -253,22 +1241,24 @@ def getAllMaximal(extensions):
         Set[List[int]] -- the maximal extensions from the list
             w.r.t. the list.
     """
-    currently_maximal = set()
 
-    for ext in extensions:
-        is_maximal = True
-        non_maximal = []
+    by_size = sorted(map(frozenset, extensions), key=len, reverse=True)
+    return set(filterByInclusion(by_size, sorted_by_size=True))
 
-        for other in currently_maximal:
-            if isIncluded(ext, other):
-                is_maximal = False
-                break
-            elif isIncluded(other, ext):
-                non_maximal.append(other)
 
-        currently_maximal.difference_update(non_maximal)
+def getAllMinimal(extensions):
+    """Filter all minimal (w.r.t. set inclusion) extensions from an
+        iterable (see getAllMaximal).
+
+    Arguments:
+        extensions {List[List[int]]} -- list of extensions to find the
+            minimal from w.r.t. the list.
 
-        if is_maximal:
-            currently_maximal.add(ext)
+    Returns:
+        Set[List[int]] -- the minimal extensions from the list
+            w.r.t. the list.
+    """
 
-    return currently_maximal
+    by_size = sorted(map(frozenset, extensions), key=len)
+    return set(filterByInclusion(by_size, minimal=True,
+                                 sorted_by_size=True))
@@ -19,10 +19,26 @@
 """
 
 import argparse
-import re
+import itertools
+import mmap
+import os
+import struct
 import sys
 
-import saf.tasks as tasks
+import solved_af.tasks as tasks
+from solved_af.framework import (GROUNDED_IN, GROUNDED_OUT, CSRFramework,
+                                 ListGraphFramework, iterGroundedLabelling)
+
+try:
+    import numpy as np
+except ImportError:
+    # Only the binary format requires numpy.
+    np = None
+
+
+class InvalidInputError(ValueError):
+    """Raised when an input file does not encode a framework in its
+        format (or the format is not supported)."""
 
 
 def _reportInvalidInputFileAndExit(message):
@@ -34,53 +50,88 @@ def _reportInvalidInputFileAndExit(message):
 
 def _validateAttack(attack, arguments, attacks, attack_str):
     """Given an input attack and the contextual established components
-    of the argumentation fromework (arguments list and attacks list)
-    as well as the string encoding the attack notify and exit if the
-    attack is invalid.
+    of the argumentation fromework (arguments set and attacks set)
+    as well as the string encoding the attack raise an
+    InvalidInputError if the attack is invalid.
 
     Arguments:
         attack {Tuple[str]} -- attack given as a tuple
-        arguments {List[str]} -- list of arguments currenly in the AF
-        attacks {List[Tuple[str]]} -- list of attacks currenty in the AF
+        arguments {Set[str]} -- set of arguments currenly in the AF
+        attacks {Set[Tuple[str]]} -- set of attacks currenty in the AF
         attack_str {str} -- the input line verbatim describing
             the attack
     """
 
     if len(attack) != 2:
-        _reportInvalidInputFileAndExit(
+        raise InvalidInputError(
             F'Attack "{attack_str}" must contain exactly two arguments.')
 
     elif attack[0] not in arguments or attack[1] not in arguments:
-        _reportInvalidInputFileAndExit(
+        raise InvalidInputError(
             F'Argument(s) in "{attack_str}" are not defined.')
 
     elif attack in attacks:
-        _reportInvalidInputFileAndExit(
+        raise InvalidInputError(
             F'Attack "{attack_str}" is defiled more than once.')
 
 
 def _validateArgument(argument, arguments):
-    """Given an input argument name and the contextual list of
-    established argument notify and exit if the argument is invalid.
+    """Given an input argument name and the contextual set of
+    established argument raise an InvalidInputError if the argument is
+    invalid.
 
     Arguments:
         argument {str} -- argument name to be checked for validity
-        arguments {List[str]} -- list of arguments currently in the AF
+        arguments {Set[str]} -- set of arguments currently in the AF
     """
 
     if len(argument.split()) > 1 or argument.find(',') != -1:
-        _reportInvalidInputFileAndExit(
+        raise InvalidInputError(
             F'Argument "{argument}" contains whitespace or comma.')
 
     if argument in arguments:
-        _reportInvalidInputFileAndExit(
+        raise InvalidInputError(
             F'Argument "{argument}" is defiled more than once.')
 
 
+def _validateArguments(arguments):
+    """Validate a list of argument names, raising an InvalidInputError
+    on the first invalid one. Returns the set of the arguments."""
+
+    argument_set = set(arguments)
+
+    # Check all arguments at once and only look for the offending one
+    # if any is invalid; splitting on whitespace yields more names than
+    # arguments iff an argument contains whitespace.
+    if len(argument_set) != len(arguments) or \
+            ',' in ''.join(arguments) or \
+            len(' '.join(arguments).split()) != len(arguments):
+        seen = set()
+        for argument in arguments:
+            _validateArgument(argument, seen)
+            seen.add(argument)
+
+    return argument_set
+
+
+def _validateAttacks(attacks, arguments, attack_strs):
+    """Validate a list of attacks against a set of argument names,
+    raising an InvalidInputError on the first invalid one."""
+
+    if len(set(attacks)) != len(attacks) or \
+            any(length != 2 for length in set(map(len, attacks))) or \
+            not all(map(arguments.__contains__,
+                        itertools.chain.from_iterable(attacks))):
+        seen = set()
+        for attack, attack_str in zip(attacks, attack_strs):
+            _validateAttack(attack, arguments, seen, attack_str)
+            seen.add(attack)
+
+
 def _parseTGF(file, validate=False):
     """Given an input file-like object encoded in the Trivial Graph
     Format parse it and return the AF it describes in term of its
-    components.
+    components. The file is read in bulk and split into lines at once.
 
     Arguments:
         file {File} -- file-like object containing a TGF encoded AF
@@ -94,48 +145,33 @@ def _parseTGF(file, validate=False):
             encoded AF
     """
 
-    arguments = []
-    attacks = []
-
-    has_seen_pivot = False
-
-    for line in file:
-        line = line.strip()
-
-        if not line:
-            # Skip empty or whitespace lines
-            continue
-
-        if not has_seen_pivot and '#' in line:
-            # check for #-pivot line
-            has_seen_pivot = True
-            continue
-
-        if not has_seen_pivot:
-            # Read an argument line
-            argument_name = line.strip()
-
-            if validate:
-                _validateArgument(argument_name, arguments)
-
-            arguments.append(argument_name)
+    content = file.read()
+    pivot = content.find('#')
 
-        elif validate and '#' in line:
-            _reportInvalidInputFileAndExit(
-                'TGF file contains more than one "#".')
-
-        else:
-            # Read an attack line
-            attack = tuple(line.split())
-
-            if validate:
-                _validateAttack(attack, arguments, attacks, line)
-
-            attacks.append(tuple(attack))
-
-        if validate and not has_seen_pivot:
-            _reportInvalidInputFileAndExit(
+    if pivot == -1:
+        if validate:
+            raise InvalidInputError(
                 'TGF file does not contain "#".')
+        argument_part, attack_part = content, ''
+    else:
+        # The pivot line is skipped as a whole.
+        argument_part = content[:pivot]
+        attack_part = content[pivot:].partition('\n')[2]
+
+    arguments = [line.strip() for line in argument_part.splitlines()]
+    arguments = [arg for arg in arguments if arg]
+
+    attack_lines = [line for line in attack_part.splitlines()
+                    if line and not line.isspace()]
+    attacks = [tuple(line.split()) for line in attack_lines]
+
+    if validate:
+        if '#' in attack_part:
+            raise InvalidInputError(
+                'TGF file contains more than one "#".')
+        argument_set = _validateArguments(arguments)
+        _validateAttacks(attacks, argument_set,
+                         (line.strip() for line in attack_lines))
 
     return arguments, attacks
 
@@ -143,6 +179,9 @@ def _parseTGF(file, validate=False):
 def _parseAPX(file, validate=False):
     """Given an input file-like object encoded in the Aspartix format
     parse it and return the AF it describes in term of its components.
+    The file is read in bulk and each line holding an 'arg(...).' or
+    'att(...).' statement is split at its parentheses, without a regex.
+    Any other line (e.g., a comment) is skipped.
 
     Arguments:
         file {File} -- file-like object containing a Aspartix encoded AF
@@ -158,57 +197,309 @@ def _parseAPX(file, validate=False):
 
     arguments = []
     attacks = []
-    # https://git.io/Jv6wD - Credit to alviano/pyglaf implementation for
-    # the following regex pattern
-    # TODO Make this pattern match 'att' and 'arg' respectively
-    pattern = re.compile("(?P<type>\w+)\s*\((?P<args>[\w,\s]+)\)\.")
+    attack_strs = []
 
-    for line in file:
-        resolved_line = pattern.match(line)
+    for line in file.read().splitlines():
+        head, _, rest = line.partition('(')
+        head = head.strip()
+        # The statement ends at the first ')' followed by a full stop, so
+        # that argument names may contain full stops.
+        end = rest.find(').')
 
-        if not resolved_line:
+        if head not in ('arg', 'att') or end == -1:
             # Skip non apx lines
             # ? Should this throw 'Invalid formatting' error?
             continue
 
-        line_type = resolved_line.group('type')
+        body = rest[:end]
 
-        if line_type == 'arg':
-            # Read argument line e.g. 'arg(...).'
-            argument_name = resolved_line.group('args')
+        if head == 'arg':
+            # Read argument statement e.g. 'arg(...).'
+            arguments.append(body.strip())
 
+        else:
+            # Read attack statement e.g., 'att(...).'
+            attack_wws = body.split(',')
+            attacks.append(tuple(arg_name.strip()
+                                 for arg_name in attack_wws))
             if validate:
-                _validateArgument(argument_name, arguments)
+                attack_strs.append(line.strip())
 
-            arguments.append(argument_name)
+    if validate:
+        argument_set = _validateArguments(arguments)
+        _validateAttacks(attacks, argument_set, attack_strs)
 
-        elif line_type == 'att':
-            # Read attack line e.g., 'att(...).'
-            attack_wws = resolved_line.group('args').split(',')
-            attack = [arg_name.strip() for arg_name in attack_wws]
+    return arguments, attacks
 
-            if validate:
-                _validateAttack(attack, arguments, attacks, line.strip())
 
-            attacks.append(attack)
+def _parseI23(file, validate=False):
+    """Given an input file-like object encoded in the numeric format of
+    ICCMA'23 parse it and return the AF it describes in term of its
+    components. The file starts with a 'p af <n>' line declaring the
+    arguments 1..n, followed by one 'i j' line per attack, and may
+    contain comment lines starting with '#'. The arguments are returned
+    as a range so that frameworks name them by their values (see
+    saf.framework.isIdentityNaming).
+
+    Arguments:
+        file {File} -- file-like object containing an i23 encoded AF
+
+    Keyword Arguments:
+        validate {bool} -- whether to validate the contents of the file
+            (default: {False})
+
+    Returns:
+        Tuple[range,List[Tuple[int]]] -- tuple representation of the
+            encoded AF
+    """
+
+    lines = [line for line in file.read().splitlines()
+             if line and not line.startswith('#') and not line.isspace()]
+
+    header = lines[0].split() if lines else []
+    if len(header) != 3 or header[:2] != ['p', 'af'] or \
+            not header[2].isdigit():
+        raise InvalidInputError(
+            'i23 file does not start with a "p af <n>" line.')
+    arguments = range(1, int(header[2]) + 1)
+
+    attacks = []
+    for line in lines[1:]:
+        pair = line.split()
+        if len(pair) != 2:
+            raise InvalidInputError(
+                F'Attack "{line.strip()}" must contain exactly two '
+                'arguments.')
+        try:
+            attacks.append((int(pair[0]), int(pair[1])))
+        except ValueError:
+            raise InvalidInputError(
+                F'Attack "{line.strip()}" contains non-numeric '
+                'arguments.') from None
+
+    if attacks and (min(map(min, attacks)) < 1 or
+                    max(map(max, attacks)) > len(arguments)):
+        raise InvalidInputError(
+            F'i23 file contains attacks on arguments beyond 1 to '
+            F'{len(arguments)}.')
+
+    if validate:
+        _validateAttacks(attacks, arguments,
+                         (line.strip() for line in lines[1:]))
 
     return arguments, attacks
 
 
+# The binary format consists of a header (the magic bytes, the format
+# version, flags of the optional sections, the number of arguments, the
+# number of attacks and the size of the name table) followed by the
+# sections, each starting at a multiple of _BINARY_ALIGNMENT bytes:
+#   - the argument names in UTF-8, separated by new lines (empty if
+#     the arguments are named by their values and _BINARY_NUMERIC is
+#     set)
+#   - the attackers and the attacked arguments of the attacks (as int32
+#     argument values) sorted by attacker and then by attacked argument
+#   - the same sorted by attacked argument and then by attacker
+#   - the SCC index of each argument as int32 (if _BINARY_SCCS is set)
+#   - the grounded label of each argument as int8 (if _BINARY_GROUNDED
+#     is set)
+# All numbers are little-endian.
+_BINARY_MAGIC = b'SAFB'
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<4sIIqqq')
+_BINARY_ALIGNMENT = 8
+_BINARY_SCCS = 1
+_BINARY_GROUNDED = 2
+_BINARY_NUMERIC = 4
+
+
+def _aligned(offset):
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
+def writeBinaryFramework(framework, file_path, precompute=True):
+    """Write a framework to a file in the binary format, which can be
+        loaded without being parsed (see loadBinaryFramework).
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        file_path {str} -- path to the file to write
+
+    Keyword Arguments:
+        precompute {bool} -- whether to store the SCCs and the grounded
+            labelling of the framework as well (default: {True})
+    """
+
+    if not hasattr(framework, 'getSortedArrays'):
+        framework = CSRFramework.fromFramework(framework)
+
+    num_of_args = len(framework)
+    arguments = framework.valuesToArguments(framework.getArguments())
+    flags = 0
+
+    if arguments == list(range(1, num_of_args + 1)):
+        flags |= _BINARY_NUMERIC
+        names = b''
+    else:
+        names = '\n'.join(str(arg) for arg in arguments).encode()
+    sections = [names] + [np.ascontiguousarray(array, dtype='<i4')
+                          for array in framework.getSortedArrays()]
+
+    if precompute:
+        flags |= _BINARY_SCCS | _BINARY_GROUNDED
+        sections.append(np.ascontiguousarray(framework.getSCCIds(),
+                                             dtype='<i4'))
+
+        labels = framework.getGroundedLabels()
+        if labels is None:
+            labels = np.zeros(num_of_args, dtype=np.int8)
+            for arg, is_in in iterGroundedLabelling(framework):
+                labels[arg - 1] = GROUNDED_IN if is_in else GROUNDED_OUT
+        sections.append(np.ascontiguousarray(labels, dtype=np.int8))
+
+    with open(file_path, 'wb') as file:
+        offset = file.write(_BINARY_HEADER.pack(
+            _BINARY_MAGIC, _BINARY_VERSION, flags, num_of_args,
+            len(framework.getSortedArrays()[0]), len(names)))
+
+        for section in sections:
+            offset += file.write(bytes(_aligned(offset) - offset))
+            offset += file.write(memoryview(section).cast('B'))
+
+
+def loadBinaryFramework(file_path, validate=False):
+    """Load a framework from a file in the binary format (see
+        writeBinaryFramework). The file is memory-mapped and the
+        attacks are used in place as the arrays of a CSRFramework.
+
+    Arguments:
+        file_path {str} -- path to the file
+
+    Keyword Arguments:
+        validate {bool} -- whether to validate the contents of the file
+            beyond its layout (default: {False})
+
+    Returns:
+        saf.framework.CSRFramework -- the framework
+    """
+
+    if np is None:
+        raise InvalidInputError(
+            'The binary format requires the numpy package.')
+
+    with open(file_path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            buffer = b''
+
+    if len(buffer) < _BINARY_HEADER.size:
+        raise InvalidInputError('Binary file is truncated.')
+
+    magic, version, flags, num_of_args, num_of_attacks, names_size = \
+        _BINARY_HEADER.unpack_from(buffer)
+    if magic != _BINARY_MAGIC:
+        raise InvalidInputError('Not a binary framework file.')
+    if version != _BINARY_VERSION:
+        raise InvalidInputError(
+            F'Unsupported binary format version {version}.')
+
+    offset = _aligned(_BINARY_HEADER.size)
+
+    def nextSection(count, dtype):
+        nonlocal offset
+        offset = _aligned(offset)
+        if offset + count * np.dtype(dtype).itemsize > len(buffer):
+            raise InvalidInputError('Binary file is truncated.')
+        section = np.frombuffer(buffer, dtype=dtype, count=count,
+                                offset=offset)
+        offset += section.nbytes
+        return section
+
+    names = nextSection(names_size, np.uint8).tobytes().decode()
+    if flags & _BINARY_NUMERIC:
+        arguments = range(1, num_of_args + 1)
+    else:
+        arguments = names.split('\n') if num_of_args > 0 else []
+    if len(arguments) != num_of_args:
+        raise InvalidInputError(
+            'Binary file has an inconsistent name table.')
+
+    arrays = [nextSection(num_of_attacks, '<i4') for _ in range(4)]
+    scc_ids = nextSection(num_of_args, '<i4') \
+        if flags & _BINARY_SCCS else None
+    grounded_labels = nextSection(num_of_args, np.int8) \
+        if flags & _BINARY_GROUNDED else None
+
+    if validate:
+        if not flags & _BINARY_NUMERIC:
+            _validateArguments(arguments)
+        _validateBinaryArrays(num_of_args, *arrays)
+        if scc_ids is not None and num_of_args > 0 and (
+                scc_ids.min() < 0 or scc_ids.max() >= num_of_args):
+            raise InvalidInputError(
+                'Binary file has invalid SCC indices.')
+        if grounded_labels is not None and \
+                not np.isin(grounded_labels, (0, 1, 2)).all():
+            raise InvalidInputError(
+                'Binary file has invalid grounded labels.')
+
+    return CSRFramework.fromSortedArrays(arguments, *arrays, scc_ids=scc_ids,
+                                         grounded_labels=grounded_labels)
+
+
+def _validateBinaryArrays(num_of_args, out_sources, out_targets,
+                          in_sources, in_targets):
+    """Check that the attacks of a binary file refer to its arguments
+    and are sorted both ways without duplicates, raising an
+    InvalidInputError otherwise."""
+
+    for array in (out_sources, out_targets, in_sources, in_targets):
+        if len(array) > 0 and (array.min() < 1 or
+                               array.max() > num_of_args):
+            raise InvalidInputError(
+                'Binary file has attacks on undefined arguments.')
+
+    out_codes = out_sources.astype(np.int64) * (num_of_args + 1) + \
+        out_targets
+    in_codes = in_targets.astype(np.int64) * (num_of_args + 1) + in_sources
+    for codes in (out_codes, in_codes):
+        if not np.all(codes[1:] > codes[:-1]):
+            raise InvalidInputError(
+                'Binary file has unsorted or repeated attacks.')
+
+    # Both orders must hold the same attacks.
+    in_as_out = np.sort(in_sources.astype(np.int64) * (num_of_args + 1) +
+                        in_targets)
+    if not np.array_equal(out_codes, in_as_out):
+        raise InvalidInputError(
+            'Binary file has inconsistent attack orders.')
+
+
 _formats = {
     # List spported input formats and their parsing functions here.
     'tgf': _parseTGF,
-    'apx': _parseAPX
+    'apx': _parseAPX,
+    'i23': _parseI23
+}
+
+# Formats loaded directly into a framework representation from the path
+# of the file rather than parsed from its text.
+_frameworkLoaders = {
+    'saf': loadBinaryFramework
 }
 
 
 def getFormats():
-    return list(_formats.keys())
+    return list(_formats.keys()) + list(_frameworkLoaders.keys())
 
 
-def parseInput(file_path, format='tgf', validate=False):
+def readInput(file_path, format='tgf', validate=False):
     """Parse the input file at the given path under a given supported
-    encoding into a tuple AF representation.
+    encoding into a tuple AF representation, raising an exception
+    rather than exiting if it cannot (see parseInput).
 
     Arguments:
         file_path {str} -- path to the input file encoded in one of the
@@ -223,24 +514,131 @@ def parseInput(file_path, format='tgf', validate=False):
     Returns:
         Tuple[List[str],List[Tuple[str]]] -- tuple representation of the
             encoded AF]]
+
+    Raises:
+        InvalidInputError -- if the file is invalid under the format or
+            the format is not supported
+        OSError -- if the file cannot be read
     """
 
+    if format in _frameworkLoaders:
+        framework = _frameworkLoaders[format](file_path, validate)
+        arguments = framework.valuesToArguments(framework.getArguments())
+        attacks = [tuple(framework.valuesToArguments(attack))
+                   for attack in framework.getAttacks().tolist()]
+        return arguments, attacks
+
     try:
         parsingFunction = _formats[format]
     except KeyError:
+        raise InvalidInputError(
+            F'File format "{format}" is not supported!') from None
+
+    with open(file_path, 'r') as file:
+        return parsingFunction(file, validate)
+
+
+def readFramework(file_path, format='tgf', validate=False):
+    """Load the framework in the input file at the given path under a
+    given supported encoding into a framework representation, raising
+    an exception rather than exiting if it cannot (see loadFramework).
+
+    Arguments:
+        file_path {str} -- path to the input file encoded in one of the
+            supported formats/encodings
+
+    Keyword Arguments:
+        format {str} -- name of the format/encoding of the file at
+            file_path (default: {'tgf'})
+        validate {bool} -- decide whether to check the file at file_path
+            for validity under the format (default: {False})
+
+    Returns:
+        saf.framework.FrameworkRepresentation -- the framework
+
+    Raises:
+        InvalidInputError -- if the file is invalid under the format or
+            the format is not supported
+        OSError -- if the file cannot be read
+    """
+
+    if format in _frameworkLoaders:
+        return _frameworkLoaders[format](file_path, validate)
+
+    arguments, attacks = readInput(file_path, format, validate)
+    try:
+        return ListGraphFramework(arguments, attacks)
+    except KeyError as e:
+        # Only reached without validation.
+        raise InvalidInputError(
+            F'An attack involves the unknown argument {e}.') from None
+
+
+def _exitOnInvalidInput(read, file_path, format, validate):
+    # Report why an input file cannot be read and exit.
+    if format not in getFormats():
         sys.stderr.write(F'File format "{format}" is not supported!')
         sys.stderr.write('Use --formats to see the list of supported formats.')
         sys.stderr.flush()
         sys.exit(1)
+
     try:
-        with open(file_path, 'r') as file:
-            return parsingFunction(file, validate)
+        return read(file_path, format, validate)
+    except InvalidInputError as e:
+        _reportInvalidInputFileAndExit(str(e))
     except OSError as e:
         sys.stderr.write(e.strerror)
         sys.stderr.flush()
         sys.exit(1)
 
 
+def parseInput(file_path, format='tgf', validate=False):
+    """Parse the input file at the given path under a given supported
+    encoding into a tuple AF representation. Notify and exit if the
+    file cannot be read, is invalid or its format is not supported.
+
+    Arguments:
+        file_path {str} -- path to the input file encoded in one of the
+            supported formats/encodings
+
+    Keyword Arguments:
+        format {str} -- name of the format/encoding of the file at
+            file_path (default: {'tgf'})
+        validate {bool} -- decide whether to check the file at file_path
+            for validity under the format (default: {False})
+
+    Returns:
+        Tuple[List[str],List[Tuple[str]]] -- tuple representation of the
+            encoded AF]]
+    """
+
+    return _exitOnInvalidInput(readInput, file_path, format, validate)
+
+
+def loadFramework(file_path, format='tgf', validate=False):
+    """Load the framework in the input file at the given path under a
+    given supported encoding into a framework representation: a
+    CSRFramework for the binary format and a ListGraphFramework
+    otherwise. Notify and exit if the file cannot be read, is invalid
+    or its format is not supported.
+
+    Arguments:
+        file_path {str} -- path to the input file encoded in one of the
+            supported formats/encodings
+
+    Keyword Arguments:
+        format {str} -- name of the format/encoding of the file at
+            file_path (default: {'tgf'})
+        validate {bool} -- decide whether to check the file at file_path
+            for validity under the format (default: {False})
+
+    Returns:
+        saf.framework.FrameworkRepresentation -- the framework
+    """
+
+    return _exitOnInvalidInput(readFramework, file_path, format, validate)
+
+
 class _FormatsAction(argparse.Action):
     """Argparse action for listing supported formats."""
 
@@ -257,6 +655,16 @@ class _ProblemsAction(argparse.Action):
         sys.exit(0)
 
 
+def _taskList(value):
+    # Argparse type of a comma separated list of tasks.
+    task_names = [name.strip().upper() for name in value.split(',')]
+    unknown = [name for name in task_names if name not in tasks.getTasks()]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            F'invalid task(s): {", ".join(unknown)}')
+    return task_names
+
+
 def _initialiseArgumentParser():
     """Initilise and return an Argparse parser object in complience to
     ICCMA Solver interface.
@@ -275,19 +683,16 @@ def _initialiseArgumentParser():
                           type=str,
                           help='Path to file containing a argumentation \
                           framework encding',
-                          required=True,
                           choices=tasks.getTasks())
 
     required.add_argument('-f',
                           '--inputFile',
                           type=str,
-                          required=True,
                           help='Path to input file encoding an framework')
 
     required.add_argument('-fo',
                           '--fileFormat',
                           type=str,
-                          required=True,
                           choices=getFormats(),
                           help='Input file format')
 
@@ -317,12 +722,65 @@ def _initialiseArgumentParser():
                           help='Enable validation of the input \
                               file before parsing')
 
+    optional.add_argument('--tasks',
+                          type=_taskList,
+                          metavar='<task>[,<task>...]',
+                          help='Solve several tasks on the framework \
+                              sharing their work and output their \
+                              results as JSON lines; decision tasks are \
+                              solved for every argument unless -a is \
+                              given (replaces -p)')
+
+    optional.add_argument('--save-binary',
+                          type=str,
+                          metavar='<file>',
+                          help='Also save the framework to a file in \
+                              the binary format (saf) for faster loading')
+
+    optional.add_argument('--cache',
+                          type=str,
+                          metavar='<directory>',
+                          help='Directory of a persistent cache of \
+                              solutions to reuse and extend')
+
+    server = parser.add_argument_group('server mode arguments')
+    server.add_argument('--serve',
+                        nargs='?',
+                        const='stdio',
+                        metavar='<socket path>',
+                        help='Keep serving JSON-RPC requests on \
+                            frameworks (see saf.server), over a Unix \
+                            socket at the given path or over stdio')
+
+    batch = parser.add_argument_group('batch mode arguments')
+    batch.add_argument('--batch',
+                       type=str,
+                       metavar='<manifest or directory>',
+                       help='Solve the jobs listed in a manifest file, or \
+                           the task (-p) on every file in a directory, \
+                           and output their results as JSON lines \
+                           (see saf.batch)')
+
+    batch.add_argument('--workers',
+                       type=int,
+                       metavar='<number>',
+                       help='Number of worker processes solving the jobs \
+                           (default: number of CPUs)')
+
+    batch.add_argument('--timeout',
+                       type=float,
+                       metavar='<seconds>',
+                       help='Wall-clock time limit of each job')
+
     return parser
 
 
 def parseArguments():
     """Create the agument parser and return the parsed arguments
-        according the ICCMA solver interface.
+        according the ICCMA solver interface. The task (or tasks), input
+        file and file format are required unless in server or batch
+        mode, where only solving a task on a directory requires the
+        task.
 
     Returns:
         argparse.Namespace -- parsed arguments object
@@ -331,11 +789,25 @@ def parseArguments():
     parser = _initialiseArgumentParser()
     args = parser.parse_args()
 
+    if args.serve is not None:
+        pass
+    elif args.batch is None:
+        missing = [option for option, value in
+                   (('-p/--problemTask', args.problemTask or args.tasks),
+                    ('-f/--inputFile', args.inputFile),
+                    ('-fo/--fileFormat', args.fileFormat))
+                   if value is None]
+        if missing:
+            parser.error('the following arguments are required: ' +
+                         ', '.join(missing))
+    elif os.path.isdir(args.batch) and args.problemTask is None:
+        parser.error('-p/--problemTask is required to solve a directory')
+
     return args
 
 
 def formatOutput(output, sep=',', prefix='', suffix=''):
-    return F'{prefix}[{sep.join(output)}]{suffix}'
+    return F'{prefix}[{sep.join(map(str, output))}]{suffix}'
 
 
 def outputDecision(accepted, suffix='\n'):
@@ -380,10 +852,13 @@ def outputSE(ext, suffix='\n'):
 
 def outputEE(ext_list, sep=',', suffix='\n'):
     """Given a full enumeration task solution (list of extensions),
-        output it according to the ICCMA spesification.
+        output it according to the ICCMA spesification. The extensions
+        are written one by one as they are produced, hence ext_list may
+        be a generator enumerating them; the output is flushed after
+        each extension, as the next one may take long to find.
 
     Arguments:
-        ext_list {List[List[int]]} -- list of extensions which are the
+        ext_list {Iterable[List[int]]} -- extensions which are the
             solution to the full enumeration problem (arguments as
             values)
 
@@ -395,19 +870,82 @@ def outputEE(ext_list, sep=',', suffix='\n'):
     """
 
     sys.stdout.write('[')
-    sys.stdout.write(sep.join([formatOutput(ext) for ext in ext_list]))
+
+    for i, ext in enumerate(ext_list):
+        if i > 0:
+            sys.stdout.write(sep)
+        sys.stdout.write(formatOutput(ext))
+        sys.stdout.flush()
+
     sys.stdout.write(']')
     sys.stdout.write(suffix)
     sys.stdout.flush()
 
 
+def formatWitness(ext):
+    """Format an extension as a witness line of the ICCMA'23 output,
+        i.e. 'w' followed by the arguments separated by spaces."""
+
+    return ' '.join(itertools.chain('w', map(str, ext)))
+
+
+def outputSEI23(ext, suffix='\n'):
+    """Given a single enumeration task solution (extension), output it
+        according to the ICCMA'23 specification: a witness line (see
+        formatWitness) or NO if there is no extension.
+
+    Arguments:
+        ext {List[int]} -- extension which is a solution to a sigle
+            enumeration problem; None indicates 'no solution'
+
+    Keyword Arguments:
+        suffix {str} -- seperator to be printed after the solution
+            (default: {'\n'})
+    """
+
+    sys.stdout.write('NO' if ext is None else formatWitness(ext))
+    sys.stdout.write(suffix)
+    sys.stdout.flush()
+
+
+def outputEEI23(ext_list, suffix='\n'):
+    """Given a full enumeration task solution, output it in the fashion
+        of the ICCMA'23 specification (which does not cover full
+        enumeration) as one witness line per extension. The extensions
+        are written as they are produced (see outputEE).
+
+    Arguments:
+        ext_list {Iterable[List[int]]} -- extensions which are the
+            solution to the full enumeration problem
+
+    Keyword Arguments:
+        suffix {str} -- seperator to be printed after each extension
+            (default: {'\n'})
+    """
+
+    for ext in ext_list:
+        sys.stdout.write(formatWitness(ext))
+        sys.stdout.write(suffix)
+        sys.stdout.flush()
+
+    sys.stdout.flush()
+
+
 _outputFunctions = {'EE': outputEE,
                     'SE': outputSE,
                     'DC': outputDC,
                     'DS': outputDS}
 
+# Output functions of the input formats with their own conventions.
+_formatOutputFunctions = {
+    'i23': {'EE': outputEEI23,
+            'SE': outputSEI23,
+            'DC': outputDC,
+            'DS': outputDS}
+}
+
 
-def outputSolution(solution, task_type):
+def outputSolution(solution, task_type, format=None):
     """Given a solution to a task, output it according to the task type
         and the ICCMA spesification.
 
@@ -415,10 +953,15 @@ def outputSolution(solution, task_type):
         solution {List[List[int]] or List[int] or bool or None} -- the
             solution to be output
         task_type {str} -- string defining the problem task type.
+
+    Keyword Arguments:
+        format {str} -- name of the format of the input, which decides
+            the output conventions (default: {None})
     """
 
+    output_functions = _formatOutputFunctions.get(format, _outputFunctions)
     try:
-        _outputFunctions.get(task_type)(solution)
+        output_functions[task_type](solution)
     except KeyError:
         sys.stderr.write(F'Task_type {task_type} is invalid!')
         sys.stderr.flush()
@@ -0,0 +1,427 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides solved-af with a long-lived server mode, which
+    keeps frameworks loaded under handles and solves tasks on them from
+    warm state (see saf.session). Requests and responses are JSON-RPC
+    2.0 messages, one per line, exchanged over stdio or a Unix socket.
+
+    Methods (and their parameters):
+        load {file, format, validate} -- load a framework from a file
+        create {arguments, attacks} -- create a framework from names
+        edit {handle, add_arguments, remove_arguments, add_attacks,
+            remove_attacks} -- change the arguments and attacks of a
+            framework, which drops its warm state
+        solve {handle, task, argument, timeout} -- solve a task
+        solveAll {handle, tasks, argument, timeout} -- solve several
+            tasks, decision tasks for every argument unless given one
+        unload {handle} -- forget a framework
+        list -- get the handles and sizes of the frameworks loaded
+        shutdown -- stop the server
+"""
+
+import inspect
+import itertools
+import json
+import os
+import socketserver
+import sys
+import threading
+
+import solved_af.io as io
+import solved_af.tasks as tasks
+import solved_af.utils as utils
+from solved_af.cache import solutionToNames
+from solved_af.framework import ListGraphFramework
+from solved_af.session import FrameworkSession, orderQueries
+from solved_af.solvers import LimitExceededError
+
+# JSON-RPC 2.0 error codes; the last two are specific to this server.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SOLVER_ERROR = -32000
+TIMEOUT_ERROR = -32001
+
+
+class RPCError(Exception):
+    """Raised by the methods of a SolverServer to respond with a
+        JSON-RPC error."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class SolverServer:
+    """Serves JSON-RPC requests on frameworks kept loaded under handles
+        (see the module's documentation for the methods). Each framework
+        is solved in a FrameworkSession, which keeps its grounded
+        labelling, reductions and extensions between requests.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._handles = itertools.count(1)
+        self._lock = threading.Lock()
+        self.is_shut_down = threading.Event()
+        self._methods = {'load': self.load,
+                         'create': self.create,
+                         'edit': self.edit,
+                         'solve': self.solve,
+                         'solveAll': self.solveAll,
+                         'unload': self.unload,
+                         'list': self.list,
+                         'shutdown': self.shutdown}
+
+    def handleMessage(self, message):
+        """Handle a JSON-RPC message, i.e. a request or a batch (list)
+            of requests, given as a line of JSON.
+
+        Arguments:
+            message {str} -- the message
+
+        Returns:
+            str or None -- the response as a line of JSON; None if there
+                is nothing to respond (e.g., to notifications)
+        """
+
+        try:
+            request = json.loads(message)
+        except ValueError:
+            response = _errorResponse(None, PARSE_ERROR, 'Parse error')
+        else:
+            if isinstance(request, list) and request:
+                response = [r for r in map(self.handleRequest, request)
+                            if r is not None] or None
+            else:
+                response = self.handleRequest(request)
+
+        return None if response is None else json.dumps(response) + '\n'
+
+    def handleRequest(self, request):
+        """Handle a single JSON-RPC request.
+
+        Arguments:
+            request {Dict} -- the decoded request
+
+        Returns:
+            Dict or None -- the response; None for a notification
+        """
+
+        if not isinstance(request, dict) or \
+                request.get('jsonrpc') != '2.0' or \
+                not isinstance(request.get('method'), str):
+            return _errorResponse(None, INVALID_REQUEST, 'Invalid Request')
+
+        request_id = request.get('id')
+        params = request.get('params', {})
+
+        try:
+            method = self._methods.get(request['method'])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, 'Method not found')
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, 'Params must be an object')
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as e:
+                # Missing or unexpected parameters
+                raise RPCError(INVALID_PARAMS, str(e))
+            with utils.memoScope():
+                result = method(**params)
+        except RPCError as e:
+            response = _errorResponse(request_id, e.code, str(e))
+        except Exception as e:
+            response = _errorResponse(request_id, SOLVER_ERROR,
+                                      F'{type(e).__name__}: {e}')
+        else:
+            response = {'jsonrpc': '2.0', 'id': request_id,
+                        'result': result}
+
+        return response if 'id' in request else None
+
+    def _add(self, framework):
+        with self._lock:
+            handle = next(self._handles)
+            self._sessions[handle] = FrameworkSession(framework)
+        return {'handle': handle, 'arguments': len(framework),
+                'attacks': len(framework.getAttacks())}
+
+    def _session(self, handle):
+        with self._lock:
+            try:
+                return self._sessions[handle]
+            except (KeyError, TypeError):
+                raise RPCError(INVALID_PARAMS,
+                               F'No framework with handle {handle}.')
+
+    def load(self, file, format='tgf', validate=False):
+        try:
+            framework = io.readFramework(file, format, validate)
+        except io.InvalidInputError as e:
+            raise RPCError(INVALID_PARAMS, F'Invalid input file! {e}')
+        except OSError as e:
+            raise RPCError(INVALID_PARAMS, F'{e.strerror}: {file}')
+
+        return self._add(framework)
+
+    def create(self, arguments, attacks=()):
+        arguments = _names(arguments)
+        attacks = _attacks(attacks)
+        _checkFramework(arguments, attacks)
+
+        return self._add(ListGraphFramework(arguments, attacks))
+
+    def edit(self, handle, add_arguments=(), remove_arguments=(),
+             add_attacks=(), remove_attacks=()):
+        framework = self._session(handle).framework
+
+        removed = set(_names(remove_arguments))
+        arguments = [arg for arg in
+                     framework.valuesToArguments(framework.getArguments())
+                     if arg not in removed]
+        arguments += [arg for arg in _names(add_arguments)
+                      if arg not in removed]
+
+        removed_attacks = set(_attacks(remove_attacks))
+        attacks = [tuple(framework.valuesToArguments(attack))
+                   for attack in framework.getAttacks()]
+        attacks = [attack for attack in
+                   itertools.chain(attacks, _attacks(add_attacks))
+                   if attack not in removed_attacks and
+                   not removed.intersection(attack)]
+        attacks = list(dict.fromkeys(attacks))
+        _checkFramework(arguments, attacks)
+
+        # The warm state of the framework does not survive the edit.
+        session = FrameworkSession(ListGraphFramework(arguments, attacks))
+        with self._lock:
+            if handle not in self._sessions:
+                raise RPCError(INVALID_PARAMS,
+                               F'No framework with handle {handle}.')
+            self._sessions[handle] = session
+
+        return {'handle': handle, 'arguments': len(arguments),
+                'attacks': len(attacks)}
+
+    def solve(self, handle, task, argument=None, timeout=None):
+        session = self._session(handle)
+        task = _checkTask(task, argument is None)
+        argument_value = None if argument is None \
+            else _argumentValue(session.framework, argument)
+
+        return _solveNamed(session, [(task, argument_value)], timeout)[0]
+
+    def solveAll(self, handle, tasks, argument=None, timeout=None):
+        session = self._session(handle)
+        framework = session.framework
+        argument_values = list(framework.getArguments()) \
+            if argument is None \
+            else [_argumentValue(framework, argument)]
+
+        if not isinstance(tasks, list):
+            raise RPCError(INVALID_PARAMS, 'Tasks must be an array.')
+        queries = []
+        for task in tasks:
+            task = _checkTask(task, str(task).upper()[:2] in ('EE', 'SE'))
+            if task[:2] in ('EE', 'SE'):
+                queries.append((task, None))
+            else:
+                queries.extend((task, arg) for arg in argument_values)
+        queries = orderQueries(queries)
+
+        solutions = _solveNamed(session, queries, timeout)
+
+        return [{'task': task,
+                 'argument': None if arg is None
+                 else framework.valueToArgument(arg),
+                 'solution': solution}
+                for (task, arg), solution in zip(queries, solutions)]
+
+    def unload(self, handle):
+        with self._lock:
+            if self._sessions.pop(handle, None) is None:
+                raise RPCError(INVALID_PARAMS,
+                               F'No framework with handle {handle}.')
+        return True
+
+    def list(self):
+        with self._lock:
+            return [{'handle': handle,
+                     'arguments': len(session.framework)}
+                    for handle, session in self._sessions.items()]
+
+    def shutdown(self):
+        self.is_shut_down.set()
+        return True
+
+
+def _errorResponse(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id,
+            'error': {'code': code, 'message': message}}
+
+
+def _name(name):
+    # Name arguments by strings, as the input files do.
+    if not isinstance(name, (str, int, float)):
+        raise RPCError(INVALID_PARAMS,
+                       F'Argument {json.dumps(name)} is not a string or '
+                       'a number.')
+    return str(name)
+
+
+def _names(names):
+    if not isinstance(names, (list, tuple)):
+        raise RPCError(INVALID_PARAMS, 'Arguments must be an array.')
+    return [_name(name) for name in names]
+
+
+def _attacks(attacks):
+    if not isinstance(attacks, (list, tuple)) or \
+            not all(isinstance(attack, list) for attack in attacks):
+        raise RPCError(INVALID_PARAMS, 'Attacks must be an array of pairs.')
+    return [tuple(_names(attack)) for attack in attacks]
+
+
+def _checkFramework(arguments, attacks):
+    # Check that the attacks are between arguments given once each.
+    argument_set = set(arguments)
+    if len(argument_set) != len(arguments):
+        raise RPCError(INVALID_PARAMS, 'Arguments are given more than once.')
+    for attack in attacks:
+        if len(attack) != 2 or not argument_set.issuperset(attack):
+            raise RPCError(INVALID_PARAMS,
+                           F'Attack {list(attack)} is not between two '
+                           'arguments of the framework.')
+
+
+def _checkTask(task, is_enumeration):
+    task = str(task).upper()
+    if task not in tasks.getTasks():
+        raise RPCError(INVALID_PARAMS, F'Unknown task {task}.')
+    if is_enumeration != (task[:2] in ('EE', 'SE')):
+        raise RPCError(INVALID_PARAMS,
+                       F'Task {task} requires an argument.' if
+                       is_enumeration else
+                       F'Task {task} does not take an argument.')
+    return task
+
+
+def _argumentValue(framework, argument):
+    try:
+        return framework.argumentToValue(_name(argument))
+    except KeyError:
+        raise RPCError(INVALID_PARAMS,
+                       F'Argument {argument} is not in the framework.')
+
+
+def _solveNamed(session, queries, timeout):
+    # Solve queries in a session under a deadline, giving the solutions
+    # in (JSON serialisable) argument names.
+    framework = session.framework
+
+    def solveAll():
+        solutions = []
+        for task, argument_value in queries:
+            solution = session.solve(task, argument_value)
+            if task[:2] == 'EE':
+                solution = [framework.valuesToArguments(ext)
+                            for ext in solution]
+            elif task[:2] == 'SE' and solution is not None:
+                solution = framework.valuesToArguments(solution)
+            solutions.append(solutionToNames(solution, task[:2]))
+        return solutions
+
+    try:
+        return tasks.solveWithDeadline(solveAll, seconds=timeout)
+    except LimitExceededError as e:
+        raise RPCError(TIMEOUT_ERROR, str(e))
+    except SystemExit:
+        raise RPCError(SOLVER_ERROR, 'The SAT solver could not be run.')
+
+
+def serveStream(server, input=None, output=None):
+    """Serve the requests read line by line from a text stream, writing
+        the responses to another, until the input ends or the server is
+        shut down.
+
+    Arguments:
+        server {SolverServer} -- the server
+
+    Keyword Arguments:
+        input {TextIO} -- the stream of requests (default: {sys.stdin})
+        output {TextIO} -- the stream of responses
+            (default: {sys.stdout})
+    """
+
+    input = sys.stdin if input is None else input
+    output = sys.stdout if output is None else output
+
+    for line in input:
+        if not line.strip():
+            continue
+        response = server.handleMessage(line)
+        if response is not None:
+            output.write(response)
+            output.flush()
+        if server.is_shut_down.is_set():
+            break
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    # Serves the requests of one connection to a Unix socket.
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.solver_server.handleMessage(
+                line.decode('utf-8'))
+            if response is not None:
+                self.wfile.write(response.encode('utf-8'))
+                self.wfile.flush()
+            if self.server.solver_server.is_shut_down.is_set():
+                break
+
+
+class _UnixServer(socketserver.ThreadingMixIn,
+                  socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serveUnixSocket(server, socket_path):
+    """Serve the requests of the connections to a Unix socket, each on
+        its own thread, until the server is shut down.
+
+    Arguments:
+        server {SolverServer} -- the server
+        socket_path {str} -- path of the socket to create
+    """
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with _UnixServer(socket_path, _ConnectionHandler) as unix_server:
+        unix_server.solver_server = server
+        thread = threading.Thread(target=unix_server.serve_forever,
+                                  daemon=True)
+        thread.start()
+        try:
+            server.is_shut_down.wait()
+        finally:
+            unix_server.shutdown()
+            os.remove(socket_path)
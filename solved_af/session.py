@@ -0,0 +1,176 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides solved-af with sessions solving many tasks on
+    one framework, which share the work done for the framework across
+    the tasks: its grounded labelling, its reductions to SAT and the
+    extensions already enumerated.
+"""
+
+import threading
+
+import solved_af.tasks as tasks
+from solved_af.framework import getAllMaximal
+
+
+class FrameworkSession:
+    """Solves the tasks on a framework, sharing the grounded labelling
+        and the reductions to SAT (see saf.tasks.EncodingCache) among
+        them. The extensions enumerated by EE tasks are kept, and the
+        SE, DC and DS tasks of the same semantics are then answered from
+        them without a SAT solver. The preferred extensions are derived
+        from the complete ones and the grounded extension is the least
+        complete one. The solutions of the other tasks are kept as well.
+    """
+
+    def __init__(self, framework):
+        """Constructor of the FrameworkSession.
+
+        Arguments:
+            framework {saf.framework.FrameworkRepresentation} -- object
+                representing the argumentation framework
+        """
+
+        self.framework = framework
+        self._encodings = tasks.EncodingCache(framework)
+        # The extensions of each semantics (e.g., 'CO') enumerated and
+        # the solutions of the other tasks by task and query argument.
+        self._extensions = {}
+        self._solutions = {}
+        self._lock = threading.Lock()
+
+    def knownExtensions(self, semantics):
+        """Get the extensions of a semantics (e.g., 'PR') if they are
+            known without solving a task; None otherwise."""
+
+        with self._lock:
+            if semantics in self._extensions:
+                return self._extensions[semantics]
+
+            complete = self._extensions.get('CO')
+            if complete is None:
+                return None
+            if semantics == 'PR':
+                self._extensions['PR'] = list(getAllMaximal(complete))
+                return self._extensions['PR']
+            if semantics == 'GR':
+                return [min(complete, key=len)]
+
+        return None
+
+    def extensions(self, semantics):
+        """Get all extensions of a semantics, enumerating them on first
+            use.
+
+        Arguments:
+            semantics {str} -- the semantics (e.g., 'CO')
+
+        Returns:
+            List[FrozenSet[int]] -- the extensions
+        """
+
+        known = self.knownExtensions(semantics)
+        if known is not None:
+            return known
+
+        taskMethod = tasks.getTaskMethod('EE-' + semantics,
+                                         is_enumeration=True)
+        with tasks.encodingScope(self._encodings):
+            extensions = [frozenset(ext)
+                          for ext in taskMethod(self.framework)]
+
+        with self._lock:
+            return self._extensions.setdefault(semantics, extensions)
+
+    def solve(self, task_name, argument_value=None):
+        """Solve a task on the framework.
+
+        Arguments:
+            task_name {str} -- the AF problem task identifier (e.g.,
+                EE-CO)
+
+        Keyword Arguments:
+            argument_value {int} -- the value of the query argument of
+                a decision task (default: {None})
+
+        Returns:
+            List[FrozenSet[int]] or Set[int] or bool or None -- the
+                solution, as returned by the task's method except that
+                the extensions of EE tasks are listed
+        """
+
+        task_name = task_name.upper()
+        task_type, semantics = task_name[:2], task_name[3:]
+
+        if task_type == 'EE':
+            return self.extensions(semantics)
+
+        known = self.knownExtensions(semantics)
+        if known is not None and argument_value is None:
+            return known[0] if known else None
+        elif known is not None and task_type == 'DC':
+            return any(argument_value in ext for ext in known)
+        elif known is not None and task_type == 'DS':
+            return all(argument_value in ext for ext in known)
+
+        key = (task_name, argument_value)
+        with self._lock:
+            if key in self._solutions:
+                return self._solutions[key]
+
+        is_enumeration = argument_value is None
+        taskMethod = tasks.getTaskMethod(task_name, is_enumeration)
+        with tasks.encodingScope(self._encodings):
+            if is_enumeration:
+                solution = taskMethod(self.framework)
+            else:
+                solution = taskMethod(self.framework, argument_value)
+
+        with self._lock:
+            return self._solutions.setdefault(key, solution)
+
+    def solveAll(self, queries):
+        """Solve a number of tasks on the framework. The EE tasks are
+            solved first, so that the other tasks can be answered from
+            their extensions.
+
+        Arguments:
+            queries {Iterable[Tuple[str, int]]} -- pairs of a task
+                identifier and the value of its query argument (None
+                for enumeration tasks)
+
+        Returns:
+            Generator[Tuple[str, int, Any]] -- the queries along with
+                their solutions (see solve) in the order solved
+        """
+
+        for task_name, argument_value in orderQueries(queries):
+            yield task_name, argument_value, \
+                self.solve(task_name, argument_value)
+
+
+def orderQueries(queries):
+    """Order queries (pairs of a task identifier and a query argument)
+        so that the EE tasks come first, keeping the order otherwise."""
+
+    return sorted(queries,
+                  key=lambda query: not query[0].upper().startswith('EE'))
+
+
+def solveTasks(framework, queries):
+    """Solve a number of tasks on a framework in one FrameworkSession
+        (see FrameworkSession.solveAll)."""
+
+    return FrameworkSession(framework).solveAll(queries)
@@ -0,0 +1,540 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""This module provides solved-af with the SAT solver backends used to
+    decide the theories produced by the reductions in saf.theories.
+"""
+
+import abc
+import errno
+import functools
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import List
+
+from solved_af.theories import ClauseBuffer, DIMACSInput
+
+try:
+    import resource
+except ImportError:
+    # Per-process limits on the external SAT solver are not supported
+    # on this platform (e.g., Windows).
+    resource = None
+
+# Interval in seconds at which running solvers check their deadline for
+# having been cancelled.
+POLL_INTERVAL = 0.05
+
+
+class LimitExceededError(TimeoutError):
+    """Raised when a deadline expires, is cancelled or when a resource
+        limit of a deadline is exceeded.
+
+    Attributes:
+        phase {str} -- the phase of the task which was interrupted
+            (e.g., 'encoding' or 'solving')
+        limit {str} -- which limit was hit: 'time', 'cancelled',
+            'cpu' or 'memory'
+    """
+
+    def __init__(self, phase, limit='time'):
+        super().__init__(F'{limit} limit exceeded while {phase}'
+                         if limit != 'cancelled' else
+                         F'cancelled while {phase}')
+        self.phase = phase
+        self.limit = limit
+
+
+class Deadline:
+    """A wall-clock deadline for solving a task, which may also be
+        cancelled from another thread, along with optional per-process
+        limits on the external SAT solver.
+    """
+
+    def __init__(self, seconds=None, cpu_seconds=None, memory_bytes=None):
+        """Constructor of the Deadline.
+
+        Keyword Arguments:
+            seconds {float} -- wall-clock time from now until the
+                deadline expires; None for no time limit
+                (default: {None})
+            cpu_seconds {int} -- CPU time limit of each external SAT
+                solver process (default: {None})
+            memory_bytes {int} -- address space limit of each external
+                SAT solver process (default: {None})
+        """
+
+        if resource is None and (cpu_seconds is not None or
+                                 memory_bytes is not None):
+            raise ValueError('Process limits are not supported on this '
+                             'platform.')
+
+        self._expires_at = None if seconds is None \
+            else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+
+    def cancel(self):
+        """Cancel the deadline, interrupting any solver waiting on it."""
+        self._cancelled.set()
+
+    def isCancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """Get the seconds left until the deadline; None if unlimited."""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def hasExpired(self) -> bool:
+        return self.isCancelled() or self.remaining() == 0.0
+
+    def check(self, phase):
+        """Raise a LimitExceededError for the given phase if the
+            deadline has expired or has been cancelled.
+        """
+        if self.isCancelled():
+            raise LimitExceededError(phase, 'cancelled')
+        if self.remaining() == 0.0:
+            raise LimitExceededError(phase, 'time')
+
+    def wait(self, timeout):
+        """Sleep for at most timeout seconds, waking up early if the
+            deadline is cancelled."""
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        self._cancelled.wait(timeout)
+
+    def processLimits(self):
+        """Get the resource limits of each external SAT solver process
+            as pairs of a resource (e.g., resource.RLIMIT_CPU) and its
+            soft and hard limits."""
+        limits = []
+        if self.cpu_seconds is not None:
+            limits.append((resource.RLIMIT_CPU,
+                           (self.cpu_seconds, self.cpu_seconds + 1)))
+        if self.memory_bytes is not None:
+            limits.append((resource.RLIMIT_AS,
+                           (self.memory_bytes, self.memory_bytes)))
+        return limits
+
+    def hasProcessLimits(self) -> bool:
+        return self.cpu_seconds is not None or self.memory_bytes is not None
+
+
+def _setLimits(limits):
+    # Runs in the forked child before the solver command is executed.
+    for limit, values in limits:
+        resource.setrlimit(limit, values)
+
+
+def _applyLimits(pid, limits):
+    # Set the limits of a started process before it is given its input.
+    for limit, values in limits:
+        try:
+            resource.prlimit(pid, limit, values)
+        except ProcessLookupError:
+            # The solver has already exited.
+            return
+
+
+def runSATSolver(command, sat_input, deadline=None, output_reader=None):
+    """Given DIMACS encoded (or encoded for your solver) input, run the
+        SAT solver command on the input and return the solver
+        process object. The input is streamed into the solver's stdin
+        while its output is read, and the process is killed if the
+        deadline expires or is cancelled before it finishes.
+
+    Arguments:
+        command {List[str]} -- the external SAT solver command as a list
+            of individual command arguments
+        sat_input {DIMACSInput or Callable or str or bytes} -- input to
+            the external SAT solver; a DIMACSInput (or a method taking
+            a binary stream) writes it chunk by chunk
+
+    Keyword Arguments:
+        deadline {Deadline} -- deadline and process limits of the
+            solver run (default: {None})
+        output_reader {SolverOutputReader} -- reader to feed the
+            solver's output to line by line as it is produced, instead
+            of collecting it (default: {None})
+
+    Returns:
+        subprocess.CompletedProcess -- object representation of the
+            external SAT solver process that has finished. Its stdout
+            is None if the output has been fed to the output_reader.
+    """
+
+    limits = [] if deadline is None else deadline.processLimits()
+    # The limits are applied to the started solver by prlimit, as running
+    # code in the forked child of a process with threads is unsafe. Only
+    # where prlimit is not available does the child set them, making no
+    # more than the setrlimit calls.
+    use_prlimit = hasattr(resource, 'prlimit')
+    preexec_fn = functools.partial(_setLimits, limits) \
+        if limits and not use_prlimit else None
+
+    try:
+        # A solver run with a deadline gets its own process group so
+        # that the processes it spawns are killed along with it.
+        process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE,
+                                   preexec_fn=preexec_fn,
+                                   start_new_session=deadline is not None)
+
+    except OSError as e:
+        # see if solver is installed
+        if e.errno == errno.ENOENT:
+            solver_name = command[0]
+            sys.stderr.write(
+                (
+                    F'command not found: \'{solver_name}\'\n\n'
+                    F'\'{solver_name}\' is a dependency of {sys.argv[0]}.\n'
+                    F'Please make sure \'{solver_name}\' is executable '
+                    'and is in your PATH.'
+                )
+            )
+        else:
+            sys.stderr.write(F'{e.strerror}\n\n')
+        sys.stderr.flush()
+        sys.exit(e.errno)
+    except subprocess.CalledProcessError as e:
+        # TODO Get the program name from setuptools
+        # TODO instead of sys.argv[0]
+        sys.stderr.write(
+            (F'{sys.argv[0]} encountered an internal error.'
+             F'The SAT solver command \'{" ".join(command)}\' '
+             F'has failed with return code {e.returncode}.')
+        )
+        sys.stderr.flush()
+        sys.exit(1)
+
+    if limits and use_prlimit:
+        _applyLimits(process.pid, limits)
+
+    output = []
+
+    def writeInput():
+        try:
+            if isinstance(sat_input, str):
+                process.stdin.write(sat_input.encode('ascii'))
+            elif isinstance(sat_input, bytes):
+                process.stdin.write(sat_input)
+            elif callable(sat_input):
+                sat_input(process.stdin)
+            else:
+                sat_input.writeTo(process.stdin)
+            process.stdin.close()
+        except OSError:
+            # The solver died (e.g., by a resource limit) or has been
+            # killed before reading all of its input.
+            pass
+
+    def readOutput():
+        if output_reader is not None:
+            output_reader.readFrom(process.stdout)
+        else:
+            output.append(process.stdout.read().decode('ascii', 'replace'))
+
+    # The input is written and the output read on their own threads, so
+    # that neither a full stdin nor a full stdout pipe blocks the solver.
+    writer = threading.Thread(target=writeInput, daemon=True)
+    reader = threading.Thread(target=readOutput, daemon=True)
+    writer.start()
+    reader.start()
+
+    while True:
+        try:
+            process.wait(
+                timeout=None if deadline is None else POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if deadline.hasExpired():
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except OSError:
+                    process.kill()
+                process.wait()
+                writer.join()
+                reader.join()
+                deadline.check('solving')
+
+    writer.join()
+    reader.join()
+    stdout = output[0] if output else None
+
+    return subprocess.CompletedProcess(command, process.returncode, stdout)
+
+
+class SolverOutputReader:
+    """Incremental reader of the output of a SAT solver in the format
+        of the SAT competitions, i.e., comment lines starting with 'c',
+        a status line starting with 's' and the model on any number of
+        lines starting with 'v' and terminated by a 0.
+    """
+
+    def __init__(self):
+        self.status = None
+        self.assignment = []
+        self.has_model = False
+
+    def feed(self, line):
+        """Read one line (str or bytes) of the solver output."""
+
+        if isinstance(line, bytes):
+            line = line.decode('ascii', 'replace')
+
+        if line.startswith('v'):
+            self.has_model = True
+            # Skip the leading 'v' and the concluding 0, if any.
+            self.assignment.extend(lab_var for lab_var in
+                                   map(int, line.split()[1:]) if lab_var)
+        elif line.startswith('s'):
+            self.status = line[1:].strip()
+
+    def readFrom(self, lines):
+        """Read all lines of the solver output from an iterable of lines
+            (e.g., a stream)."""
+
+        for line in lines:
+            self.feed(line)
+        return self
+
+
+def extractAssignment(raw_dimacs_output):
+    """Extract a labelling variable assignment from the external SAT
+        solver output.
+
+    Arguments:
+        raw_dimacs_output {str} -- DIAMCS encoded SAT solver output
+
+    Returns:
+        List[int] -- labelling variable assignment
+    """
+
+    reader = SolverOutputReader()
+    return reader.readFrom(raw_dimacs_output.splitlines()).assignment
+
+
+class SATSolver(metaclass=abc.ABCMeta):
+    """Abstract class defining the base of a SAT solver backend. A
+        backend is constructed from a CNF theory and is then queried
+        any number of times, possibly with additional clauses added
+        in between the queries.
+
+        If a Deadline is given, the queries raise a LimitExceededError
+        once it expires or is cancelled.
+    """
+
+    def __init__(self, num_of_vars: int, clauses: List[List[int]],
+                 deadline: Deadline = None):
+        super().__init__()
+        self._num_of_vars = num_of_vars
+        self._top_var = num_of_vars
+        self._model = None
+        self._deadline = deadline
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abc.abstractmethod
+    def solve(self, assumptions: List[int] = ()) -> bool:
+        """Decide whether the current theory is satisfiable under the
+            given assumptions (literals which are forced to be true for
+            this query only).
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def addClause(self, clause: List[int]):
+        """Add a clause to the theory for all subsequent queries."""
+        raise NotImplementedError
+
+    def newVariable(self) -> int:
+        """Reserve a fresh auxiliary variable (e.g., an activation
+            literal for clauses which are needed only temporarily).
+            Auxiliary variables are not reported in the models.
+        """
+        self._top_var += 1
+        return self._top_var
+
+    def getModel(self) -> List[int]:
+        """Get the assignment of the reduction's variables found by the
+            last satisfiable query.
+        """
+        return self._model
+
+    def close(self):
+        """Release any resources held by the backend."""
+        pass
+
+
+class ExternalSATSolver(SATSolver):
+    """SAT solver backend which runs an external SAT solver command as a
+        new process on the whole DIMACS encoded theory for every query.
+    """
+
+    def __init__(self, num_of_vars, clauses, command, unsat_ret_code,
+                 deadline=None):
+        super().__init__(num_of_vars, clauses, deadline)
+        self._command = command
+        self._unsat_ret_code = unsat_ret_code
+        if not isinstance(clauses, ClauseBuffer):
+            clauses = ClauseBuffer(clauses)
+        self._sat_input = DIMACSInput(num_of_vars, clauses)
+
+    def solve(self, assumptions=()):
+        sat_input = self._sat_input
+        if assumptions:
+            # The external solver has no notion of assumptions, hence
+            # pass them as unit clauses written after the theory.
+            units = [[literal] for literal in assumptions]
+
+            def writeWithAssumptions(stream):
+                self._sat_input.writeTo(stream, units)
+
+            sat_input = writeWithAssumptions
+
+        output = SolverOutputReader()
+        if self._deadline is not None:
+            self._deadline.check('solving')
+        solver = runSATSolver(self._command, sat_input, self._deadline,
+                              output)
+        if self._deadline is not None:
+            self._checkProcessLimits(solver, output)
+
+        if solver.returncode == self._unsat_ret_code:
+            self._model = None
+            return False
+
+        self._model = [lab_var for lab_var in output.assignment
+                       if abs(lab_var) <= self._num_of_vars]
+        return True
+
+    def addClause(self, clause):
+        self._sat_input.addClause(clause)
+
+    def newVariable(self):
+        self._sat_input.addVariable()
+        return super().newVariable()
+
+    def _checkProcessLimits(self, solver, output):
+        # Tell apart a solver process which has been stopped by one of
+        # the deadline's resource limits from one which has finished.
+        deadline = self._deadline
+        if solver.returncode == self._unsat_ret_code:
+            return
+
+        if deadline.cpu_seconds is not None and \
+                solver.returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            raise LimitExceededError('solving', 'cpu')
+
+        if deadline.memory_bytes is not None and \
+                (solver.returncode < 0 or not output.has_model):
+            raise LimitExceededError('solving', 'memory')
+
+
+class IncrementalSATSolver(SATSolver):
+    """SAT solver backend which keeps a PySAT solver in-process across
+        queries so that learned clauses are kept and added clauses do
+        not require the theory to be re-sent.
+
+        NB requires the optional 'python-sat' package. The solver runs
+        in-process, hence only the wall-clock time of a Deadline is
+        enforced, not its per-process limits.
+    """
+
+    def __init__(self, num_of_vars, clauses, solver_name='glucose4',
+                 deadline=None):
+        super().__init__(num_of_vars, clauses, deadline)
+        try:
+            from pysat.solvers import Solver
+        except ImportError:
+            sys.stderr.write(
+                'The incremental SAT backend requires the \'python-sat\' '
+                'package.\nPlease install it or use the external backend.')
+            sys.stderr.flush()
+            sys.exit(1)
+
+        self._solver = Solver(name=solver_name, bootstrap_with=clauses)
+
+    def solve(self, assumptions=()):
+        if self._deadline is None:
+            is_sat = self._solver.solve(assumptions=assumptions)
+        else:
+            is_sat = self._solveWithDeadline(assumptions)
+
+        if not is_sat:
+            self._model = None
+            return False
+
+        model = self._solver.get_model()
+        # Variables which do not occur in any clause may be missing from
+        # the model; report them as false.
+        assigned = {abs(lit): lit for lit in model}
+        self._model = [assigned.get(var, -var)
+                       for var in range(1, self._num_of_vars + 1)]
+        return True
+
+    def _solveWithDeadline(self, assumptions):
+        deadline = self._deadline
+        deadline.check('solving')
+        finished = threading.Event()
+
+        def interruptOnExpiry():
+            # Wait on the query rather than on the deadline, so that the
+            # watcher is joined as soon as the query finishes instead of
+            # after a whole poll interval.
+            while True:
+                remaining = deadline.remaining()
+                timeout = POLL_INTERVAL if remaining is None \
+                    else min(POLL_INTERVAL, remaining)
+                if finished.wait(timeout):
+                    return
+                if deadline.hasExpired():
+                    self._solver.interrupt()
+                    return
+
+        watcher = threading.Thread(target=interruptOnExpiry, daemon=True)
+        watcher.start()
+        try:
+            is_sat = self._solver.solve_limited(assumptions=assumptions,
+                                                expect_interrupt=True)
+        finally:
+            finished.set()
+            watcher.join()
+
+        if is_sat is None:
+            # The solver has been interrupted.
+            self._solver.clear_interrupt()
+            deadline.check('solving')
+
+        return is_sat
+
+    def addClause(self, clause):
+        self._solver.add_clause(clause)
+
+    def close(self):
+        self._solver.delete()
@@ -17,12 +17,19 @@
     argumentation framework problems/tasks to solved-af.
 """
 
-import errno
-import subprocess
+import contextlib
+import contextvars
+import itertools
+import os
 import sys
-
-from solved_af.framework import getAllMaximal
-from solved_af.theories import (DIMACSParser, completeLabelingParser,
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import solved_af.solvers as solvers
+from solved_af.framework import (ancestorsOf, groundedLabelling,
+                                 iterGroundedLabelling)
+from solved_af.solvers import Deadline
+from solved_af.theories import (DIMACSParser, Label, completeLabelingParser,
                           stableLabellingParser)
 
 # Set the external SAT solver command here as a list of individual
@@ -31,6 +38,31 @@ from solved_af.theories import (DIMACSParser, completeLabelingParser,
 SAT_COMMAND = ['glucose-syrup', '-model', '-verb=0']
 UNSAT_RET_CODE = 20
 
+# Set the SAT solver backend here. The 'external' backend runs
+# SAT_COMMAND as a new process for each query, whereas the 'incremental'
+# backend keeps the PySAT solver INCREMENTAL_SOLVER_NAME in-process
+# between the queries of a task (requires the 'python-sat' package).
+SAT_BACKEND = 'external'
+INCREMENTAL_SOLVER_NAME = 'glucose4'
+
+# Set whether to compute the grounded labelling before reducing a
+# framework to SAT. The arguments it decides are then fixed by unit
+# clauses instead of being encoded, and decision tasks on them are
+# answered without calling the SAT solver at all.
+GROUNDED_PREPROCESSING = True
+
+# Set whether to solve complete, preferred and stable enumeration tasks
+# SCC by SCC, conditioning each strongly connected component on the
+# labelling of the components attacking it. Independent components of
+# the same layer are solved by up to SCC_WORKERS threads in parallel.
+SCC_DECOMPOSITION = False
+SCC_WORKERS = os.cpu_count() or 1
+
+# Set whether to restrict decision tasks under directional semantics
+# (grounded, complete, preferred) to the arguments from which the query
+# argument can be reached via attacks, as only these affect its status.
+RELEVANCE_PRUNING = True
+
 
 def runSATSolver(encoded_sat_input):
     """Given DIMACS encoded (or encoded for your solver) input, run the
@@ -38,90 +70,268 @@ def runSATSolver(encoded_sat_input):
         process object.
 
     Arguments:
-        encoded_sat_input {str} -- string into to the external
-            SAT solver
+        encoded_sat_input {DIMACSInput or str or bytes} -- input to
+            the external SAT solver
 
     Returns:
         subprocess.CompletedProcess -- object representation of the
             external SAT solver process that has finished.
     """
 
+    return solvers.runSATSolver(SAT_COMMAND, encoded_sat_input)
+
+
+# The deadline of the task currently being solved in this context.
+_currentDeadline = contextvars.ContextVar('deadline', default=None)
+
+
+@contextlib.contextmanager
+def deadlineScope(deadline):
+    """Context manager under which all tasks solved (and generators of
+        extensions consumed) are bound by a deadline. Any SAT solver
+        still running when the deadline expires or is cancelled is
+        stopped and a saf.solvers.LimitExceededError is raised, naming
+        the phase of the task which has been interrupted.
+
+    Arguments:
+        deadline {saf.solvers.Deadline} -- the deadline; None for none
+    """
+
+    token = _currentDeadline.set(deadline)
     try:
-        solver = subprocess.run(SAT_COMMAND, stdout=subprocess.PIPE,
-                                input=encoded_sat_input, encoding='ascii')
-        return solver
-
-    except OSError as e:
-        # see if solver is installed
-        if e.errno == errno.ENOENT:
-            solver_name = SAT_COMMAND[0]
-            sys.stderr.write(
-                (
-                    F'command not found: \'{solver_name}\'\n\n'
-                    F'\'{solver_name}\' is a dependency of {sys.argv[0]}.\n'
-                    F'Please make sure \'{solver_name}\' is executable '
-                    'and is in your PATH.'
-                )
-            )
-        else:
-            sys.stderr.write(F'{e.strerror}\n\n')
-        sys.stderr.flush()
-        sys.exit(e.errno)
-    except subprocess.CalledProcessError as e:
-        # TODO Get the program name from setuptools
-        # TODO instead of sys.argv[0]
-        sys.stderr.write(
-            (F'{sys.argv[0]} encountered an internal error.'
-             F'The SAT solver command \'{" ".join(SAT_COMMAND)}\' '
-             F'has failed with return code {e.returncode}.')
-        )
-        sys.stderr.flush()
-        sys.exit(1)
+        yield deadline
+    finally:
+        _currentDeadline.reset(token)
 
 
-def negateClause(clause):
-    return [-lab_var for lab_var in clause]
+def solveWithDeadline(function, *args, seconds=None, cpu_seconds=None,
+                      memory_bytes=None):
+    """Call a function solving a task under a new deadline.
+
+    Arguments:
+        function {Callable} -- method solving a task, which must not
+            return a generator which is yet to be consumed
+        args -- arguments to call the function with
+
+    Keyword Arguments:
+        seconds {float} -- wall-clock time limit (default: {None})
+        cpu_seconds {int} -- CPU time limit of each external SAT solver
+            process (default: {None})
+        memory_bytes {int} -- address space limit of each external SAT
+            solver process (default: {None})
+
+    Returns:
+        the value returned by the function
+    """
+
+    deadline = Deadline(seconds, cpu_seconds, memory_bytes)
+    with deadlineScope(deadline):
+        return function(*args)
+
+
+class EncodingCache:
+    """The grounded labels and the reductions to SAT of a framework,
+        shared by all tasks solved on it under an encodingScope of the
+        cache instead of being computed by each of them.
+    """
+
+    def __init__(self, framework):
+        """Constructor of the EncodingCache.
+
+        Arguments:
+            framework {saf.framework.FrameworkRepresentation} -- the
+                framework the encodings of which to share
+        """
+
+        self.framework = framework
+        self._fixed_labels = _NOT_COMPUTED
+        self._clauses = {}
+        self._lock = threading.Lock()
+
+    def fixedLabels(self, compute):
+        """Get the grounded labels of the framework, computing them via
+            compute() on first use."""
+        with self._lock:
+            if self._fixed_labels is _NOT_COMPUTED:
+                self._fixed_labels = compute()
+            return self._fixed_labels
+
+    def clauses(self, reduction_parser, fixed_labels, compute):
+        """Get a copy of the reduction of the framework by a parser,
+            computing it via compute() on first use. Only reductions
+            with the shared grounded labels (or no labels) fixed are
+            stored.
+        """
+        if fixed_labels is not None and \
+                fixed_labels is not self._fixed_labels:
+            return compute()
+        key = (reduction_parser, fixed_labels is None)
+        with self._lock:
+            if key not in self._clauses:
+                self._clauses[key] = compute()
+            return self._clauses[key].copy()
+
+
+_NOT_COMPUTED = object()
+
+# The encodings shared by the tasks solved in this context.
+_currentEncodings = contextvars.ContextVar('encodings', default=None)
+
+
+@contextlib.contextmanager
+def encodingScope(encoding_cache):
+    """Context manager under which all tasks solved on the framework of
+        an EncodingCache share its grounded labels and reductions.
+
+    Arguments:
+        encoding_cache {EncodingCache} -- the cache; None for none
+    """
+
+    token = _currentEncodings.set(encoding_cache)
+    try:
+        yield encoding_cache
+    finally:
+        _currentEncodings.reset(token)
+
+
+def _sharedEncodings(framework):
+    # The encoding cache of the current context if it is for the given
+    # framework (and not, e.g., one of its sub-frameworks).
+    encoding_cache = _currentEncodings.get()
+    if encoding_cache is not None and encoding_cache.framework is framework:
+        return encoding_cache
+    return None
+
+
+def checkDeadline(phase):
+    """Raise a saf.solvers.LimitExceededError if the current deadline
+        has expired while in the given phase."""
+
+    deadline = _currentDeadline.get()
+    if deadline is not None:
+        deadline.check(phase)
+
+
+_satBackends = {
+    # Here list all supported SAT solver backends along with the method
+    # which constructs a solver from a number of variables, clauses and
+    # a deadline.
+    'external': lambda num_of_vars, clauses, deadline:
+        solvers.ExternalSATSolver(num_of_vars, clauses, SAT_COMMAND,
+                                  UNSAT_RET_CODE, deadline),
+    'incremental': lambda num_of_vars, clauses, deadline:
+        solvers.IncrementalSATSolver(num_of_vars, clauses,
+                                     INCREMENTAL_SOLVER_NAME, deadline)
+}
+
+
+def getSATBackends():
+    return list(_satBackends.keys())
+
+
+def groundedFixedLabels(framework):
+    """Get the labels of the arguments decided by the grounded labelling
+        of a framework if GROUNDED_PREPROCESSING is set. These labels
+        are shared by all complete (hence preferred and stable)
+        labellings of the framework.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+
+    Returns:
+        Dict[int, saf.theories.Label] or None -- the in- and out-labels
+            of the grounded labelling; None if preprocessing is disabled
+    """
+
+    if not GROUNDED_PREPROCESSING:
+        return None
+
+    def compute():
+        checkDeadline('preprocessing')
+        fixed_labels = {arg: Label.In if is_in else Label.Out
+                        for arg, is_in in iterGroundedLabelling(framework)}
+        checkDeadline('preprocessing')
+        return fixed_labels
 
+    encoding_cache = _sharedEncodings(framework)
+    if encoding_cache is not None:
+        return encoding_cache.fixedLabels(compute)
 
-def extractAssignment(raw_dimacs_output):
-    """Extract a labelling variable assignment from the external SAT
-        solver output.
+    return compute()
+
+
+def getSATSolver(framework, reduction_parser, fixed_labels=None):
+    """Construct a solver of the SAT_BACKEND backend loaded with the
+        reduction of a framework to SAT.
 
     Arguments:
-        raw_dimacs_output {str} -- DIAMCS encoded SAT solver output
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reduction of the framework to a SAT solver
+            problem input
+
+    Keyword Arguments:
+        fixed_labels {Dict[int, saf.theories.Label]} -- labels to fix
+            instead of encoding the arguments; computed by
+            groundedFixedLabels if not given (default: {None})
 
     Returns:
-        List[int] -- labelling variable assignment
+        saf.solvers.SATSolver -- the solver loaded with the reduction
     """
 
-    # TODO Find the line which starts with 'v' explicitly,
-    # TODO raise error if not found
-    assignment_line = raw_dimacs_output.split('\n')[-2]
-    # Get a list of strings from the assignment line exclusing the
-    # beginning 'v' and the concluding '0' converted to ints
-    return [int(lab_var) for lab_var in assignment_line.split()[1:-1]]
+    try:
+        makeSolver = _satBackends[SAT_BACKEND]
+    except KeyError:
+        sys.stderr.write(F'SAT backend "{SAT_BACKEND}" is not supported!\n')
+        sys.stderr.write(
+            F'Supported backends are: {", ".join(getSATBackends())}.')
+        sys.stderr.flush()
+        sys.exit(1)
+
+    if fixed_labels is None:
+        fixed_labels = groundedFixedLabels(framework)
 
+    def compute():
+        checkDeadline('encoding')
+        clauses = reduction_parser.generateBuffer(framework, fixed_labels)
+        checkDeadline('encoding')
+        return clauses
+
+    encoding_cache = _sharedEncodings(framework)
+    if encoding_cache is not None:
+        clauses = encoding_cache.clauses(reduction_parser, fixed_labels,
+                                         compute)
+    else:
+        clauses = compute()
+
+    return makeSolver(reduction_parser.numberOfVariables(framework),
+                      clauses, _currentDeadline.get())
+
+
+def negateClause(clause):
+    return [-lab_var for lab_var in clause]
 
-def excludeAssignment(solution, sat_input):
-    """Add an additional clause to the SAT solver DIMACS input which
-        will prevent an already found assignment to be generated again
-        in subsuquent SAT solver runs. The clause added is the negation
-        of the positive literals of the given assignment.
+
+def excludeAssignment(solution, solver):
+    """Add an additional clause to the SAT solver which will prevent an
+        already found assignment to be generated again in subsuquent
+        SAT solver runs. The clause added is the negation of the
+        positive literals of the given assignment.
 
     Arguments:
         solution {List[int]} -- a labelling variable assignment
-        sat_input {saf.theories.DIMACSInput} -- object representing
-            current SAT solver input
+        solver {saf.solvers.SATSolver} -- the solver the theory of
+            which to extend
     """
 
-    # TODO Extract methods from DIMACS parser
     positive_literals = DIMACSParser.extractPositiveLiterals(solution)
     negation_clause = negateClause(positive_literals)
-    negation_dimacs = DIMACSParser.parseClause(negation_clause)
-    sat_input.addSingleClause(negation_dimacs)
+    solver.addClause(negation_clause)
 
 
-def singleEnumeration(framework, reduction_parser):
+def singleEnumeration(framework, reduction_parser, fixed_labels=None):
     """Solve a single enumeration (SE) AF problem given a framework and
         a reduction parser to some argumentation semantics.
 
@@ -132,26 +342,27 @@ def singleEnumeration(framework, reduction_parser):
             to construct the reduction of the framework to a SAT solver
             problem input
 
+    Keyword Arguments:
+        fixed_labels {Dict[int, saf.theories.Label]} -- see
+            getSATSolver (default: {None})
+
     Returns:
         List[int] or None -- the solution to the single enumeration
             problem; None indicates 'no solution;
     """
 
-    sat_input = reduction_parser.parse(framework)
-
-    solver = runSATSolver(sat_input.encode())
-
-    if solver.returncode == UNSAT_RET_CODE:
-        return None
+    with getSATSolver(framework, reduction_parser, fixed_labels) as solver:
+        if not solver.solve():
+            return None
 
-    assignment = extractAssignment(solver.stdout)
+        assignment = solver.getModel()
 
     extension = reduction_parser.extractExtention(assignment)
 
     return extension
 
 
-def fullEnumeration(framework, reduction_parser):
+def fullEnumeration(framework, reduction_parser, fixed_labels=None):
     """Solve a full enumeration (EE) AF problem given a framework and
         a reduction parser to some argumentation semantics.
 
@@ -162,65 +373,300 @@ def fullEnumeration(framework, reduction_parser):
             to construct the reduction of the framework to a SAT solver
             problem input
 
+    Keyword Arguments:
+        fixed_labels {Dict[int, saf.theories.Label]} -- see
+            getSATSolver (default: {None})
+
     Returns:
         List[List[int]] -- the solution to the full enumeration problem
     """
 
-    sat_input = reduction_parser.parse(framework)
-
-    while True:
-        solver = runSATSolver(sat_input.encode())
-
-        if solver.returncode == UNSAT_RET_CODE:
-            break
-
-        assignment = extractAssignment(solver.stdout)
-        extension = reduction_parser.extractExtention(assignment)
-        excludeAssignment(assignment, sat_input)
+    with getSATSolver(framework, reduction_parser, fixed_labels) as solver:
+        while solver.solve():
+            assignment = solver.getModel()
+            extension = reduction_parser.extractExtention(assignment)
+            excludeAssignment(assignment, solver)
 
-        yield extension
+            yield extension
 
 
-def credulousDecision(framework, argument_value, enumeration_function):
-    """Solve a credulous decision (DC) AF problem given a framework, the
-        query argument's value, and the function which enumerates the
-        extensions of the AF under the relevant semantics.
+def credulousSATDecision(framework, argument_value, reduction_parser,
+                        fixed_labels=None):
+    """Solve a credulous decision (DC) AF problem with a single SAT
+        solver call which looks for a witness labelling, i.e. a model of
+        the reduction in which the query argument is in-labeled.
 
     Arguments:
-         framework {saf.framework.FrameworkRepresentation} -- object
+        framework {saf.framework.FrameworkRepresentation} -- object
             representing the argumentation framework
         argument_value {int} -- the value of the query argument
-        enumeration_function {Callable} -- a method which fully
-            enumerates all AF's extensions under some semantics
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reduction of the framework to a SAT solver
+            problem input
+
+    Keyword Arguments:
+        fixed_labels {Dict[int, saf.theories.Label]} -- see
+            getSATSolver (default: {None})
 
     Returns:
         bool -- solution to the credulous decision problem
     """
 
-    # TODO Test whether it is faster to use 'isIncluded' here.
-    # TODO needs to be lazy, i.e. check after each extension is generated.
-    return any(argument_value in extension
-               for extension in enumeration_function(framework))
+    with getSATSolver(framework, reduction_parser, fixed_labels) as solver:
+        return solver.solve([reduction_parser.labelLiteral(argument_value)])
 
 
-def skepticalDecision(framework, argument_value, enumeration_function):
-    """Solve a skeptical decision (DS) AF problem given a framework, the
-        query argument's value, and the function which enumerates the
-        extensions of the AF under the relevant semantics.
+def skepticalSATDecision(framework, argument_value, reduction_parser,
+                        fixed_labels=None):
+    """Solve a skeptical decision (DS) AF problem with a single SAT
+        solver call which looks for a counterexample labelling, i.e. a
+        model of the reduction in which the query argument is out- or
+        und-labeled.
 
     Arguments:
-         framework {saf.framework.FrameworkRepresentation} -- object
+        framework {saf.framework.FrameworkRepresentation} -- object
             representing the argumentation framework
         argument_value {int} -- the value of the query argument
-        enumeration_function {Callable} -- a method which fully
-            enumerates all AF's extensions under some semantics
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reduction of the framework to a SAT solver
+            problem input
+
+    Keyword Arguments:
+        fixed_labels {Dict[int, saf.theories.Label]} -- see
+            getSATSolver (default: {None})
 
     Returns:
         bool -- solution to the skeptical decision problem
     """
 
-    return all(argument_value in extension
-               for extension in enumeration_function(framework))
+    with getSATSolver(framework, reduction_parser, fixed_labels) as solver:
+        return not solver.solve(
+            [-reduction_parser.labelLiteral(argument_value)])
+
+
+def growToMaximal(framework, reduction_parser, solver, extension):
+    """Grow an extension found by a solver into one which is maximal
+        (w.r.t. set inclusion) among the models of the solver's theory.
+        Do this by repeatedly asking for a model which in-labels all of
+        the extension's arguments and at least one further argument.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            used to construct the solver's theory
+        solver {saf.solvers.SATSolver} -- the solver loaded with the
+            reduction of the framework
+        extension {FrozenSet[int]} -- the extension to grow
+
+    Returns:
+        FrozenSet[int] -- a maximal extension including the given one
+    """
+
+    inLit = reduction_parser.labelLiteral
+
+    while True:
+        outside = [inLit(arg) for arg in framework.getArguments()
+                   if arg not in extension]
+        if not outside:
+            return extension
+
+        # The clause asking for a further argument is only needed for
+        # this query, hence guard it by an activation literal and
+        # disable it permanently afterwards.
+        activation = solver.newVariable()
+        solver.addClause([-activation] + outside)
+        has_grown = solver.solve([activation] +
+                                 [inLit(arg) for arg in extension])
+        solver.addClause([-activation])
+
+        if not has_grown:
+            return extension
+
+        extension = reduction_parser.extractExtention(solver.getModel())
+
+
+def maximalEnumeration(framework, reduction_parser, assumptions=(),
+                       fixed_labels=None):
+    """Enumerate the maximal (w.r.t. set inclusion) extensions encoded
+        by a reduction parser without enumerating all of the extensions
+        it encodes. Each extension found is grown to a maximal one,
+        after which all of the subsets of the maximal extension are
+        excluded from subsequent SAT solver runs.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reduction of the framework to a SAT solver
+            problem input
+
+    Keyword Arguments:
+        assumptions {List[int]} -- literals which the extensions to grow
+            are required to satisfy, the maximal extensions need not
+            satisfy them (default: {()})
+        fixed_labels {Dict[int, saf.theories.Label]} -- see
+            getSATSolver (default: {None})
+
+    Returns:
+        Generator[FrozenSet[int]] -- the maximal extensions
+    """
+
+    inLit = reduction_parser.labelLiteral
+
+    with getSATSolver(framework, reduction_parser, fixed_labels) as solver:
+        while solver.solve(assumptions):
+            extension = reduction_parser.extractExtention(solver.getModel())
+            extension = growToMaximal(framework, reduction_parser,
+                                      solver, extension)
+
+            yield extension
+
+            outside = [inLit(arg) for arg in framework.getArguments()
+                       if arg not in extension]
+            if not outside:
+                # All arguments are in the extension, thus it is the
+                # only maximal one.
+                break
+
+            solver.addClause(outside)
+
+
+def _labelSCC(framework, scc, labelling, extension):
+    """Label the arguments of an SCC given the labelling of the
+        arguments attacking it and the in-labeled arguments of the SCC.
+    """
+
+    return {arg: Label.In if arg in extension else
+            Label.Out if any(labelling.get(attacker) == Label.In or
+                             attacker in extension
+                             for attacker in framework.getAttackersOf(arg))
+            else Label.Und
+            for arg in scc}
+
+
+def conditionedSCCLabellings(framework, scc, labelling, enumeration_function,
+                             reduction_parser):
+    """Enumerate the labellings of an SCC of a framework conditioned on
+        the labelling of the arguments attacking it.
+
+    Arguments:
+        framework {saf.framework.FrameworkRepresentation} -- object
+            representing the argumentation framework
+        scc {List[int]} -- the SCC to label
+        labelling {Dict[int, saf.theories.Label]} -- labelling which
+            includes (at least) all arguments attacking the SCC
+        enumeration_function {Callable} -- one of fullEnumeration or
+            maximalEnumeration
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reduction of the SCC to a SAT solver
+            problem input
+
+    Returns:
+        List[Dict[int, saf.theories.Label]] -- the labellings of the SCC
+    """
+
+    members = set(scc)
+    upstream = {attacker for arg in scc
+                for attacker in framework.getAttackersOf(arg)
+                if attacker not in members}
+
+    if len(scc) == 1 and scc[0] not in framework.getAttackersOf(scc[0]):
+        # A single argument which does not attack itself is labeled by
+        # its attackers alone.
+        arg = scc[0]
+        attacker_labels = {labelling[att]
+                           for att in framework.getAttackersOf(arg)}
+        if Label.In in attacker_labels:
+            label = Label.Out
+        elif Label.Und in attacker_labels:
+            label = Label.Und
+        else:
+            label = Label.In
+        if label == Label.Und and reduction_parser.vars_per_argument == 1:
+            # No stable labelling exists under this conditioning.
+            return []
+        return [{arg: label}]
+
+    # Encode the SCC along with its (fixed) attackers from upstream.
+    sub = framework.subFramework(scc + sorted(upstream))
+    fixed_labels = {sub.argumentToValue(arg): labelling[arg]
+                    for arg in upstream}
+
+    return [_labelSCC(framework, scc, labelling,
+                      set(sub.valuesToArguments(extension)))
+            for extension in enumeration_function(sub, reduction_parser,
+                                                  fixed_labels=fixed_labels)]
+
+
+def sccRecursiveEnumeration(framework, reduction_parser,
+                            enumeration_function=fullEnumeration):
+    """Enumerate the extensions of a framework layer by layer of its
+        strongly connected components. Each SCC is solved conditioned on
+        the labelling of the (already labeled) layers attacking it, and
+        the combinations of the labellings of a layer's SCCs are
+        extended depth-first.
+
+        The complete and stable extensions are the combinations of the
+        conditioned complete and stable ones respectively, while the
+        preferred extensions are the combinations of the conditioned
+        maximal complete ones, see (Baroni et al., 2005):
+        https://doi.org/10.1016/j.artint.2005.05.006
+
+    Arguments:
+        framework {saf.framework.ListGraphFramework} -- object
+            representing the argumentation framework
+        reduction_parser {saf.theories.DIMACSParser} -- parser object
+            to construct the reductions of the SCCs to SAT solver
+            problem inputs
+
+    Keyword Arguments:
+        enumeration_function {Callable} -- method enumerating the
+            extensions of each conditioned SCC
+            (default: {fullEnumeration})
+
+    Returns:
+        Generator[FrozenSet[int]] -- the extensions of the framework
+    """
+
+    layers = framework.getSCCLayers()
+    # Labels of the arguments on the current depth-first path. Deeper
+    # layers only ever read the labels of preceding ones.
+    labelling = {}
+
+    with ThreadPoolExecutor(max_workers=SCC_WORKERS) as executor:
+
+        def layerLabellings(layer):
+            def solve(scc):
+                return conditionedSCCLabellings(
+                    framework, scc, labelling, enumeration_function,
+                    reduction_parser)
+
+            if len(layer) > 1:
+                # Run the workers under the deadline of this context.
+                context = contextvars.copy_context()
+                solutions = list(executor.map(
+                    lambda scc: context.copy().run(solve, scc), layer))
+            else:
+                solutions = [solve(scc) for scc in layer]
+
+            for combination in itertools.product(*solutions):
+                for scc_labelling in combination:
+                    labelling.update(scc_labelling)
+                yield
+
+        stack = [layerLabellings(layers[0])] if layers else []
+        if not layers:
+            yield frozenset()
+
+        while stack:
+            if next(stack[-1], StopIteration) is StopIteration:
+                stack.pop()
+            elif len(stack) < len(layers):
+                stack.append(layerLabellings(layers[len(stack)]))
+            else:
+                yield frozenset(arg for arg, label in labelling.items()
+                                if label == Label.In)
 
 #
 # Concrete task implementations.
@@ -228,8 +674,9 @@ def skepticalDecision(framework, argument_value, enumeration_function):
 
 
 def groundedSingleEnumeration(framework):
-    """Generate the grounded extension of the framework via the
-        fixed-point of the framework's characteristic function F:
+    """Generate the grounded extension of the framework as the
+        in-labeled arguments of its grounded labelling, which is the
+        least fixed-point of the framework's characteristic function F:
 
                     Ext_GR = U_{i=1..inf} F^i({})
 
@@ -240,30 +687,19 @@ def groundedSingleEnumeration(framework):
             representing the argumentation framework]
 
     Returns:
-        List[int] -- the grounded extension of the framework
+        Set[int] -- the grounded extension of the framework
     """
 
-    # ? Would filtering complete extensions be quicker?
-
-    grounded_extension = set()
-    curr_characteristic = set()
-
-    while True:
-        next_characteristic = framework.characteristic(curr_characteristic)
-        grounded_extension |= next_characteristic
-
-        if next_characteristic == curr_characteristic:
-            # iterate untill convergance
-            break
-
-        curr_characteristic = next_characteristic
+    in_labeled, _, _ = groundedLabelling(framework)
 
-    return grounded_extension
+    return in_labeled
 
 
 def groundedCredulousDecision(framework, argument_value):
     """Solve the credulous decision problem under grounded semantics
-    given a framework and the query argument's value.
+    given a framework and the query argument's value. The grounded
+    labelling is constructed iteratively and is stopped as soon as the
+    query argument is labeled.
 
     Arguments:
         framework {saf.framework.FrameworkRepresentation} -- object
@@ -274,11 +710,12 @@ def groundedCredulousDecision(framework, argument_value):
         bool -- solution to the credulous decision problem
     """
 
-    # ! groundedCredulousDecision could be optimised further if the
-    # ! extension would be constructed iteratively and the check would
-    # ! be made at each iteration against the new additions.
+    for arg, is_in in iterGroundedLabelling(framework):
+        if arg == argument_value:
+            return is_in
 
-    return argument_value in groundedSingleEnumeration(framework)
+    # The argument is und-labeled
+    return False
 
 
 def completeFullEnumeration(framework):
@@ -286,6 +723,9 @@ def completeFullEnumeration(framework):
     given a framework.
     """
 
+    if SCC_DECOMPOSITION:
+        return sccRecursiveEnumeration(framework, completeLabelingParser)
+
     return fullEnumeration(framework, completeLabelingParser)
 
 
@@ -294,6 +734,9 @@ def completeSingleEnumeration(framework):
         given a framework.
     """
 
+    if SCC_DECOMPOSITION:
+        return next(completeFullEnumeration(framework), None)
+
     return singleEnumeration(framework, completeLabelingParser)
 
 
@@ -302,8 +745,13 @@ def completeCredulousDecision(framework, argument_value):
         given a framework and the query argument's value.
     """
 
-    return credulousDecision(framework, argument_value,
-                             completeFullEnumeration)
+    fixed_labels = groundedFixedLabels(framework)
+
+    if fixed_labels and argument_value in fixed_labels:
+        return fixed_labels[argument_value] == Label.In
+
+    return credulousSATDecision(framework, argument_value,
+                                completeLabelingParser, fixed_labels)
 
 
 def completeSkepticalDecision(framework, argument_value):
@@ -311,17 +759,27 @@ def completeSkepticalDecision(framework, argument_value):
         given a framework and the query argument's value.
     """
 
-    return skepticalDecision(framework, argument_value,
-                             completeFullEnumeration)
+    fixed_labels = groundedFixedLabels(framework)
+
+    if fixed_labels is not None:
+        # The grounded extension is the least complete extension.
+        return fixed_labels.get(argument_value) == Label.In
+
+    return skepticalSATDecision(framework, argument_value,
+                                completeLabelingParser)
 
 
 def preferredFullEnumeration(framework):
-    """Solve the full enumeration problem under grounded semantics
-        given a framework. Do this via filtering complete extensions.
+    """Solve the full enumeration problem under preferred semantics
+        given a framework. Do this via growing complete extensions to
+        maximal ones.
     """
 
-    complete_extensions = completeFullEnumeration(framework)
-    return getAllMaximal(complete_extensions)
+    if SCC_DECOMPOSITION:
+        return sccRecursiveEnumeration(framework, completeLabelingParser,
+                                       maximalEnumeration)
+
+    return maximalEnumeration(framework, completeLabelingParser)
 
 
 def preferredSingleEnumeration(framework):
@@ -329,31 +787,39 @@ def preferredSingleEnumeration(framework):
         given a framework.
     """
 
-    try:
-        return preferredFullEnumeration(framework).pop()
-    except KeyError:
-        # A Preferred extension is unversally defined for any framework.
-        # Nevertheless, this except block is added for implementational
-        # safety.
-        return None
+    # A Preferred extension is unversally defined for any framework.
+    # Nevertheless, None is returned for implementational safety.
+    return next(preferredFullEnumeration(framework), None)
 
 
 def preferredCredulousDecision(framework, argument_value):
     """Solve the credulous decision problem under preferred semantics
-        given a framework and the query argument's value.
+        given a framework and the query argument's value. Any complete
+        extension is contained in some preferred one, hence this is the
+        same problem as under complete semantics.
     """
 
-    return credulousDecision(framework, argument_value,
-                             preferredFullEnumeration)
+    return completeCredulousDecision(framework, argument_value)
 
 
 def preferredSkepticalDecision(framework, argument_value):
     """Solve the skeptical decision problem under preferred semantics
-        given a framework and the query argument's value.
+        given a framework and the query argument's value. Do this via
+        growing only those complete extensions which do not contain the
+        argument, until one of them stays without it.
     """
 
-    return skepticalDecision(framework, argument_value,
-                             preferredFullEnumeration)
+    fixed_labels = groundedFixedLabels(framework)
+
+    if fixed_labels and argument_value in fixed_labels:
+        return fixed_labels[argument_value] == Label.In
+
+    counterexample = [-completeLabelingParser.labelLiteral(argument_value)]
+
+    return all(argument_value in extension
+               for extension in maximalEnumeration(
+                   framework, completeLabelingParser, counterexample,
+                   fixed_labels))
 
 
 def stableFullEnumeration(framework):
@@ -361,6 +827,9 @@ def stableFullEnumeration(framework):
         given a framework.
     """
 
+    if SCC_DECOMPOSITION:
+        return sccRecursiveEnumeration(framework, stableLabellingParser)
+
     return fullEnumeration(framework, stableLabellingParser)
 
 
@@ -368,6 +837,10 @@ def stableSingleEnumeration(framework):
     """Solve the single enumeration problem under stable semantics
         given a framework.
     """
+
+    if SCC_DECOMPOSITION:
+        return next(stableFullEnumeration(framework), None)
+
     return singleEnumeration(framework, stableLabellingParser)
 
 
@@ -376,8 +849,15 @@ def stableCredulousDecision(framework, argument_value):
         given a framework and the query argument's value.
     """
 
-    return credulousDecision(framework, argument_value,
-                             stableFullEnumeration)
+    fixed_labels = groundedFixedLabels(framework)
+
+    if fixed_labels and fixed_labels.get(argument_value) == Label.Out:
+        return False
+
+    # A grounded in-labeled argument is still only credulously accepted
+    # if a stable extension exists at all.
+    return credulousSATDecision(framework, argument_value,
+                                stableLabellingParser, fixed_labels)
 
 
 def stableSkepticalDecision(framework, argument_value):
@@ -385,8 +865,48 @@ def stableSkepticalDecision(framework, argument_value):
         given a framework and the query argument's value.
     """
 
-    return skepticalDecision(framework, argument_value,
-                             stableFullEnumeration)
+    fixed_labels = groundedFixedLabels(framework)
+
+    if fixed_labels and fixed_labels.get(argument_value) == Label.In:
+        return True
+
+    # A grounded out-labeled argument is still skeptically accepted if
+    # no stable extension exists at all.
+    return skepticalSATDecision(framework, argument_value,
+                                stableLabellingParser, fixed_labels)
+
+
+def relevancePruned(decision_function):
+    """Wrap a decision task method so that it solves the task on the
+        sub-framework induced by the ancestors of the query argument if
+        RELEVANCE_PRUNING is set, unless the encodings of the framework
+        are shared (see encodingScope). This is only sound for semantics
+        which satisfy directionality, see (Baroni & Giacomin, 2007):
+        https://doi.org/10.1016/j.artint.2007.04.004
+
+    Arguments:
+        decision_function {Callable} -- method which solves a decision
+            task given a framework and the query argument's value
+
+    Returns:
+        Callable -- the wrapped method
+    """
+
+    def prunedDecision(framework, argument_value):
+        # Under an encodingScope of the framework the decision is solved
+        # on the whole framework, whose shared reduction is then reused
+        # by every query instead of one being generated per sub-framework.
+        if not RELEVANCE_PRUNING or _sharedEncodings(framework) is not None:
+            return decision_function(framework, argument_value)
+
+        ancestors = ancestorsOf(framework, argument_value)
+        if len(ancestors) == len(framework):
+            return decision_function(framework, argument_value)
+
+        sub = framework.subFramework(sorted(ancestors))
+        return decision_function(sub, sub.argumentToValue(argument_value))
+
+    return prunedDecision
 
 
 _enumerationTasksFunctions = {
@@ -414,15 +934,15 @@ _decisionTaskFunctions = {
     # which is used to solve said task.
 
     # Complete semantics
-    'DC-CO': completeCredulousDecision,
-    'DS-CO': completeSkepticalDecision,
+    'DC-CO': relevancePruned(completeCredulousDecision),
+    'DS-CO': relevancePruned(completeSkepticalDecision),
 
     # Grounded semantics
-    'DC-GR': groundedCredulousDecision,
+    'DC-GR': relevancePruned(groundedCredulousDecision),
 
     # Preferred semantics
-    'DC-PR': preferredCredulousDecision,
-    'DS-PR': preferredSkepticalDecision,
+    'DC-PR': relevancePruned(preferredCredulousDecision),
+    'DS-PR': relevancePruned(preferredSkepticalDecision),
 
     # Stable semantics
     'DC-ST': stableCredulousDecision,
@@ -19,11 +19,21 @@
 """
 
 import abc
+from array import array
 from enum import IntEnum
-from typing import Callable, FrozenSet, Generator, List, NewType
+from typing import (Callable, Dict, FrozenSet, Generator, Iterable, List,
+                    NewType)
 
 import solved_af.utils as utils
 from solved_af.framework import FrameworkRepresentation as Framework
+from solved_af.framework import sortedUnique
+
+try:
+    import numpy as np
+except ImportError:
+    # Without numpy the theories are generated by their per-argument
+    # templates only.
+    np = None
 
 
 class Label(IntEnum):
@@ -103,6 +113,106 @@ undLab = undLabelVariable
 TheoryTemplate = NewType(
     'TheoryTemplate', Callable[[int, Framework], List[List[int]]])
 TheoryRepresentation = NewType('TheoryRepresentation', List[List[int]])
+# A block template generates the clauses of a theory for many arguments
+# at once as a flat int32 array of 0-terminated clauses, along with the
+# number of clauses in it.
+BlockTemplate = NewType('BlockTemplate', Callable[['AttackArrays'], tuple])
+
+
+class AttackArrays:
+    """Array representation of the attacks on some of the arguments of a
+        framework, in the fashion of a CSR matrix: the attackers of
+        arguments[i] are attackers[offsets[i]:offsets[i + 1]].
+
+        NB requires numpy.
+    """
+
+    def __init__(self, arguments, offsets, attackers):
+        self.arguments = arguments
+        self.offsets = offsets
+        self.attackers = attackers
+        self.degrees = np.diff(offsets)
+        # The attacked argument of each attack, aligned with attackers.
+        self.attacked = np.repeat(arguments, self.degrees)
+
+    @classmethod
+    def fromFramework(cls, framework: Framework,
+                      argument_values: List[int] = None):
+        """Construct the arrays of the attacks on some arguments of a
+            framework.
+
+        Arguments:
+            framework {Framework} -- framework which contains the
+                arguments
+
+        Keyword Arguments:
+            argument_values {List[int]} -- arguments whose attackers to
+                keep; all the arguments if None (default: {None})
+
+        Returns:
+            AttackArrays -- the attacks in array form
+        """
+
+        num_of_args = len(framework)
+        if hasattr(framework, 'getAttackerArrays'):
+            # The framework already keeps its attacks sorted by the
+            # attacked argument.
+            all_offsets, attackers = framework.getAttackerArrays()
+            attacked = np.repeat(np.arange(1, num_of_args + 1),
+                                 np.diff(all_offsets))
+        else:
+            attacks = np.array(framework.getAttacks(),
+                               dtype=np.int64).reshape(-1, 2)
+            # Sort the attacks by the attacked argument (dropping any
+            # duplicates) by sorting their codes.
+            codes = sortedUnique(attacks[:, 1] * (num_of_args + 1)
+                                 + attacks[:, 0])
+            attacked, attackers = np.divmod(codes, num_of_args + 1)
+
+        if argument_values is None:
+            selected = np.ones(num_of_args + 1, dtype=bool)
+        else:
+            selected = np.zeros(num_of_args + 1, dtype=bool)
+            selected[np.asarray(argument_values, dtype=np.int64)] = True
+        selected[0] = False
+
+        arguments = np.flatnonzero(selected)
+        counts = np.bincount(attacked, minlength=num_of_args + 1)
+        offsets = np.zeros(len(arguments) + 1, dtype=np.int64)
+        np.cumsum(counts[arguments], out=offsets[1:])
+        attackers = attackers[selected[attacked]]
+
+        return cls(arguments, offsets, attackers)
+
+
+def _alignedClauses(*clauses) -> tuple:
+    # Given clauses whose literals are aligned arrays (e.g., with an
+    # entry per argument or per attack), interleave them into a flat
+    # block of 0-terminated clauses grouped by entry.
+    columns = []
+    for clause in clauses:
+        columns += clause
+        columns.append(np.zeros_like(clause[0]))
+    block = np.column_stack(columns).astype(np.int32).ravel()
+    return block, len(clauses) * len(clauses[0][0])
+
+
+def _attackerClauses(arrays: AttackArrays, attacker_literals,
+                     argument_literals) -> tuple:
+    # Generate a block with a clause per argument consisting of a
+    # literal for each of its attackers followed by a literal of the
+    # argument itself.
+    lengths = arrays.degrees + 2
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    block = np.zeros(ends[-1] if len(ends) else 0, dtype=np.int32)
+    positions = np.repeat(starts - arrays.offsets[:-1], arrays.degrees) \
+        + np.arange(len(arrays.attackers))
+    block[positions] = attacker_literals
+    block[ends - 2] = argument_literals
+
+    return block, len(arrays.arguments)
 
 
 class CNFTheory:
@@ -110,10 +220,14 @@ class CNFTheory:
         as a list of disjunctive clauses which themselves are lists.
     """
 
-    def __init__(self, template: TheoryTemplate):
+    def __init__(self, template: TheoryTemplate,
+                 block_template: BlockTemplate = None):
         super().__init__()
         # The template holds a means to generate clauses of the theory
         self._template = template
+        # The block template optionally holds a means to generate the
+        # same clauses for many arguments at once
+        self._block_template = block_template
 
     @classmethod
     def fromTemplateList(cls, templates: List[TheoryTemplate]) -> Generator:
@@ -134,6 +248,17 @@ class CNFTheory:
         """
         return (cls(template) for template in templates)
 
+    @classmethod
+    def fromTemplatePairs(cls, *template_pairs) -> Generator:
+        """A factory to construct CNFTheory objects from an enumeration
+            of (template, block template) pairs
+        """
+        return (cls(template, block_template)
+                for template, block_template in template_pairs)
+
+    def hasBlockTemplate(self) -> bool:
+        return self._block_template is not None
+
     def generate(self, argument_value: int,
                  framework: Framework) -> TheoryRepresentation:
         """Generate the clause dependant on an argument and the
@@ -173,6 +298,21 @@ class CNFTheory:
             ret_cnf += self.generate(arg_val, framework)
         return ret_cnf
 
+    def generateBlock(self, arrays: AttackArrays) -> tuple:
+        """Generate the clauses for all arguments of the attack arrays
+            at once by the block template.
+
+        Arguments:
+            arrays {AttackArrays} -- the arguments to generate clauses
+                for and their attackers
+
+        Returns:
+            tuple -- flat int32 array of 0-terminated clauses and the
+                number of clauses in it
+        """
+
+        return self._block_template(arrays)
+
 
 class TheoryParser(metaclass=abc.ABCMeta):
     """Abstract class defining the base of a reduction parser from AF to
@@ -240,28 +380,135 @@ class DIMACSHeader:
     def incrementClauses(self):
         self._clauses += 1
 
+    def incrementVariables(self):
+        self._vars += 1
+
     def setClauses(self, num_of_clauses):
         self._clauses = num_of_clauses
 
 
+class ClauseBuffer:
+    """Compact store of CNF clauses as one flat array of 32-bit
+        literals in which every clause is terminated by a 0, as it is
+        in DIMACS.
+    """
+
+    # Number of literals converted to DIMACS text at a time.
+    CHUNK_SIZE = 2**16
+
+    def __init__(self, clauses: Iterable[List[int]] = ()):
+        self._literals = array('i')
+        self._num_of_clauses = 0
+        self.extend(clauses)
+
+    def __len__(self):
+        return self._num_of_clauses
+
+    def __iter__(self):
+        clause = []
+        for literal in self._literals:
+            if literal == 0:
+                yield clause
+                clause = []
+            else:
+                clause.append(literal)
+
+    def addClause(self, clause: List[int]):
+        self._literals.extend(clause)
+        self._literals.append(0)
+        self._num_of_clauses += 1
+
+    def extendFlat(self, literals, num_of_clauses: int):
+        """Append clauses given as one flat sequence of 0-terminated
+            literals (e.g., an int32 numpy array).
+        """
+
+        if getattr(literals, 'itemsize', None) == self._literals.itemsize:
+            self._literals.frombytes(literals.tobytes())
+        else:
+            self._literals.extend(literals)
+        self._num_of_clauses += num_of_clauses
+
+    def extend(self, clauses: Iterable[List[int]]):
+        literals = self._literals
+        num_of_clauses = 0
+        for clause in clauses:
+            literals.extend(clause)
+            literals.append(0)
+            num_of_clauses += 1
+        self._num_of_clauses += num_of_clauses
+
+    def copy(self):
+        clauses = ClauseBuffer()
+        clauses._literals = array('i', self._literals)
+        clauses._num_of_clauses = self._num_of_clauses
+        return clauses
+
+    def iterDIMACS(self) -> Generator:
+        """Generate the DIMACS encoding of the clauses (without the
+            header) as chunks of ASCII bytes, one clause per line.
+        """
+
+        literals = self._literals
+        for start in range(0, len(literals), self.CHUNK_SIZE):
+            chunk = literals[start:start + self.CHUNK_SIZE]
+            # Converting a whole chunk at once is much faster than
+            # joining every clause on its own. Only a literal of value
+            # 0 can match ' 0 ', as other literals have no leading 0s.
+            text = ' '.join(map(str, chunk)).replace(' 0 ', ' 0\n')
+            yield (text + ('\n' if chunk[-1] == 0 else ' ')).encode('ascii')
+
+
 class DIMACSInput:
     """Object modeling a DIMACS formated file/string. It consists of
-        a DIMACSHeader and its content.
+        a DIMACSHeader and its clauses.
     """
 
-    def __init__(self, num_of_vars=0, num_of_clauses=0, content=''):
-        self._header = DIMACSHeader(num_of_vars, num_of_clauses)
-        self._content = content
+    def __init__(self, num_of_vars=0, clauses: ClauseBuffer = None):
+        self._clauses = ClauseBuffer() if clauses is None else clauses
+        self._header = DIMACSHeader(num_of_vars, len(self._clauses))
 
     def __str__(self):
-        return str(self._header) + self._content
+        return self.encode().decode('ascii')
 
-    def addSingleClause(self, dimacs_clause: str):
-        self._content += dimacs_clause
+    def __len__(self):
+        return len(self._clauses)
+
+    def addClause(self, clause: List[int]):
+        self._clauses.addClause(clause)
         self._header.incrementClauses()
 
+    def addVariable(self):
+        self._header.incrementVariables()
+
+    def copy(self):
+        return DIMACSInput(self._header._vars, self._clauses.copy())
+
+    def writeTo(self, stream, extra_clauses: List[List[int]] = ()):
+        """Write the DIMACS encoding to a binary stream (e.g., the stdin
+            of a SAT solver process) chunk by chunk.
+
+        Arguments:
+            stream {BinaryIO} -- the stream to write to
+
+        Keyword Arguments:
+            extra_clauses {List[List[int]]} -- clauses to write after
+                the stored ones without storing them, e.g., unit clauses
+                standing for assumptions (default: {()})
+        """
+
+        header = DIMACSHeader(self._header._vars,
+                              len(self._clauses) + len(extra_clauses))
+        stream.write(str(header).encode('ascii'))
+        for chunk in self._clauses.iterDIMACS():
+            stream.write(chunk)
+        for clause in extra_clauses:
+            stream.write(
+                (DIMACSParser.parseClause(clause) + '\n').encode('ascii'))
+
     def encode(self):
-        return str(self)
+        return str(self._header).encode('ascii') + \
+            b''.join(self._clauses.iterDIMACS())
 
 
 class DIMACSParser(TheoryParser):
@@ -283,22 +530,107 @@ class DIMACSParser(TheoryParser):
     def parseClause(clause: List[int]):
         return ' '.join(str(lab_var) for lab_var in clause) + ' 0'
 
-    def parse(self, framework: Framework) -> DIMACSInput:
-        # generate all theories in raw form,
-        # count the number of clauses generated...
-
-        raw_clauses = []
+    def numberOfVariables(self, framework: Framework) -> int:
         # For each argument there is a bool variable for each label
         # describing it.
-        num_of_vars = len(framework) * self.vars_per_argument
+        return len(framework) * self.vars_per_argument
+
+    def generate(self, framework: Framework,
+                 fixed_labels: Dict[int, Label] = None
+                 ) -> TheoryRepresentation:
+        """Generate all theories of the parser in raw form, i.e. as a
+            list of clauses which are lists of labelling variables.
+
+        Arguments:
+            framework {Framework} -- the framework to encode
+
+        Keyword Arguments:
+            fixed_labels {Dict[int, Label]} -- labels already decided
+                for some of the arguments (e.g., their grounded labels),
+                which must be consistent with any labelling under the
+                parser's semantics. These arguments are fixed by unit
+                clauses and the theories are only generated for the
+                remaining ones (default: {None})
+
+        Returns:
+            TheoryRepresentation -- representation of the CNF theory
+                generated
+        """
+
+        raw_clauses = []
         argument_values = framework.getArguments()
+
+        if fixed_labels:
+            argument_values = [arg for arg in argument_values
+                               if arg not in fixed_labels]
+            for arg, label in fixed_labels.items():
+                raw_clauses += self.fixedLabelClauses(arg, label)
+
         for theory in self._theories:
             raw_clauses += theory.generateAll(argument_values, framework)
 
-        num_of_clauses = len(raw_clauses)
-        dimacs_content = self.parseCNFTheory(raw_clauses)
+        return raw_clauses
 
-        return DIMACSInput(num_of_vars, num_of_clauses, dimacs_content)
+    def generateBuffer(self, framework: Framework,
+                       fixed_labels: Dict[int, Label] = None
+                       ) -> ClauseBuffer:
+        """Generate all theories of the parser (see generate) straight
+            into a ClauseBuffer. If numpy is available and all theories
+            have block templates, the clauses are generated as arrays
+            from the attack relation instead of argument by argument.
+        """
+
+        if np is None or not all(theory.hasBlockTemplate()
+                                 for theory in self._theories):
+            return ClauseBuffer(self.generate(framework, fixed_labels))
+
+        clauses = ClauseBuffer()
+        argument_values = None
+
+        if fixed_labels:
+            argument_values = [arg for arg in framework.getArguments()
+                               if arg not in fixed_labels]
+            for arg, label in fixed_labels.items():
+                clauses.extend(self.fixedLabelClauses(arg, label))
+
+        arrays = AttackArrays.fromFramework(framework, argument_values)
+        for theory in self._theories:
+            clauses.extendFlat(*theory.generateBlock(arrays))
+
+        return clauses
+
+    def fixedLabelClauses(self, arg_value: int,
+                          label: Label) -> TheoryRepresentation:
+        """Generate the unit clauses fixing the label of an argument."""
+
+        if self.vars_per_argument > 1:
+            return [[self.labelLiteral(arg_value, other)
+                     if other == label else
+                     -self.labelLiteral(arg_value, other)]
+                    for other in Label]
+        return [[self.labelLiteral(arg_value, label)]]
+
+    def parse(self, framework: Framework,
+              fixed_labels: Dict[int, Label] = None) -> DIMACSInput:
+        # generate all theories in raw form and store them compactly,
+        # the header follows from the number of clauses stored.
+
+        clauses = self.generateBuffer(framework, fixed_labels)
+        num_of_vars = self.numberOfVariables(framework)
+
+        return DIMACSInput(num_of_vars, clauses)
+
+    def labelLiteral(self, arg_value: int, label=Label.In) -> int:
+        """Get the SAT literal which holds iff the given argument is
+            labeled with the given label under this parser's reduction.
+            With a single variable per argument that variable is the
+            in-label, so that being out-labeled is its negation.
+        """
+
+        if self.vars_per_argument > 1:
+            return _calculateLabelVar(arg_value, self.vars_per_argument,
+                                      label)
+        return arg_value if label == Label.In else -arg_value
 
     def extractExtention(self, assignment: List[int]) -> FrozenSet[int]:
         # FIXME need a better way to check for being an in-label var.
@@ -371,7 +703,7 @@ def complete_in_theory_2(a, f):
         framework it is contained in.
 
         This template captures the legality in one direction, namely
-        'if the argument is in-labeled if arguments it attacks are
+        'if the argument is in-labeled, then all of its attackers are
         out-labeled.'
 
         NB this function is meant to be used as a template for a
@@ -383,8 +715,8 @@ def complete_in_theory_2(a, f):
 
     """
 
-    return [[-inLab(a), outLab(attacked)]
-            for attacked in f.getAttackedBy(a)]
+    return [[-inLab(a), outLab(attacker)]
+            for attacker in f.getAttackersOf(a)]
 
 
 def complete_out_theory_1(a, f):
@@ -430,14 +762,71 @@ def complete_out_theory_2(a, f):
             + [-outLab(a)]]
 
 
+#
+# Block templates generating the same theories for many arguments at
+# once from AttackArrays {r}.
+#
+
+def _inLabels(args):
+    return _calculateLabelVar(args, 3, Label.In)
+
+
+def _outLabels(args):
+    return _calculateLabelVar(args, 3, Label.Out)
+
+
+def _undLabels(args):
+    return _calculateLabelVar(args, 3, Label.Und)
+
+
+def uniqueness_block(r):
+    """Block template of uniqueness_theory."""
+
+    ins, outs, unds = (_inLabels(r.arguments), _outLabels(r.arguments),
+                       _undLabels(r.arguments))
+    return _alignedClauses([ins, outs, unds],
+                            [-ins, -outs],
+                            [-ins, -unds],
+                            [-outs, -unds])
+
+
+def complete_in_block_1(r):
+    """Block template of complete_in_theory_1."""
+
+    return _attackerClauses(r, -_outLabels(r.attackers),
+                            _inLabels(r.arguments))
+
+
+def complete_in_block_2(r):
+    """Block template of complete_in_theory_2."""
+
+    return _alignedClauses([-_inLabels(r.attacked),
+                             _outLabels(r.attackers)])
+
+
+def complete_out_block_1(r):
+    """Block template of complete_out_theory_1."""
+
+    return _alignedClauses([-_inLabels(r.attackers),
+                             _outLabels(r.attacked)])
+
+
+def complete_out_block_2(r):
+    """Block template of complete_out_theory_2."""
+
+    return _attackerClauses(r, _inLabels(r.attackers),
+                            -_outLabels(r.arguments))
+
+
 # A parser instance for encoding complete semantics
 
 
-complete_theories = CNFTheory.fromTemplates(uniqueness_theory,
-                                            complete_in_theory_1,
-                                            complete_in_theory_2,
-                                            complete_out_theory_1,
-                                            complete_out_theory_2)
+complete_theories = CNFTheory.fromTemplatePairs(
+    (uniqueness_theory, uniqueness_block),
+    (complete_in_theory_1, complete_in_block_1),
+    (complete_in_theory_2, complete_in_block_2),
+    (complete_out_theory_1, complete_out_block_1),
+    (complete_out_theory_2, complete_out_block_2))
 
 completeLabelingParser = DIMACSParser(*complete_theories)
 
@@ -485,9 +874,23 @@ def stable_out_theory(a, f):
             for attacker in f.getAttackersOf(a)]
 
 
+def stable_in_block(r):
+    """Block template of stable_in_theory."""
+
+    return _attackerClauses(r, r.attackers, r.arguments)
+
+
+def stable_out_block(r):
+    """Block template of stable_out_theory."""
+
+    return _alignedClauses([-r.attackers, -r.attacked])
+
+
 # A parser instance for encoding stable semantics
 
 
-stable_theories = CNFTheory.fromTemplates(stable_in_theory, stable_out_theory)
+stable_theories = CNFTheory.fromTemplatePairs(
+    (stable_in_theory, stable_in_block),
+    (stable_out_theory, stable_out_block))
 
 stableLabellingParser = DIMACSParser(*stable_theories, vars_per_argument=1)
@@ -15,6 +15,12 @@
 
 """This method provides some misc. untilities to solved-af."""
 
+import contextlib
+import functools
+import sys
+import threading
+from collections import OrderedDict
+
 
 def flatten(list_to_flatten):
     # Credit to https://stackoverflow.com/a/952952/5065263
@@ -26,16 +32,171 @@ def flattenSet(set_to_flatten):
     return {item for sublist in set_to_flatten for item in sublist}
 
 
-def memoize(func):
-    # Credit to https://dbader.org/blog/python-memoization
-    cache = {}
+# Default bound on the number of results kept by a memoized function.
+MEMOIZE_MAX_ENTRIES = 2**16
+
+# All caches of memoized functions by name.
+_memo_caches = {}
+
+_MISSING = object()
+
+_scope_lock = threading.Lock()
+_scope_depth = 0
+
+
+class MemoCache:
+    """Bounded cache of the results of a memoized function which evicts
+        the least recently used results first and counts its hits and
+        misses.
+    """
+
+    def __init__(self, name, max_entries=MEMOIZE_MAX_ENTRIES,
+                 max_bytes=None):
+        """Constructor of the MemoCache.
+
+        Arguments:
+            name {str} -- the name of the cache
+
+        Keyword Arguments:
+            max_entries {int} -- bound on the number of results kept;
+                None for no bound (default: {MEMOIZE_MAX_ENTRIES})
+            max_bytes {int} -- bound on the (approximate) size of the
+                keys and results kept; None for no bound
+                (default: {None})
+        """
+
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes.pop(key, 0)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            if self.max_bytes is not None:
+                size = sys.getsizeof(key) + sys.getsizeof(value) + \
+                    sum(sys.getsizeof(arg) for arg in key)
+                self._sizes[key] = size
+                self._bytes += size
+
+            self._evict()
+
+    def resize(self, max_entries=_MISSING, max_bytes=_MISSING):
+        """Change the bounds of the cache, evicting results if needed.
+            The size of results which are already kept is only known if
+            the cache had a byte bound when they were stored.
+        """
+
+        with self._lock:
+            if max_entries is not _MISSING:
+                self.max_entries = max_entries
+            if max_bytes is not _MISSING:
+                self.max_bytes = max_bytes
+            self._evict()
 
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and
+                 len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and
+                 self._bytes > self.max_bytes)):
+            key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(key, 0)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Get the counters and current size of the cache."""
+
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self._entries),
+                'bytes': self._bytes if self.max_bytes is not None else None}
+
+
+def memoize(func=None, *, max_entries=MEMOIZE_MAX_ENTRIES, max_bytes=None):
+    """Memoize a function of hashable arguments in a bounded MemoCache.
+        Can be used either as @memoize or as @memoize(max_bytes=...).
+        The cache is available as the cache attribute of the memoized
+        function.
+    """
+
+    if func is None:
+        return lambda func: memoize(func, max_entries=max_entries,
+                                    max_bytes=max_bytes)
+
+    cache = MemoCache(F'{func.__module__}.{func.__qualname__}',
+                      max_entries, max_bytes)
+    _memo_caches[cache.name] = cache
+
+    @functools.wraps(func)
     def memoized_func(*args):
-        try:
-            return cache[args]
-        except KeyError:
+        result = cache.get(args, _MISSING)
+        if result is _MISSING:
             result = func(*args)
-            cache[args] = result
-            return result
+            cache.put(args, result)
+        return result
 
+    memoized_func.cache = cache
     return memoized_func
+
+
+def getMemoCaches():
+    """Get the caches of all memoized functions by name."""
+    return dict(_memo_caches)
+
+
+def clearMemoCaches():
+    """Clear the caches of all memoized functions."""
+    for cache in _memo_caches.values():
+        cache.clear()
+
+
+@contextlib.contextmanager
+def memoScope():
+    """Scope the results of all memoized functions to a block of work,
+        e.g., solving the tasks of one framework. The scope is global
+        rather than per framework: the caches are shared by all work
+        and all of them are cleared when the outermost of the (possibly
+        concurrent) scopes exits.
+    """
+
+    global _scope_depth
+
+    with _scope_lock:
+        _scope_depth += 1
+    try:
+        yield
+    finally:
+        with _scope_lock:
+            _scope_depth -= 1
+            if _scope_depth == 0:
+                clearMemoCaches()
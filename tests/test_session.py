@@ -0,0 +1,71 @@
+# Solved-AF -- Copyright (C) 2020  David Simon Tetruashvili
+
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests of the sharing of encodings by the tasks of a session. Run with
+    'python -m unittest discover tests'.
+"""
+
+import importlib.util
+import unittest
+from unittest import mock
+
+import solved_af.tasks as tasks
+from solved_af.benchmarks.generators import generateFramework
+from solved_af.session import FrameworkSession
+from solved_af.theories import DIMACSParser
+
+
+@unittest.skipUnless(importlib.util.find_spec('pysat'),
+                     'the incremental backend requires python-sat')
+class SessionEncodingTest(unittest.TestCase):
+
+    def setUp(self):
+        backend = mock.patch.object(tasks, 'SAT_BACKEND', 'incremental')
+        pruning = mock.patch.object(tasks, 'RELEVANCE_PRUNING', True)
+        backend.start()
+        pruning.start()
+        self.addCleanup(backend.stop)
+        self.addCleanup(pruning.stop)
+        self.framework = generateFramework('iccma', 60)
+
+    def countEncodings(self, queries):
+        generateBuffer = DIMACSParser.generateBuffer
+        with mock.patch.object(DIMACSParser, 'generateBuffer',
+                               autospec=True,
+                               side_effect=generateBuffer) as generate:
+            solutions = list(FrameworkSession(self.framework)
+                             .solveAll(queries))
+        return generate.call_count, solutions
+
+    def testOneEncodingPerSemantics(self):
+        # DS-CO and DC-GR are decided by the grounded labelling alone.
+        for task_name in ('DC-CO', 'DC-PR', 'DS-PR', 'DC-ST', 'DS-ST'):
+            with self.subTest(task=task_name):
+                queries = [(task_name, arg)
+                           for arg in self.framework.getArguments()]
+                count, _ = self.countEncodings(queries)
+                self.assertEqual(count, 1)
+
+    def testSolutionsMatchWithoutSession(self):
+        queries = [(task_name, arg) for task_name in ('DC-CO', 'DS-PR')
+                   for arg in self.framework.getArguments()]
+        _, solutions = self.countEncodings(queries)
+        for task_name, arg, solution in solutions:
+            taskMethod = tasks.getTaskMethod(task_name, is_enumeration=False)
+            self.assertEqual(solution, taskMethod(self.framework, arg))
+
+
+if __name__ == '__main__':
+    unittest.main()